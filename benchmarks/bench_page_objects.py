@@ -0,0 +1,222 @@
+"""
+Benchmark de Page Objects contra páginas locales (sin acceso a red)
+
+Ejecuta cada operación de HomePage / ProductResultsPage muchas veces contra el
+servidor de fixtures, reporta la distribución de latencias y la compara con un
+baseline guardado. Retorna código 1 si alguna operación empeoró más del umbral.
+
+Uso:
+    python -m benchmarks.bench_page_objects --iterations 30
+    python -m benchmarks.bench_page_objects --save-baseline
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from config.config import Config
+from src.base import DriverFactory
+from src.pages.home_page import HomePage
+from src.pages.product_results_page import ProductResultsPage
+from benchmarks.fixture_server import FixtureServer
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTPUT = os.path.join(Config.REPORTS_DIR, "benchmarks", "page_objects.json")
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+KEYWORDS = "zapatos"
+BRAND = "Skechers"
+PRICE_RANGE = "100-200"
+
+
+def _percentile(samples, pct):
+    """Percentil por interpolación lineal"""
+    ordered = sorted(samples)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(samples):
+    """
+    Resume una lista de latencias en milisegundos
+
+    Returns:
+        dict: min, mean, p50, p90, p99, max, stdev y cantidad de muestras
+    """
+    return {
+        "samples": len(samples),
+        "min_ms": round(min(samples), 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "p50_ms": round(_percentile(samples, 50), 3),
+        "p90_ms": round(_percentile(samples, 90), 3),
+        "p99_ms": round(_percentile(samples, 99), 3),
+        "max_ms": round(max(samples), 3),
+        "stdev_ms": round(statistics.stdev(samples), 3) if len(samples) > 1 else 0.0,
+    }
+
+
+class PageObjectBenchmark:
+    """Clase que mide las operaciones de los Page Objects sobre el servidor local"""
+
+    def __init__(self, driver, base_url):
+        self.driver = driver
+        self.base_url = base_url
+        self.home = HomePage(driver)
+        self.results = ProductResultsPage(driver)
+        self.results_url = f"{base_url}/s?k={KEYWORDS}"
+
+    def operations(self):
+        """
+        Operaciones a medir: (nombre, preparación sin medir, operación medida)
+        """
+        def open_results():
+            self.driver.get(self.results_url)
+
+        def open_filtered():
+            self.driver.get(f"{self.results_url}&rh=p_123:{BRAND}")
+
+        ops = [
+            ("home.load", lambda: None, self.home.load),
+            ("home.search_product", self.home.load, lambda: self.home.search_product(KEYWORDS)),
+            ("results.apply_brand_filter", open_results, lambda: self.results.apply_brand_filter(BRAND)),
+            ("results.is_brand_filter_applied", open_filtered, lambda: self.results.is_brand_filter_applied(BRAND)),
+            ("results.apply_price_filter", open_filtered, lambda: self.results.apply_price_filter(PRICE_RANGE)),
+            ("results.get_product_count", open_results, self.results.get_product_count),
+            ("results.get_first_five_products_info", open_results, self.results.get_first_five_products_info),
+        ]
+        for sort_option in ("price_high_low", "avg_review", "newest"):
+            ops.append((f"results.sort_by[{sort_option}]", open_results,
+                        lambda option=sort_option: self.results.sort_by(option)))
+        return ops
+
+    def run(self, iterations, warmup=2):
+        """
+        Ejecuta todas las operaciones
+
+        Args:
+            iterations (int): Repeticiones medidas por operación
+            warmup (int): Repeticiones previas descartadas
+        Returns:
+            dict: Resumen de latencias por operación
+        """
+        report = {}
+        for name, setup, operation in self.operations():
+            samples = []
+            for i in range(warmup + iterations):
+                setup()
+                start = time.perf_counter()
+                operation()
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                if i >= warmup:
+                    samples.append(elapsed_ms)
+            report[name] = summarize(samples)
+            print(f"{name:45s} p50={report[name]['p50_ms']:9.2f}ms  p90={report[name]['p90_ms']:9.2f}ms  "
+                  f"max={report[name]['max_ms']:9.2f}ms")
+        return report
+
+
+def compare_with_baseline(current, baseline, threshold):
+    """
+    Compara la mediana de cada operación con el baseline
+
+    Args:
+        current (dict): Resultados actuales por operación
+        baseline (dict): Resultados del baseline por operación
+        threshold (float): Empeoramiento relativo tolerado (0.2 = 20%)
+    Returns:
+        dict: Comparación por operación (ratio y si es regresión)
+    """
+    comparison = {}
+    for name, stats in current.items():
+        base = baseline.get(name)
+        if not base or not base.get("p50_ms"):
+            continue
+        ratio = stats["p50_ms"] / base["p50_ms"]
+        comparison[name] = {
+            "baseline_p50_ms": base["p50_ms"],
+            "current_p50_ms": stats["p50_ms"],
+            "ratio": round(ratio, 3),
+            "regression": ratio > 1 + threshold,
+        }
+    return comparison
+
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(description="Benchmark offline de Page Objects")
+    parser.add_argument("--iterations", type=int, default=20, help="Repeticiones medidas por operación")
+    parser.add_argument("--warmup", type=int, default=2, help="Repeticiones de calentamiento descartadas")
+    parser.add_argument("--browser", default=Config.BROWSER, help="Navegador: chrome, firefox")
+    parser.add_argument("--with-pauses", action="store_true",
+                        help="Mantener las pausas fijas de los Page Objects (por defecto se anulan)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Archivo JSON de resultados")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Archivo JSON de baseline")
+    parser.add_argument("--save-baseline", action="store_true", help="Guardar los resultados como nuevo baseline")
+    parser.add_argument("--threshold", type=float, default=0.20, help="Regresión tolerada sobre la mediana")
+    args = parser.parse_args()
+
+    Config.HEADLESS = True
+    if not args.with_pauses:
+        Config.PAUSE_SCALE = 0
+
+    with FixtureServer() as server:
+        Config.BASE_URL = server.url
+        driver = DriverFactory.create_driver(args.browser)
+        try:
+            operations = PageObjectBenchmark(driver, server.url).run(args.iterations, args.warmup)
+        finally:
+            driver.quit()
+
+    result = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "browser": args.browser,
+        "iterations": args.iterations,
+        "pause_scale": Config.PAUSE_SCALE,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "operations": operations,
+    }
+
+    exit_code = 0
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        result["comparison"] = compare_with_baseline(operations, baseline.get("operations", {}), args.threshold)
+        regressions = [name for name, c in result["comparison"].items() if c["regression"]]
+        for name in regressions:
+            c = result["comparison"][name]
+            print(f"REGRESIÓN {name}: {c['baseline_p50_ms']}ms -> {c['current_p50_ms']}ms (x{c['ratio']})")
+        exit_code = 1 if regressions else 0
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"Resultados guardados en {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"Baseline actualizado: {args.baseline}")
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
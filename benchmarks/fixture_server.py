@@ -0,0 +1,151 @@
+"""
+Fixture Server - Servidor HTTP local que sirve páginas guardadas de inicio y resultados
+
+Permite ejecutar HomePage / ProductResultsPage sin acceso a red. Los productos se
+generan de forma determinística a partir de la búsqueda, la marca, el orden y la página.
+"""
+
+import html
+import logging
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlencode, urlparse
+
+logger = logging.getLogger(__name__)
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+PAGE_SIZE = 16
+TOTAL_PAGES = 3
+TOTAL_RESULTS = 2000
+
+
+def _generate_products(keywords, brand, sort, page):
+    """
+    Genera las tarjetas de productos de una página de resultados
+
+    Returns:
+        list: Lista de dicts con asin, name, price (None = "See options")
+    """
+    rng = random.Random(f"{keywords}|{brand}")
+    catalog = []
+    for i in range(PAGE_SIZE * TOTAL_PAGES):
+        price = None if i % 7 == 3 else round(rng.uniform(100, 200), 2)
+        catalog.append({
+            "asin": f"B0FIX{i:05d}",
+            "name": f"{brand or 'Generic'} {keywords} modelo {i + 1}",
+            "price": price,
+            "rating": rng.uniform(1, 5),
+            "date": rng.randint(0, 10000),
+        })
+    if sort == "price-desc-rank":
+        catalog.sort(key=lambda p: p["price"] or 0, reverse=True)
+    elif sort == "price-asc-rank":
+        catalog.sort(key=lambda p: p["price"] or 0)
+    elif sort == "review-rank":
+        catalog.sort(key=lambda p: p["rating"], reverse=True)
+    elif sort == "date-desc-rank":
+        catalog.sort(key=lambda p: p["date"], reverse=True)
+    start = (page - 1) * PAGE_SIZE
+    return catalog[start:start + PAGE_SIZE]
+
+
+def _render_product(product):
+    """HTML de una tarjeta de resultado con la misma estructura que el sitio real"""
+    if product["price"] is None:
+        price_html = f'<a href="/dp/{product["asin"]}">See options</a>'
+    else:
+        whole, fraction = f"{product['price']:,.2f}".split(".")
+        price_html = (f'<span class="a-price"><span class="a-price-whole">{whole}</span>'
+                      f'<span class="a-price-fraction">{fraction}</span></span>')
+    return (f'        <div data-component-type="s-search-result" data-asin="{product["asin"]}">\n'
+            f'            <h2><a href="/dp/{product["asin"]}"><span>{html.escape(product["name"])}</span></a></h2>\n'
+            f'            {price_html}\n'
+            f'        </div>')
+
+
+class FixtureRequestHandler(BaseHTTPRequestHandler):
+    """Handler que responde / con la home y /s con la página de resultados"""
+
+    def do_GET(self):
+        self.server.request_log.append((time.time(), self.path))
+        parsed = urlparse(self.path)
+        if parsed.path in ("/", "/index.html"):
+            body = (FIXTURES_DIR / "home.html").read_text(encoding="utf-8")
+        elif parsed.path == "/s":
+            body = self._render_results(parse_qs(parsed.query))
+        else:
+            self.send_error(404)
+            return
+        payload = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _render_results(self, query):
+        keywords = query.get("k", [""])[0]
+        brand = query.get("rh", [""])[0].split(":")[-1]
+        sort = query.get("s", ["relevanceblender"])[0]
+        page = int(query.get("page", ["1"])[0])
+        products = _generate_products(keywords, brand, sort, page)
+
+        pagination = ""
+        if page < TOTAL_PAGES:
+            next_query = {k: v[0] for k, v in query.items()}
+            next_query["page"] = str(page + 1)
+            pagination = (f'        <a class="s-pagination-item s-pagination-next" '
+                          f'href="/s?{html.escape(urlencode(next_query))}">Next</a>')
+
+        template = (FIXTURES_DIR / "results.html").read_text(encoding="utf-8")
+        return (template
+                .replace("{{keywords}}", html.escape(keywords))
+                .replace("{{page_size}}", str(PAGE_SIZE))
+                .replace("{{total}}", f"{TOTAL_RESULTS:,}")
+                .replace("{{products}}", "\n".join(_render_product(p) for p in products))
+                .replace("{{pagination}}", pagination))
+
+    def log_message(self, format, *args):
+        logger.debug("fixture-server: " + format, *args)
+
+
+class FixtureServer:
+    """Servidor local en un puerto libre, ejecutado en un thread separado"""
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.httpd = ThreadingHTTPServer((host, port), FixtureRequestHandler)
+        self.httpd.request_log = []  # (time.time(), path) de cada pedido recibido
+        self.thread = None
+
+    @property
+    def request_log(self):
+        return self.httpd.request_log
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Inicia el servidor"""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        logger.info("Servidor de fixtures escuchando en %s", self.url)
+        return self
+
+    def stop(self):
+        """Detiene el servidor"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread:
+            self.thread.join(timeout=5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
@@ -13,17 +13,108 @@ class Config:
     BROWSER = os.getenv('BROWSER', 'chrome')
     HEADLESS = os.getenv('HEADLESS', 'False').lower() == 'true'
     
+    # Backend remoto: Selenium Grid / endpoints WebDriver separados por coma
+    REMOTE_URLS = [url.strip() for url in os.getenv('REMOTE_URLS', '').split(',') if url.strip()]
+    REMOTE_BROWSER_VERSION = os.getenv('REMOTE_BROWSER_VERSION', '')
+    REMOTE_PLATFORM = os.getenv('REMOTE_PLATFORM', '')
+    REMOTE_HEALTH_TIMEOUT = float(os.getenv('REMOTE_HEALTH_TIMEOUT', '3'))
+    REMOTE_DOWN_COOLDOWN = float(os.getenv('REMOTE_DOWN_COOLDOWN', '60'))
+    
+    # Navegador compartido: cada test recibe un contexto aislado (solo Chrome local, vía CDP)
+    SHARED_BROWSER = os.getenv('SHARED_BROWSER', 'False').lower() == 'true'
+    
+    # Plantilla de perfil precalentado (cada driver arranca sobre un clon)
+    PROFILE_TEMPLATE = os.getenv('PROFILE_TEMPLATE', 'False').lower() == 'true'
+    PROFILE_DIR = os.getenv('PROFILE_DIR', '.browser-profiles')
+    PROFILE_LOCALE = os.getenv('PROFILE_LOCALE', 'en-US')
+    PROFILE_MAX_AGE_HOURS = float(os.getenv('PROFILE_MAX_AGE_HOURS', '24'))
+    PROFILE_WARMUP_URLS = [url.strip() for url in os.getenv('PROFILE_WARMUP_URLS', '').split(',') if url.strip()]
+    
     # Timeouts
     IMPLICIT_WAIT = int(os.getenv('IMPLICIT_WAIT', '10'))
     EXPLICIT_WAIT = int(os.getenv('EXPLICIT_WAIT', '20'))
     PAGE_LOAD_TIMEOUT = int(os.getenv('PAGE_LOAD_TIMEOUT', '30'))
+    # Factor aplicado a las pausas fijas de los Page Objects (0 = sin pausas, ej: benchmarks)
+    PAUSE_SCALE = float(os.getenv('PAUSE_SCALE', '1.0'))
     
     # Directorios
     REPORTS_DIR = 'reports'
     SCREENSHOTS_DIR = 'reports/screenshots'
+    TRACES_DIR = 'reports/traces'
+    STARTUP_STATS_FILE = 'reports/startup_stats.json'
+    
+    # Arranque rápido (sin video, trazas, métricas de página ni monitoreo de recursos)
+    FAST_START = os.getenv('FAST_START', 'False').lower() == 'true'
+    RECORD_VIDEO = os.getenv('RECORD_VIDEO', 'True').lower() == 'true'
+    
+    # Trazas de línea de tiempo (Chrome trace-event / Perfetto)
+    TRACE_TIMELINE = os.getenv('TRACE_TIMELINE', 'False').lower() == 'true'
+    
+    # Métricas de rendimiento del sitio (Navigation/Resource/Paint Timing)
+    PAGE_METRICS = os.getenv('PAGE_METRICS', 'True').lower() == 'true'
+    PAGE_METRICS_FILE = 'reports/page_metrics.jsonl'
+    
+    # Monitoreo de recursos del navegador (requiere psutil)
+    RESOURCE_MONITOR = os.getenv('RESOURCE_MONITOR', 'True').lower() == 'true'
+    RESOURCE_MONITOR_INTERVAL = float(os.getenv('RESOURCE_MONITOR_INTERVAL', '1.0'))
+    
+    # Checkpoints de steps reanudables (marker @pytest.mark.resumable)
+    CHECKPOINTS_DIR = 'reports/checkpoints'
+    CHECKPOINT_RESUME = os.getenv('CHECKPOINT_RESUME', 'False').lower() == 'true'
+    CHECKPOINT_RETRIES = int(os.getenv('CHECKPOINT_RETRIES', '1'))
+    CHECKPOINT_TTL_MINUTES = float(os.getenv('CHECKPOINT_TTL_MINUTES', '30'))
+    
+    # Sharding entre agentes de CI (--shard i/N) balanceado por duraciones históricas
+    SHARD = os.getenv('SHARD', '')
+    DURATIONS_FILE = os.getenv('DURATIONS_FILE', '.test-durations.json')
+    OUTCOMES_FILE = 'reports/outcomes.json'
+    
+    # Presupuestos de tiempo (marker @pytest.mark.budget y context manager budget())
+    BUDGET_ENFORCE = os.getenv('BUDGET_ENFORCE', 'True').lower() == 'true'
+    BUDGET_TOLERANCE = float(os.getenv('BUDGET_TOLERANCE', '0.10'))
+    BUDGET_RETRIES = int(os.getenv('BUDGET_RETRIES', '0'))
+    
+    # Logging (rotación por tamaño de reports/test.log y reports/test.jsonl)
+    LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', str(10 * 1024 * 1024)))
+    LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', '5'))
     
     # Ambiente
     ENVIRONMENT = os.getenv('ENVIRONMENT', 'dev')
     
     # Moneda
     CURRENCY = os.getenv('CURRENCY', 'USD')
+    
+    # Snapshots de estado de sesión (cookies + localStorage) restaurados en cada driver nuevo
+    STATE_SNAPSHOTS = os.getenv('STATE_SNAPSHOTS', 'False').lower() == 'true'
+    STATE_DIR = os.getenv('STATE_DIR', '.session-state')
+    STATE_TTL_HOURS = float(os.getenv('STATE_TTL_HOURS', '12'))
+    
+    # Extracción HTTP sin navegador (búsquedas en lote; fallback al navegador si hace falta JavaScript)
+    HTTP_EXTRACTION = os.getenv('HTTP_EXTRACTION', 'False').lower() == 'true'
+    HTTP_CONCURRENCY = int(os.getenv('HTTP_CONCURRENCY', '4'))
+    HTTP_DELAY = float(os.getenv('HTTP_DELAY', '1.0'))
+    
+    # Snapshots columnares de productos extraídos (uno por ejecución, para comparar entre ejecuciones)
+    PRODUCT_STORE = os.getenv('PRODUCT_STORE', 'True').lower() == 'true'
+    PRODUCT_STORE_DIR = os.getenv('PRODUCT_STORE_DIR', '.product-store')
+    
+    # Almacén de artefactos por contenido (screenshots, videos, allure-results como hardlinks)
+    ARTIFACT_STORE = os.getenv('ARTIFACT_STORE', 'True').lower() == 'true'
+    ARTIFACT_STORE_DIR = os.getenv('ARTIFACT_STORE_DIR', '.artifacts')
+    ARTIFACT_MAX_AGE_DAYS = float(os.getenv('ARTIFACT_MAX_AGE_DAYS', '14'))
+    ARTIFACT_MAX_MB = float(os.getenv('ARTIFACT_MAX_MB', '2048'))
+    ARTIFACT_MANIFEST = os.getenv('ARTIFACT_MANIFEST', 'reports/artifacts_manifest.json')
+    
+    # Screenshots en memoria: codificación y adjunto en segundo plano, sin capturas repetidas
+    SCREENSHOT_FORMAT = os.getenv('SCREENSHOT_FORMAT', 'webp')  # webp, jpeg o png (webp/jpeg requieren Pillow)
+    SCREENSHOT_QUALITY = int(os.getenv('SCREENSHOT_QUALITY', '80'))
+    SCREENSHOT_DEDUP_DISTANCE = int(os.getenv('SCREENSHOT_DEDUP_DISTANCE', '4'))
+    SCREENSHOT_ON_FAILURE = os.getenv('SCREENSHOT_ON_FAILURE', 'True').lower() == 'true'
+    SCREENSHOT_ON_STEP = os.getenv('SCREENSHOT_ON_STEP', 'False').lower() == 'true'
+    
+    # Caché compartido de resultados de búsqueda (SQLite WAL, compartido entre workers)
+    QUERY_CACHE = os.getenv('QUERY_CACHE', 'True').lower() == 'true'
+    QUERY_CACHE_FILE = os.getenv('QUERY_CACHE_FILE', '.query-cache/results.sqlite')
+    QUERY_CACHE_TTL_MINUTES = float(os.getenv('QUERY_CACHE_TTL_MINUTES', '30'))
+    QUERY_CACHE_MAX_ENTRIES = int(os.getenv('QUERY_CACHE_MAX_ENTRIES', '500'))
+    QUERY_CACHE_STATS_FILE = 'reports/query_cache_stats.json'
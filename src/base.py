@@ -2,15 +2,21 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.firefox.service import Service as FirefoxService
 from config.config import Config
+from src.utils.tracer import tracer, traced
+from src.utils.page_metrics import page_metrics
+from src.utils.browser_profile import ProfileTemplate, startup_stats, track_first_navigation
+import contextlib
+import functools
+import inspect
 import logging
 import os
+import shutil
 import subprocess
 import sys
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -19,32 +25,79 @@ class DriverFactory:
     """Factory para crear instancias del WebDriver"""
     
     @staticmethod
-    def create_driver(browser=None):
+    def build_options(browser, profile_dir=None):
+        """
+        Construye las Options del navegador (comunes a los backends local y remoto)
+        Args:
+            browser (str): Navegador a usar (chrome, firefox)
+            profile_dir (str): Directorio de perfil a usar (plantilla o clon)
+        Returns:
+            Options: ChromeOptions o FirefoxOptions
+        """
+        if browser == 'chrome':
+            options = webdriver.ChromeOptions()
+            if Config.HEADLESS:
+                options.add_argument('--headless')
+            options.add_argument('--no-sandbox')
+            options.add_argument('--disable-dev-shm-usage')
+            options.add_argument('--disable-gpu')
+            options.add_argument('--window-size=1920,1080')
+            options.add_argument('--disable-blink-features=AutomationControlled')
+            if profile_dir:
+                options.add_argument(f'--user-data-dir={profile_dir}')
+                options.add_argument(f'--lang={Config.PROFILE_LOCALE}')
+                options.add_experimental_option('prefs', {'intl.accept_languages': Config.PROFILE_LOCALE})
+        elif browser == 'firefox':
+            options = webdriver.FirefoxOptions()
+            if Config.HEADLESS:
+                options.add_argument('--headless')
+            options.add_argument('--width=1920')
+            options.add_argument('--height=1080')
+            if profile_dir:
+                options.add_argument('-profile')
+                options.add_argument(profile_dir)
+                options.set_preference('intl.accept_languages', Config.PROFILE_LOCALE)
+        else:
+            raise ValueError(f"Navegador no soportado: {browser}")
+        
+        if Config.REMOTE_BROWSER_VERSION:
+            options.browser_version = Config.REMOTE_BROWSER_VERSION
+        return options
+    
+    @staticmethod
+    def create_driver(browser=None, profile_dir=None):
         """
         Crea una instancia del WebDriver según el navegador especificado
+        Si Config.REMOTE_URLS tiene endpoints se usa el backend remoto (Selenium Grid)
+        Si Config.PROFILE_TEMPLATE está activo, el driver arranca sobre un clon de la plantilla
         Args:
-            browser (str): Navegador a usar (chrome, firefox, edge)     
+            browser (str): Navegador a usar (chrome, firefox)     
+            profile_dir (str): Perfil explícito (no se clona ni se mide el arranque)
         Returns:
             WebDriver: Instancia del WebDriver
         """
         browser = browser or Config.BROWSER.lower()
         
-        options = None
         driver = None
+        clone_dir = None
+        start = time.perf_counter()
         
         try:
-            if browser == 'chrome':
-                options = webdriver.ChromeOptions()
-                if Config.HEADLESS:
-                    options.add_argument('--headless')
-                options.add_argument('--no-sandbox')
-                options.add_argument('--disable-dev-shm-usage')
-                options.add_argument('--disable-gpu')
-                options.add_argument('--window-size=1920,1080')
-                options.add_argument('--disable-blink-features=AutomationControlled')
-                
+            if profile_dir is None and Config.PROFILE_TEMPLATE and not Config.REMOTE_URLS:
+                profile_dir = clone_dir = ProfileTemplate(browser).clone()
+            
+            options = DriverFactory.build_options(browser, profile_dir)
+            
+            if Config.REMOTE_URLS:
+                from src.utils.remote_grid import GridSelector
+                selector = GridSelector(Config.REMOTE_URLS, timeout=Config.REMOTE_HEALTH_TIMEOUT,
+                                        down_cooldown=Config.REMOTE_DOWN_COOLDOWN)
+                driver = selector.create_driver(browser, options, platform=Config.REMOTE_PLATFORM)
+            
+            elif browser == 'chrome':
                 try:
-                    # Intentar usar webdriver-manager directamente
+                    # Intentar usar webdriver-manager directamente (import diferido: solo al crear el driver)
+                    from webdriver_manager.chrome import ChromeDriverManager
                     driver = webdriver.Chrome(
                         service=ChromeService(ChromeDriverManager().install()),
                         options=options
@@ -59,14 +112,9 @@ class DriverFactory:
                         raise
                 
             elif browser == 'firefox':
-                options = webdriver.FirefoxOptions()
-                if Config.HEADLESS:
-                    options.add_argument('--headless')
-                options.add_argument('--width=1920')
-                options.add_argument('--height=1080')
-                
                 try:
-                    # Intentar usar webdriver-manager directamente
+                    # Intentar usar webdriver-manager directamente (import diferido: solo al crear el driver)
+                    from webdriver_manager.firefox import GeckoDriverManager
                     driver = webdriver.Firefox(
                         service=FirefoxService(GeckoDriverManager().install()),
                         options=options
@@ -79,25 +127,110 @@ class DriverFactory:
                     except Exception as e2:
                         logger.error(f"Error al crear GeckoDriver: {e2}")
                         raise
-                
-            else:
-                raise ValueError(f"Navegador no soportado: {browser}")
             
             # Configurar timeouts
             driver.implicitly_wait(Config.IMPLICIT_WAIT)
             driver.set_page_load_timeout(Config.PAGE_LOAD_TIMEOUT)
             
+            if clone_dir or profile_dir is None:
+                # En un Grid remoto el arranque incluye la red y la cola del nodo: no es comparable con cold
+                mode = "template" if clone_dir else "remote" if Config.REMOTE_URLS else "cold"
+                startup_stats.record(mode, "driver_start_s", time.perf_counter() - start)
+                track_first_navigation(driver, mode)
+            if clone_dir:
+                DriverFactory._remove_profile_on_quit(driver, clone_dir)
+            
             logger.info(f"WebDriver creado exitosamente para {browser}")
             return driver
             
         except Exception as e:
             logger.error(f"Error al crear el WebDriver: {str(e)}")
+            if clone_dir:
+                shutil.rmtree(clone_dir, ignore_errors=True)
             raise
+    
+    @staticmethod
+    def _remove_profile_on_quit(driver, profile_dir):
+        """Elimina el clon de perfil cuando se cierra el driver"""
+        original_quit = driver.quit
+        
+        def quit():
+            try:
+                original_quit()
+            finally:
+                shutil.rmtree(profile_dir, ignore_errors=True)
+        
+        driver.quit = quit
+
+
+@contextlib.contextmanager
+def _page_scope(driver):
+    """Marca una acción de Page Object en curso; al cerrar la de más alto nivel mide la página"""
+    depth = getattr(driver, "_page_action_depth", 0)
+    driver._page_action_depth = depth + 1
+    try:
+        yield
+    finally:
+        driver._page_action_depth = depth
+        if depth == 0:
+            page_metrics.collect_if_navigated(driver)
+
+
+def _page_action(func):
+    """
+    Envuelve un método público de Page Object: span del tracer y, al terminar
+    la acción de más alto nivel, captura de métricas si hubo navegación
+    """
+    traced_func = traced("page")(func)
+    
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        with _page_scope(self.driver):
+            return traced_func(self, *args, **kwargs)
+    
+    wrapper.__traced__ = True
+    return wrapper
+
+
+def _page_generator(func):
+    """
+    Como _page_action, para métodos generadores: el trabajo ocurre al iterar, así que
+    cada avance del generador (ej: leer o cargar una página de resultados) es un span
+    y se miden las métricas de la página; el código del consumidor entre items no se mide
+    """
+    exhausted = object()
+    
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        generator = func(self, *args, **kwargs)
+        name = f"{type(self).__name__}.{func.__name__}"
+        try:
+            while True:
+                with _page_scope(self.driver), tracer.span(name, "page"):
+                    item = next(generator, exhausted)
+                if item is exhausted:
+                    return
+                yield item
+        finally:
+            with _page_scope(self.driver):
+                generator.close()
+    
+    wrapper.__traced__ = True
+    return wrapper
 
 
 class BasePage:
     """Clase base para las páginas - Page Object Model"""
     
+    def __init_subclass__(cls, **kwargs):
+        """Registra los métodos públicos de cada Page Object como acciones instrumentadas"""
+        super().__init_subclass__(**kwargs)
+        for name, attr in list(vars(cls).items()):
+            if name.startswith("_") or not inspect.isfunction(attr) or getattr(attr, "__traced__", False):
+                continue
+            wrap = _page_generator if inspect.isgeneratorfunction(attr) else _page_action
+            setattr(cls, name, wrap(attr))
+    
     def __init__(self, driver):
         """
         Inicializa la página base
@@ -109,9 +242,34 @@ class BasePage:
         self.wait = WebDriverWait(driver, Config.EXPLICIT_WAIT)
         self.logger = logging.getLogger(self.__class__.__name__)
     
+    def wait_until(self, condition, locator=None):
+        """
+        Espera explícita registrada en el tracer
+        
+        Args:
+            condition: Expected condition a esperar
+            locator (tuple): Locator asociado (solo informativo)
+        """
+        with tracer.span(f"wait {getattr(condition, '__qualname__', 'condition').split('.')[0]}", "wait",
+                         locator=str(locator)):
+            return self.wait.until(condition)
+    
+    def pause(self, seconds):
+        """
+        Pausa fija (time.sleep) registrada en el tracer
+        
+        Args:
+            seconds (float): Segundos a esperar (escalados por Config.PAUSE_SCALE)
+        """
+        seconds = seconds * Config.PAUSE_SCALE
+        if seconds <= 0:
+            return
+        with tracer.span(f"sleep {seconds}s", "sleep"):
+            time.sleep(seconds)
+    
     def find_element(self, locator):
         """Encuentra un elemento usando el wait explícito"""
-        return self.wait.until(EC.presence_of_element_located(locator))
+        return self.wait_until(EC.presence_of_element_located(locator), locator)
     
     def find_elements(self, locator):
         """Encuentra múltiples elementos"""
@@ -119,16 +277,16 @@ class BasePage:
     
     def click(self, locator):
         """Click en un elemento"""
-        element = self.wait.until(EC.element_to_be_clickable(locator))
+        element = self.wait_until(EC.element_to_be_clickable(locator), locator)
         element.click()
-        self.logger.info(f"Click realizado en: {locator}")
+        self.logger.info("Click realizado en: %s", locator)
     
     def send_keys(self, locator, text):
         """Envía texto a un elemento"""
         element = self.find_element(locator)
         element.clear()
         element.send_keys(text)
-        self.logger.info(f"Texto enviado a {locator}: {text}")
+        self.logger.info("Texto enviado a %s: %s", locator, text)
     
     def get_text(self, locator):
         """Obtiene el texto de un elemento"""
@@ -138,7 +296,7 @@ class BasePage:
     def is_element_visible(self, locator):
         """Verifica si un elemento es visible"""
         try:
-            self.wait.until(EC.visibility_of_element_located(locator))
+            self.wait_until(EC.visibility_of_element_located(locator), locator)
             return True
         except:
             return False
@@ -1,15 +1,76 @@
 from selenium.webdriver.common.by import By
 from src.base import BasePage
+from config.config import Config
 import allure
 import logging
-import time
 
 logger = logging.getLogger(__name__)
 
+# Lee las tarjetas de resultados de la página (los mismos selectores que usaban las XPaths por producto)
+READ_PRODUCTS_SCRIPT = """
+return Array.from(document.querySelectorAll("div[data-component-type='s-search-result']")).map(function (card) {
+    function text(selector) { var el = card.querySelector(selector); return el ? el.innerText.trim() : null; }
+    return {
+        asin: card.getAttribute('data-asin') || '',
+        name: text('h2 span'),
+        whole: text('span.a-price-whole'),
+        fraction: text('span.a-price-fraction'),
+        see_options: Array.from(card.querySelectorAll('a')).some(function (a) {
+            return a.textContent.indexOf('See options') !== -1;
+        })
+    };
+});
+"""
+
+
+def format_price(whole, fraction, see_options=False):
+    """
+    Arma el precio de una tarjeta de resultado
+    
+    Args:
+        whole (str): Parte entera (ej: "1,299" o "1,299.")
+        fraction (str): Parte decimal (ej: "99")
+        see_options (bool): La tarjeta muestra "See options" en lugar de precio
+    Returns:
+        str: Precio (ej: "1299.99"), "Varía según opciones" o "Precio no disponible"
+    """
+    if see_options:
+        return "Varía según opciones"
+    if not whole or not fraction:
+        return "Precio no disponible"
+    return f"{whole.replace(',', '').rstrip('.')}.{fraction}"
+
+
+def parse_result_count(text):
+    """
+    Extrae la cantidad de resultados del texto de la barra de resultados
+    
+    Args:
+        text (str): Ej: "1-48 of over 20,000 results for"
+    Returns:
+        int: Cantidad de resultados (0 si no se reconoce)
+    """
+    # El número está justo antes de "results" (después de "over" si lo hay)
+    parts = (text or "").split()
+    for i, part in enumerate(parts):
+        if 'results' in part.lower() and i > 0:
+            try:
+                return int(parts[i-1].replace(",", ""))
+            except ValueError:
+                pass
+    return 0
+
 
 class ProductResultsPage(BasePage):
     """Page Object para la página de resultados de productos"""
     
+    # Cookie donde el sitio guarda la moneda elegida
+    CURRENCY_COOKIE = "i18n-prefs"
+    
+    # Locators
+    PRODUCT_CARDS = (By.XPATH, "//div[@data-component-type='s-search-result']")
+    NEXT_PAGE = (By.CSS_SELECTOR, "a.s-pagination-next")
+    
     def __init__(self, driver):
         super().__init__(driver)
     
@@ -22,6 +83,11 @@ class ProductResultsPage(BasePage):
                     logger.info("La moneda ya está en USD")
                     return
                 
+                # Cookie de preferencia restaurada desde un snapshot de sesión
+                if (self.driver.get_cookie(self.CURRENCY_COOKIE) or {}).get("value") == Config.CURRENCY:
+                    logger.info("La moneda ya está en %s (cookie de preferencias)", Config.CURRENCY)
+                    return
+                
                 # Intentar hacer click en el botón de opciones de idioma/moneda
                 language_and_money_options = (By.XPATH, "//*[@id='icp-nav-flyout']/button")
                 if not self.is_element_visible(language_and_money_options):
@@ -29,7 +95,7 @@ class ProductResultsPage(BasePage):
                     return
                 
                 self.click(language_and_money_options)
-                time.sleep(2)
+                self.pause(2)
                 
                 # Buscar la opción USD
                 usd_option = (By.XPATH, "//a[contains(@href, 'currency=USD')]")
@@ -38,7 +104,7 @@ class ProductResultsPage(BasePage):
                     return
                 
                 self.click(usd_option)
-                time.sleep(5)
+                self.pause(5)
                 logger.info("Moneda cambiada a USD exitosamente")
                 
             except Exception as e:
@@ -108,7 +174,7 @@ class ProductResultsPage(BasePage):
                 else:
                     new_url = f"{current_url}&low-price={min_price}&high-price={max_price}"
                     self.driver.get(new_url)
-                    time.sleep(5)
+                    self.pause(5)
                     logger.info(f"Filtro de precio {price_range} aplicado exitosamente")
             except Exception as e:
                 logger.warning(f"No se pudo aplicar el filtro de precio: {str(e)}.")
@@ -120,22 +186,9 @@ class ProductResultsPage(BasePage):
                 # El formato es: "1-48 of over 20,000 results for"
                 # Necesitamos extraer el número después de "over" y antes de "results"
                 count_locator = (By.XPATH, "//span[contains(text(), 'results for')]")
-                time.sleep(2)
+                self.pause(2)
                 if self.is_element_visible(count_locator):
-                    count_text = self.get_text(count_locator)
-                    
-                    parts = count_text.split()
-                    
-                    count = 0
-                    for i, part in enumerate(parts):
-                        if 'results' in part.lower() and i > 0:
-                            number_str = parts[i-1].replace(",", "")
-                            try:
-                                count = int(number_str)
-                                break
-                            except:
-                                pass
-                
+                    count = parse_result_count(self.get_text(count_locator))
                     logger.info(f"Número de productos encontrados: {count}")
                     return count
                 else:
@@ -148,7 +201,7 @@ class ProductResultsPage(BasePage):
     def sort_by_options(self):
             """Abre el menú de opciones de ordenamiento"""
             with allure.step("Abrir menú de opciones de ordenamiento"):
-                time.sleep(1)
+                self.pause(1)
                 sort_options = (By.XPATH, "//select[@id='s-result-sort-select']/following-sibling::span")
                 self.is_element_visible(sort_options)
                 self.click(sort_options)
@@ -175,14 +228,14 @@ class ProductResultsPage(BasePage):
                     return False
                 
                 self.sort_by_options()
-                time.sleep(1)
+                self.pause(1)
                 
                 sort_element_xpath = sort_options_map[sort_option]
                 sort_element = (By.XPATH, sort_element_xpath)
                 
                 self.is_element_visible(sort_element)
                 self.click(sort_element)
-                time.sleep(1)
+                self.pause(1)
                 
                 logger.info(f"Productos ordenados por: {sort_option}")
                 return True
@@ -195,35 +248,114 @@ class ProductResultsPage(BasePage):
         with allure.step("Obtener información de los cinco primeros productos"):
             products_info = []
             try:
-                time.sleep(2)
-                product_elements = self.find_elements((By.XPATH, "//div[@data-component-type='s-search-result']"))[:5]
-                
-                for product in product_elements:
-                    try:
-                        product_name = product.find_element(By.XPATH, ".//h2//span").text
-                        time.sleep(1)
-                        
-                        try:
-                            product.find_element(By.XPATH, ".//a[contains(text(),'See options')]")
-                            price = "Varía según opciones"
-                            logger.info(f"Producto encontrado: {product_name} - Precio: {price}")
-                        except:
-                            try:
-                                price_whole = product.find_element(By.XPATH, ".//span[@class='a-price-whole']").text.replace(",", "")
-                                price_fraction = product.find_element(By.XPATH, ".//span[@class='a-price-fraction']").text
-                                price = f"{price_whole}.{price_fraction}"
-                                logger.info(f"Producto encontrado: {product_name} - Precio: {price}")
-                            except:
-                                price = "Precio no disponible"
-                                logger.warning(f"Producto encontrado: {product_name} - Precio no disponible")
-                        
-                        products_info.append({"name": product_name, "price": price})
-                    except Exception as e:
-                        logger.warning(f"Error procesando un producto: {str(e)}")
-                        continue
+                self.pause(2)
+                self.find_element(self.PRODUCT_CARDS)
+                for product in self._read_products()[:5]:
+                    logger.info("Producto encontrado: %s - Precio: %s", product["name"], product["price"])
+                    products_info.append({"name": product["name"], "price": product["price"], "asin": product["asin"]})
                 
                 logger.info("Información de los cinco primeros productos obtenida correctamente")
                 return products_info
             except Exception as e:
                 logger.warning(f"No se pudo obtener la información de los productos: {str(e)}.")
-                return products_info
\ No newline at end of file
+                return products_info
+
+    def iter_products(self, max_items=None, stop_when=None, max_pages=None, prefetch=False):
+        """
+        Recorre los resultados página por página entregando los productos de a uno (generador)
+        
+        Solo navega a la página siguiente cuando se consumieron todos los productos de la
+        actual, así que cortar la iteración nunca carga páginas de más.
+        
+        Args:
+            max_items (int): Cantidad máxima de productos a entregar
+            stop_when (callable): Recibe cada producto; si retorna True se corta sin entregarlo
+                (ej: lambda p: p["price"][0].isdigit() and float(p["price"]) < 100 ordenando por precio)
+            max_pages (int): Cantidad máxima de páginas a recorrer
+            prefetch (bool): Cargar la página siguiente en una pestaña de fondo mientras se
+                consume la actual (calienta la caché HTTP; la navegación sigue siendo en la
+                pestaña original del driver, que nunca se cierra)
+        Yields:
+            dict: name, price, asin, page y position (posición global en los resultados)
+        """
+        seen = set()
+        yielded = 0
+        page = 1
+        prefetch_handle = None
+        try:
+            while True:
+                products = self._read_products()
+                next_url = self._next_page_url()
+                has_next = next_url is not None and (max_pages is None or page < max_pages)
+                if prefetch and has_next:
+                    prefetch_handle = self._open_background_tab(next_url)
+                logger.info("Página de resultados %s: %s productos", page, len(products))
+                
+                for product in products:
+                    key = product["asin"] or product["name"]
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    if stop_when and stop_when(product):
+                        return
+                    yielded += 1
+                    yield dict(product, page=page, position=yielded)
+                    if max_items and yielded >= max_items:
+                        return
+                
+                if not has_next:
+                    return
+                page += 1
+                if prefetch_handle:
+                    self._close_tab(prefetch_handle)
+                    prefetch_handle = None
+                self.driver.get(next_url)
+        finally:
+            if prefetch_handle:
+                self._close_tab(prefetch_handle)
+
+    def _read_products(self):
+        """
+        Lee todas las tarjetas de resultados de la página actual en una sola llamada al navegador
+        
+        Returns:
+            list: Lista de dicts con name, price y asin
+        """
+        cards = self.driver.execute_script(READ_PRODUCTS_SCRIPT) or []
+        return [{
+            "name": card["name"],
+            "price": format_price(card["whole"], card["fraction"], card["see_options"]),
+            "asin": card["asin"],
+        } for card in cards if card["name"]]
+
+    def _next_page_url(self):
+        """URL de la página siguiente de resultados (None si es la última)"""
+        # Por JS para no esperar el implicit wait en la última página
+        url = self.driver.execute_script(
+            "var link = document.querySelector(arguments[0]); return link ? link.href : null;", self.NEXT_PAGE[1]
+        )
+        return url if url and url != self.driver.current_url else None
+
+    def _close_tab(self, handle):
+        """Cierra una pestaña de precarga y vuelve a la pestaña activa del driver"""
+        if handle not in self.driver.window_handles:
+            return
+        current = self.driver.current_window_handle
+        self.driver.switch_to.window(handle)
+        self.driver.close()
+        self.driver.switch_to.window(current)
+
+    def _open_background_tab(self, url):
+        """
+        Abre la URL en una pestaña de fondo sin cambiar la pestaña activa del driver
+        
+        Returns:
+            str: Handle de la pestaña nueva (None si el navegador no la abrió)
+        """
+        before = set(self.driver.window_handles)
+        self.driver.execute_script("window.open(arguments[0], '_blank');", url)
+        opened = set(self.driver.window_handles) - before
+        if not opened:
+            logger.warning("No se pudo abrir la pestaña de precarga: se navega sin prefetch")
+            return None
+        return opened.pop()
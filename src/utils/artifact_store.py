@@ -0,0 +1,246 @@
+"""
+Artifact Store - Almacén de artefactos direccionado por contenido (sha256)
+
+Screenshots, videos y adjuntos de allure-results se guardan una sola vez en el almacén
+(.artifacts/objects/ab/abcdef...) y en reports/ queda un hardlink al blob: los archivos
+idénticos entre tests o entre ejecuciones ocupan el espacio de uno. Los blobs viejos se
+eliminan por antigüedad y cuota de tamaño (los hardlinks de reports/ siguen siendo
+válidos aunque el blob se borre del almacén).
+
+Uso:
+    python -m src.utils.artifact_store ingest reports/allure-results reports/screenshots
+    python -m src.utils.artifact_store gc --max-age-days 14 --max-mb 2048
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import logging
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import time
+
+from config.config import Config
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+
+# Archivos de allure-results que son contenido (los *-result.json cambian en cada ejecución)
+ALLURE_ATTACHMENT_PATTERNS = ("*-attachment*",)
+
+
+def file_digest(path):
+    """sha256 de un archivo leído por bloques"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ArtifactStore:
+    """Clase que guarda blobs por hash y los enlaza desde reports/"""
+
+    def __init__(self, directory=None):
+        """
+        Args:
+            directory (str): Directorio del almacén; por defecto Config.ARTIFACT_STORE_DIR
+        """
+        self.directory = os.path.abspath(directory or Config.ARTIFACT_STORE_DIR)
+        self.objects_dir = os.path.join(self.directory, "objects")
+        self.stats = {"stored": 0, "deduplicated": 0, "bytes_saved": 0}
+
+    def blob_path(self, digest, extension=""):
+        return os.path.join(self.objects_dir, digest[:2], digest + extension)
+
+    def _store(self, source, digest, extension, from_file):
+        """Agrega el blob si no existe (atómico entre workers); retorna su ruta"""
+        blob = self.blob_path(digest, extension)
+        if os.path.exists(blob):
+            os.utime(blob)  # Última referencia: lo usa el gc
+            # Un archivo que ya es hardlink al blob (ej: screenshot guardado con put_bytes) no ahorra nada
+            if not (from_file and os.path.samefile(source, blob)):
+                self.stats["deduplicated"] += 1
+                self.stats["bytes_saved"] += os.path.getsize(blob)
+            return blob
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(blob), suffix=".tmp")
+        os.close(fd)
+        if from_file:
+            shutil.copyfile(source, tmp_path)
+        else:
+            with open(tmp_path, "wb") as f:
+                f.write(source)
+        # Solo lectura: modificar un hardlink en reports/ no debe alterar el blob compartido
+        os.chmod(tmp_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        os.replace(tmp_path, blob)
+        self.stats["stored"] += 1
+        return blob
+
+    def put_file(self, path):
+        """
+        Guarda un archivo en el almacén y lo reemplaza por un hardlink al blob
+
+        Args:
+            path (str): Archivo en reports/
+        Returns:
+            str: sha256 del contenido
+        """
+        digest = file_digest(path)
+        blob = self._store(path, digest, os.path.splitext(path)[1], from_file=True)
+        if os.path.exists(path) and os.path.samefile(path, blob):
+            return digest
+        self._link(blob, path)
+        return digest
+
+    def put_bytes(self, data, destination=None, extension=""):
+        """
+        Guarda contenido en memoria en el almacén
+
+        Args:
+            data (bytes): Contenido
+            destination (str): Si se indica, se crea ahí un hardlink al blob
+            extension (str): Extensión del blob (ej: ".png")
+        Returns:
+            str: sha256 del contenido
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        blob = self._store(data, digest, extension, from_file=False)
+        if destination:
+            self._link(blob, destination)
+        return digest
+
+    def _link(self, blob, destination):
+        """Reemplaza destination por un hardlink al blob (copia si el sistema no lo permite)"""
+        os.makedirs(os.path.dirname(destination) or ".", exist_ok=True)
+        tmp_path = f"{destination}.{os.getpid()}.link"
+        try:
+            os.link(blob, tmp_path)
+            os.replace(tmp_path, destination)
+        except OSError as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            if not os.path.exists(destination):
+                shutil.copyfile(blob, destination)
+            logger.debug("Sin hardlink para %s (%s): se conserva una copia", destination, e)
+
+    def ingest(self, directory, patterns=("*",)):
+        """
+        Reemplaza los archivos de un directorio por hardlinks al almacén
+
+        Args:
+            directory (str): Directorio (ej: reports/allure-results)
+            patterns (tuple): Patrones de nombre a incluir
+        Returns:
+            dict: Ruta relativa -> {"sha256", "size"}
+        """
+        manifest = {}
+        if not os.path.isdir(directory):
+            return manifest
+        for root, _, files in os.walk(directory):
+            for name in files:
+                if not any(fnmatch.fnmatch(name, pattern) for pattern in patterns):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    manifest[os.path.relpath(path, directory)] = {"sha256": self.put_file(path),
+                                                                  "size": os.path.getsize(path)}
+                except OSError as e:
+                    logger.warning("No se pudo agregar al almacén de artefactos %s: %s", path, e)
+        return manifest
+
+    def gc(self, max_age_days=None, max_bytes=None):
+        """
+        Elimina blobs sin referencias recientes y aplica la cuota de tamaño (LRU)
+
+        Args:
+            max_age_days (float): Antigüedad máxima desde la última referencia
+            max_bytes (int): Tamaño máximo del almacén
+        Returns:
+            dict: Blobs eliminados y bytes liberados/restantes
+        """
+        max_age_days = Config.ARTIFACT_MAX_AGE_DAYS if max_age_days is None else max_age_days
+        max_bytes = Config.ARTIFACT_MAX_MB * 1024 * 1024 if max_bytes is None else max_bytes
+        blobs = []
+        for root, _, files in os.walk(self.objects_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    info = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                blobs.append((info.st_mtime, info.st_size, path))
+        blobs.sort()
+
+        now = time.time()
+        total = sum(size for _, size, _ in blobs)
+        removed = freed = 0
+        for mtime, size, path in blobs:
+            expired = max_age_days > 0 and now - mtime > max_age_days * 86400
+            if not expired and (max_bytes <= 0 or total <= max_bytes):
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            freed += size
+            removed += 1
+        result = {"removed": removed, "freed_mb": round(freed / 1024 / 1024, 1),
+                  "remaining_mb": round(total / 1024 / 1024, 1)}
+        logger.info("GC del almacén de artefactos: %s", result)
+        return result
+
+
+def write_manifest(path, manifests):
+    """
+    Guarda el manifiesto de artefactos de la ejecución
+
+    Args:
+        path (str): Archivo de salida
+        manifests (dict): Directorio -> manifiesto de ArtifactStore.ingest
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    files = sum(len(m) for m in manifests.values())
+    unique = {entry["sha256"]: entry["size"] for m in manifests.values() for entry in m.values()}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "files": files,
+            "unique_blobs": len(unique),
+            "unique_bytes": sum(unique.values()),
+            "total_bytes": sum(entry["size"] for m in manifests.values() for entry in m.values()),
+            "directories": manifests,
+        }, f, indent=2)
+
+
+def main(argv=None):
+    """Punto de entrada de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Almacén de artefactos direccionado por contenido")
+    parser.add_argument("--store", default=Config.ARTIFACT_STORE_DIR, help="Directorio del almacén")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    ingest = subparsers.add_parser("ingest", help="Reemplazar archivos por hardlinks al almacén")
+    ingest.add_argument("directories", nargs="+")
+    gc = subparsers.add_parser("gc", help="Eliminar blobs viejos y aplicar la cuota")
+    gc.add_argument("--max-age-days", type=float, default=Config.ARTIFACT_MAX_AGE_DAYS)
+    gc.add_argument("--max-mb", type=float, default=Config.ARTIFACT_MAX_MB)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    store = ArtifactStore(args.store)
+    if args.command == "ingest":
+        for directory in args.directories:
+            manifest = store.ingest(directory)
+            print(f"{directory}: {len(manifest)} archivos")
+        print(f"Almacén: {store.stats}")
+    else:
+        print(store.gc(args.max_age_days, int(args.max_mb * 1024 * 1024)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
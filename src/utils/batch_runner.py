@@ -0,0 +1,463 @@
+"""
+Batch Runner - Ejecución de muchas búsquedas en paralelo con un pool de procesos
+
+Lee un archivo de trabajos de búsqueda (JSON-lines: keywords, brand, price_range, sorts),
+los ejecuta con HomePage / ProductResultsPage en procesos worker (cada uno con su
+propio driver) y escribe cada resultado en JSON-lines apenas termina.
+
+- Backpressure: cada worker recibe un trabajo nuevo recién cuando termina el anterior;
+  el archivo de trabajos se lee de forma incremental.
+- Timeout por trabajo: el worker que se pasa del límite se mata (con su navegador) y se
+  reemplaza por uno nuevo. Cada worker devuelve sus resultados por un pipe propio: matar
+  un worker a mitad de un envío solo deja inservible su pipe, que se descarta con él.
+- Reanudación: los trabajos que ya tienen resultado en el archivo de salida se saltan.
+- Caché (opcional, --cache): los trabajos con resultados vigentes en el caché compartido
+  (query_cache) no abren el navegador ni hacen pedidos HTTP. Sus resultados no se agregan
+  al snapshot de productos (--snapshot): no son datos nuevos de esta ejecución.
+
+Uso:
+    python -m src.utils.batch_runner jobs.jsonl --workers 3 --output reports/batch_results.jsonl
+
+Ejemplo de trabajo:
+    {"id": "zapatos-skechers", "keywords": "zapatos", "brand": "Skechers",
+     "price_range": "100-200", "sorts": ["price_high_low", "newest"]}
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+from multiprocessing.connection import wait
+
+from config.config import Config
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STATUSES = ("ok", "failed", "timeout")
+
+
+def job_id(job):
+    """Identificador estable del trabajo: el campo id o un hash de sus parámetros"""
+    if job.get("id"):
+        return str(job["id"])
+    canonical = json.dumps({k: job.get(k) for k in ("keywords", "brand", "price_range", "sorts")}, sort_keys=True)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:12]
+
+
+def read_jobs(path):
+    """
+    Lee los trabajos de forma incremental (JSON-lines; líneas vacías y # se ignoran)
+
+    Yields:
+        dict: Trabajo con su id resuelto
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                job = json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.warning("Trabajo inválido en la línea %s: %s", number, e)
+                continue
+            if not job.get("keywords"):
+                logger.warning("Trabajo sin keywords en la línea %s: se ignora", number)
+                continue
+            job["id"] = job_id(job)
+            yield job
+
+
+def completed_job_ids(output_path, retry_failed=False):
+    """
+    Trabajos que ya tienen resultado en el archivo de salida (para reanudar)
+
+    Args:
+        output_path (str): Archivo JSON-lines de resultados
+        retry_failed (bool): Volver a ejecutar los trabajos fallidos o con timeout
+    Returns:
+        set: ids de trabajos a saltar
+    """
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Línea cortada por una caída a mitad de escritura
+            if result.get("status") == "ok" or (result.get("status") in FINISHED_STATUSES and not retry_failed):
+                done.add(result.get("id"))
+    return done
+
+
+def run_search(driver, job):
+    """
+    Ejecuta el flujo de búsqueda de un trabajo con los Page Objects
+
+    Args:
+        driver: WebDriver instance
+        job (dict): Trabajo de búsqueda
+    Returns:
+        dict: Cantidad de resultados y primeros productos por ordenamiento
+    """
+    from src.pages.home_page import HomePage
+    from src.pages.product_results_page import ProductResultsPage
+
+    home = HomePage(driver)
+    products = ProductResultsPage(driver)
+    home.load()
+    home.search_product(job["keywords"])
+    products.change_money_to_dollars()
+    result = {"brand_applied": None}
+    if job.get("brand"):
+        products.apply_brand_filter(job["brand"])
+        result["brand_applied"] = products.is_brand_filter_applied(job["brand"])
+    if job.get("price_range"):
+        products.apply_price_filter(job["price_range"])
+    result["product_count"] = products.get_product_count()
+    result["sorts"] = {}
+    for sort_option in job.get("sorts") or []:
+        products.sort_by(sort_option)
+        result["sorts"][sort_option] = products.get_first_five_products_info()
+    if not job.get("sorts"):
+        result["products"] = products.get_first_five_products_info()
+    return result
+
+
+def _worker(worker_id, browser, tasks, results, http=False, cache=False, rate_limit=None):
+    """
+    Proceso worker: mantiene un driver propio y ejecuta los trabajos que recibe
+
+    Con http=True intenta primero la extracción HTTP y solo abre el navegador para
+    los trabajos que la necesitan; rate_limit es el límite de pedidos HTTP común a
+    todos los workers. Con cache=True los resultados se leen y guardan en el
+    caché compartido. Un None en la cola de tareas indica que debe terminar; cada
+    resultado se envía por results (extremo de escritura del pipe del worker).
+    """
+    from src.base import DriverFactory
+
+    logging.basicConfig(level=logging.INFO, format=f'%(asctime)s - worker {worker_id} - %(levelname)s - %(message)s')
+    driver = None
+    client = None
+    if http:
+        from src.utils.http_extractor import HttpSearchClient, search_with_fallback
+        client = HttpSearchClient(rate_limit=rate_limit)
+
+    query_cache = None
+    if cache:
+        from src.utils.query_cache import QueryCache, cached_job_search
+        query_cache = QueryCache()
+
+    def browser_search(job):
+        nonlocal driver
+        if driver is None:
+            driver = DriverFactory.create_driver(browser)
+        return run_search(driver, job)
+
+    def search(job):
+        if client is not None:
+            return search_with_fallback(client, job, browser_search)
+        return browser_search(job)
+
+    try:
+        while True:
+            job = tasks.get()
+            if job is None:
+                break
+            start = time.perf_counter()
+            result = {"id": job["id"], "job": job, "worker": worker_id}
+            try:
+                if query_cache is not None:
+                    result.update(status="ok", result=cached_job_search(query_cache, job, search))
+                else:
+                    result.update(status="ok", result=search(job))
+            except Exception as e:
+                result.update(status="failed", error=f"{type(e).__name__}: {e}")
+                # El driver puede haber quedado en un estado inválido: el próximo trabajo usa uno nuevo
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+                driver = None
+            result["duration_s"] = round(time.perf_counter() - start, 3)
+            results.send(("done", worker_id, result))
+    finally:
+        if query_cache is not None:
+            query_cache.close()
+        if client is not None:
+            client.close()
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+
+def _kill_tree(process):
+    """Termina el proceso worker y su árbol (driver y navegador); usa psutil si está instalado"""
+    try:
+        import psutil
+        children = psutil.Process(process.pid).children(recursive=True)
+    except Exception:
+        children = []
+    process.kill()
+    process.join(5)
+    for child in children:
+        try:
+            child.kill()
+        except Exception:
+            pass
+
+
+class BatchRunner:
+    """Clase que reparte trabajos de búsqueda entre procesos worker y junta sus resultados"""
+
+    def __init__(self, workers=2, browser=None, job_timeout=300.0, output_path=None, snapshot=None, http=False,
+                 cache=False):
+        """
+        Args:
+            workers (int): Cantidad de procesos worker (un navegador por worker)
+            browser (str): Navegador de los workers; por defecto Config.BROWSER
+            job_timeout (float): Segundos máximos por trabajo
+            output_path (str): Archivo JSON-lines de resultados
+            snapshot (ProductSnapshot): Si se indica, acumula los productos de los trabajos exitosos
+                buscados en esta ejecución (no los servidos desde el caché)
+            http (bool): Extraer por HTTP sin navegador cuando la página lo permite
+            cache (bool): Usar el caché compartido de resultados (query_cache)
+        """
+        self.snapshot = snapshot
+        self.http = http
+        self.cache = cache
+        self.workers = max(1, workers)
+        self.browser = browser or Config.BROWSER
+        self.job_timeout = job_timeout
+        self.output_path = output_path or os.path.join(Config.REPORTS_DIR, "batch_results.jsonl")
+        self.context = multiprocessing.get_context("spawn")
+        self.pool = {}
+        # Concurrencia y politeness delay hacia el sitio para todos los workers juntos
+        self.rate_limit = None
+        if http:
+            from src.utils.http_extractor import RateLimit
+            self.rate_limit = RateLimit(context=self.context)
+
+    # Función de los procesos worker (a nivel de módulo: el contexto spawn la importa por nombre)
+    worker_target = staticmethod(_worker)
+
+    def _spawn(self, worker_id):
+        tasks = self.context.Queue(maxsize=1)
+        results, sender = self.context.Pipe(duplex=False)
+        process = self.context.Process(target=self.worker_target,
+                                       args=(worker_id, self.browser, tasks, sender, self.http, self.cache,
+                                             self.rate_limit),
+                                       name=f"batch-worker-{worker_id}", daemon=True)
+        process.start()
+        sender.close()  # El extremo de escritura queda solo en el worker
+        self.pool[worker_id] = {"process": process, "tasks": tasks, "results": results, "job": None,
+                                "started": None}
+
+    def _assign(self, worker_id, job):
+        slot = self.pool[worker_id]
+        slot.update(job=job, started=time.monotonic())
+        slot["tasks"].put(job)
+
+    def _replace(self, worker_id, reason):
+        """Mata un worker (timeout o caída) y arranca otro en su lugar"""
+        slot = self.pool[worker_id]
+        logger.warning("Reemplazando worker %s: %s", worker_id, reason)
+        if slot["process"].is_alive():
+            _kill_tree(slot["process"])
+        slot["results"].close()  # Puede tener un mensaje a medio escribir: se descarta con el worker
+        self._spawn(worker_id)
+
+    def _receive(self, timeout):
+        """
+        Espera resultados de cualquier worker
+
+        Returns:
+            list: Mensajes (worker_id, resultado) recibidos
+        """
+        readers = {slot["results"]: worker_id for worker_id, slot in self.pool.items()}
+        received = []
+        for reader in wait(list(readers), timeout=timeout):
+            try:
+                _, worker_id, result = reader.recv()
+            except (EOFError, OSError):
+                continue  # El worker terminó: lo detecta el control de procesos vivos
+            received.append((worker_id, result))
+        return received
+
+    def run(self, jobs, skip_ids=()):
+        """
+        Ejecuta los trabajos y escribe cada resultado al terminar
+
+        Args:
+            jobs (iterable): Trabajos de búsqueda (se consumen de a uno)
+            skip_ids (set): ids ya completados en una ejecución anterior
+        Returns:
+            dict: Resumen de la ejecución
+        """
+        os.makedirs(os.path.dirname(self.output_path) or ".", exist_ok=True)
+        skipped = 0
+
+        def pending_jobs():
+            nonlocal skipped
+            for job in jobs:
+                if job["id"] in skip_ids:
+                    skipped += 1
+                else:
+                    yield job
+
+        pending = pending_jobs()
+        exhausted = False
+        durations, counts = [], {status: 0 for status in FINISHED_STATUSES}
+        cache_hits = 0
+        start = time.monotonic()
+        for worker_id in range(1, self.workers + 1):
+            self._spawn(worker_id)
+
+        with open(self.output_path, "a", encoding="utf-8") as output:
+            def write(result):
+                nonlocal cache_hits
+                counts[result["status"]] += 1
+                cache_hits += bool(result.get("result", {}).get("cached"))
+                durations.append(result["duration_s"])
+                result["finished_at"] = datetime.now().isoformat(timespec="seconds")
+                output.write(json.dumps(result, ensure_ascii=False) + "\n")
+                output.flush()
+                if self.snapshot is not None and result["status"] == "ok" and not result["result"].get("cached"):
+                    self._add_to_snapshot(result)
+                logger.info("Trabajo %s: %s en %.1fs", result["id"], result["status"], result["duration_s"])
+
+            try:
+                while True:
+                    # Backpressure: solo se lee un trabajo nuevo cuando hay un worker libre
+                    for worker_id, slot in self.pool.items():
+                        if slot["job"] is None and not exhausted:
+                            job = next(pending, None)
+                            if job is None:
+                                exhausted = True
+                            else:
+                                self._assign(worker_id, job)
+                    if exhausted and all(slot["job"] is None for slot in self.pool.values()):
+                        break
+
+                    for worker_id, result in self._receive(timeout=0.5):
+                        if self.pool[worker_id]["job"] and self.pool[worker_id]["job"]["id"] == result["id"]:
+                            self.pool[worker_id]["job"] = None
+                            write(result)
+
+                    now = time.monotonic()
+                    for worker_id, slot in list(self.pool.items()):
+                        job = slot["job"]
+                        if job is None:
+                            if not slot["process"].is_alive():
+                                self._replace(worker_id, "el proceso terminó sin trabajo asignado")
+                            continue
+                        elapsed = now - slot["started"]
+                        if elapsed > self.job_timeout:
+                            status, reason = "timeout", f"trabajo {job['id']} superó {self.job_timeout:.0f}s"
+                        elif not slot["process"].is_alive():
+                            status, reason = "failed", f"el proceso terminó con código {slot['process'].exitcode}"
+                        else:
+                            continue
+                        self._replace(worker_id, reason)
+                        write({"id": job["id"], "job": job, "worker": worker_id, "status": status,
+                               "error": reason, "duration_s": round(elapsed, 3)})
+            finally:
+                self.shutdown()
+
+        elapsed = time.monotonic() - start
+        finished = sum(counts.values())
+        summary = {
+            "jobs": finished,
+            "skipped": skipped,
+            **counts,
+            "workers": self.workers,
+            "elapsed_s": round(elapsed, 2),
+            "queries_per_minute": round(finished / elapsed * 60, 2) if elapsed else 0.0,
+            "job_p50_s": round(statistics.median(durations), 2) if durations else None,
+            "job_max_s": round(max(durations), 2) if durations else None,
+        }
+        if self.cache:
+            summary["cache_hits"] = cache_hits
+            summary["cache_hit_rate"] = round(cache_hits / finished, 3) if finished else None
+        with open(os.path.splitext(self.output_path)[0] + "_summary.json", "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        logger.info("Batch terminado: %s", summary)
+        return summary
+
+    def _add_to_snapshot(self, result):
+        job = result["job"]
+        query = "|".join(str(job.get(k) or "") for k in ("keywords", "brand", "price_range"))
+        for sort_option, products in result["result"].get("sorts", {}).items():
+            self.snapshot.add(products, query=query, sort=sort_option)
+        if "products" in result["result"]:
+            self.snapshot.add(result["result"]["products"], query=query, sort="relevance")
+
+    def shutdown(self):
+        """Pide a los workers que terminen y mata los que no responden"""
+        for slot in self.pool.values():
+            try:
+                slot["tasks"].put_nowait(None)
+            except Exception:
+                pass
+        for slot in self.pool.values():
+            slot["process"].join(10)
+            if slot["process"].is_alive():
+                _kill_tree(slot["process"])
+            slot["results"].close()
+        self.pool.clear()
+
+
+def main(argv=None):
+    """Punto de entrada de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Ejecuta trabajos de búsqueda en paralelo")
+    parser.add_argument("jobs", help="Archivo JSON-lines de trabajos")
+    parser.add_argument("--workers", type=int, default=2, help="Procesos worker (un navegador cada uno)")
+    parser.add_argument("--browser", default=Config.BROWSER, help="Navegador: chrome, firefox")
+    parser.add_argument("--timeout", type=float, default=300.0, help="Segundos máximos por trabajo")
+    parser.add_argument("--output", default=os.path.join(Config.REPORTS_DIR, "batch_results.jsonl"),
+                        help="Archivo JSON-lines de resultados")
+    parser.add_argument("--no-resume", action="store_true", help="No saltar trabajos ya presentes en la salida")
+    parser.add_argument("--retry-failed", action="store_true", help="Al reanudar, repetir trabajos fallidos")
+    parser.add_argument("--http", action="store_true", default=Config.HTTP_EXTRACTION,
+                        help="Extraer por HTTP sin navegador (con fallback al navegador si la página usa JavaScript)")
+    parser.add_argument("--cache", action="store_true",
+                        help="Reutilizar resultados vigentes del caché compartido (por defecto se busca en vivo)")
+    parser.add_argument("--snapshot", action="store_true",
+                        help="Guardar los productos extraídos como snapshot columnar (PRODUCT_STORE_DIR)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    skip_ids = set() if args.no_resume else completed_job_ids(args.output, args.retry_failed)
+    if skip_ids:
+        logger.info("Reanudando: %s trabajos ya completados se saltan", len(skip_ids))
+    snapshot = None
+    if args.snapshot:
+        from src.utils.product_store import ProductSnapshot
+        snapshot = ProductSnapshot()
+    runner = BatchRunner(workers=args.workers, browser=args.browser, job_timeout=args.timeout,
+                         output_path=args.output, snapshot=snapshot, http=args.http,
+                         cache=args.cache)
+    summary = runner.run(read_jobs(args.jobs), skip_ids)
+    if snapshot is not None:
+        from src.utils.product_store import ProductStore
+        ProductStore().save(snapshot)
+    print(f"{summary['jobs']} trabajos en {summary['elapsed_s']}s: "
+          f"{summary['queries_per_minute']} consultas/min ({summary['ok']} ok, {summary['failed']} fallidos, "
+          f"{summary['timeout']} timeout)")
+    if "cache_hits" in summary:
+        print(f"Caché: {summary['cache_hits']} trabajos sin búsqueda (tasa de aciertos {summary['cache_hit_rate']})")
+    return 0 if summary["failed"] == 0 and summary["timeout"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+Browser Contexts - Un navegador compartido con contextos aislados por test (Chrome / CDP)
+
+En lugar de lanzar un navegador por test, se mantiene uno solo por proceso y cada test
+recibe un contexto nuevo (Target.createBrowserContext: cookies, storage y caché propios,
+como una ventana de incógnito). El driver del test es una fachada de WebDriver que usa
+la misma sesión pero antes de cada comando se posiciona en la pestaña de su contexto;
+quit() elimina el contexto en milisegundos y deja el navegador abierto.
+
+El navegador es uno por proceso (con xdist, uno por worker) y un RLock serializa los
+comandos de todos los contextos sobre la sesión compartida: ahorra el arranque por test,
+no permite correr tests en paralelo sobre el mismo navegador.
+"""
+
+import copy
+import logging
+import threading
+import time
+
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.mobile import Mobile
+from selenium.webdriver.remote.switch_to import SwitchTo
+
+from src.utils.browser_profile import startup_stats
+
+logger = logging.getLogger(__name__)
+
+
+class SharedBrowser:
+    """Clase que mantiene un navegador Chrome de larga vida y crea contextos aislados"""
+
+    def __init__(self, browser="chrome"):
+        """
+        Args:
+            browser (str): Solo chrome (los contextos se crean por CDP)
+        Raises:
+            ValueError: Si el navegador no es Chromium
+        """
+        if browser != "chrome":
+            raise ValueError(f"Los contextos aislados requieren Chrome (CDP), no {browser}")
+        self.browser = browser
+        self.driver = None
+        self.home_handle = None
+        self.active_handle = None
+        self.lock = threading.RLock()
+        self.contexts = {}
+
+    def start(self):
+        """Lanza el navegador compartido (una sola vez)"""
+        from src.base import DriverFactory
+
+        if self.driver is None:
+            self.driver = DriverFactory.create_driver(self.browser)
+            self.home_handle = self.active_handle = self.driver.current_window_handle
+            logger.info("Navegador compartido iniciado para contextos aislados")
+        return self
+
+    def _execute(self, target, driver_command, params=None):
+        """Ejecuta un comando en la sesión compartida sin pasar por las fachadas"""
+        return type(self.driver).execute(target, driver_command, params)
+
+    def _cdp(self, method, params=None):
+        """Comando CDP de nivel navegador, enviado desde la pestaña base"""
+        self._switch(self.driver, self.home_handle)
+        response = self._execute(self.driver, "executeCdpCommand", {"cmd": method, "params": params or {}})
+        return response["value"]
+
+    def _switch(self, target, handle):
+        if self.active_handle != handle:
+            self._execute(target, Command.SWITCH_TO_WINDOW, {"handle": handle})
+            self.active_handle = handle
+
+    def new_context(self):
+        """
+        Crea un contexto aislado con su pestaña y retorna un driver ligado a él
+
+        Returns:
+            WebDriver: Fachada del driver compartido ligada al contexto
+        """
+        self.start()
+        start = time.perf_counter()
+        with self.lock:
+            context_id = self._cdp("Target.createBrowserContext", {"disposeOnDetach": False})["browserContextId"]
+            target_id = self._cdp("Target.createTarget", {"url": "about:blank",
+                                                          "browserContextId": context_id})["targetId"]
+        driver = self._bind(context_id, target_id)
+        self.contexts[context_id] = driver
+        elapsed = time.perf_counter() - start
+        startup_stats.record("context", "driver_start_s", elapsed)
+        logger.info("Contexto aislado creado en %.0fms (%s activos)", elapsed * 1000, len(self.contexts))
+        return driver
+
+    def _bind(self, context_id, handle):
+        """Fachada de WebDriver: misma sesión, comandos siempre en la pestaña de su contexto"""
+        shared = self
+        driver = copy.copy(self.driver)
+        # Sin los métodos de instancia del driver original (get medido, quit, execute instrumentado)
+        for name in ("get", "quit", "execute", "_traced"):
+            driver.__dict__.pop(name, None)
+        driver._switch_to = SwitchTo(driver)
+        driver._mobile = Mobile(driver)
+        driver.pinned_scripts = {}
+        # Sin proceso propio: el monitor de recursos no debe tocar el navegador compartido
+        driver.service = None
+        driver.browser_context_id = context_id
+        driver.context_handle = handle
+
+        def execute(driver_command, params=None):
+            with shared.lock:
+                if driver_command != Command.SWITCH_TO_WINDOW:
+                    shared._switch(driver, driver.context_handle)
+                response = shared._execute(driver, driver_command, params)
+                if driver_command == Command.SWITCH_TO_WINDOW:
+                    driver.context_handle = shared.active_handle = params["handle"]
+                elif driver_command == Command.CLOSE:
+                    shared.active_handle = None
+                elif driver_command == Command.W3C_GET_WINDOW_HANDLES:
+                    response["value"] = shared._context_handles(driver, context_id, response["value"])
+                return response
+
+        def quit():
+            shared.dispose(context_id)
+
+        driver.execute = execute
+        driver.quit = quit
+        return driver
+
+    def _context_handles(self, driver, context_id, handles):
+        """Deja solo las pestañas del contexto (las de otros tests no se ven)"""
+        response = self._execute(driver, "executeCdpCommand", {"cmd": "Target.getTargets", "params": {}})
+        own = {info["targetId"] for info in response["value"]["targetInfos"]
+               if info.get("browserContextId") == context_id}
+        return [handle for handle in handles if handle in own]
+
+    def dispose(self, context_id):
+        """Cierra el contexto y todas sus pestañas"""
+        if self.contexts.pop(context_id, None) is None:
+            return
+        start = time.perf_counter()
+        with self.lock:
+            try:
+                self._cdp("Target.disposeBrowserContext", {"browserContextId": context_id})
+            except Exception as e:
+                logger.warning("No se pudo eliminar el contexto %s: %s", context_id, e)
+        logger.info("Contexto aislado eliminado en %.0fms", (time.perf_counter() - start) * 1000)
+
+    def close(self):
+        """Elimina los contextos pendientes y cierra el navegador compartido"""
+        for context_id in list(self.contexts):
+            self.dispose(context_id)
+        if self.driver is not None:
+            self.driver.quit()
+            self.driver = None
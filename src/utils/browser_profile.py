@@ -0,0 +1,311 @@
+"""
+Browser Profile - Plantilla de perfil precalentado y clones baratos por driver
+
+La plantilla se construye una sola vez (caché HTTP poblado, idioma y moneda
+configurados) y cada driver nuevo recibe un clon: los blobs externos de la caché
+blockfile (f_*), que nunca se reescriben, se enlazan con hardlinks; el resto se clona
+copy-on-write (reflink) si el sistema de archivos lo permite y, si no, se copia.
+
+Cada construcción va a un directorio nuevo (generación) y se publica reemplazando
+atómicamente el marcador de la plantilla, así un rebuild nunca borra archivos que otro
+worker está clonando.
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+from config.config import Config
+
+logger = logging.getLogger(__name__)
+
+READY_MARKER = ".template_ready.json"
+LOCK_FILE = ".template.lock"
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin reflink, se usa hardlink/copia
+    fcntl = None
+
+# ioctl de Linux para clonar un archivo copy-on-write (btrfs, xfs, overlay con reflink)
+FICLONE = 0x40049409
+
+# Directorios de caché (blockfile en Cache o Cache_Data según la versión de Chrome)
+CACHE_DIRS = {"Cache_Data", "Cache"}
+
+# Blobs externos de blockfile: se escriben una vez y luego solo se leen o eliminan, así que se
+# comparten por hardlink. El resto de la caché (index, data_N, entradas "<hash>_0" y
+# index-dir/the-real-index de simple cache) se reescribe en el lugar y no puede compartirse
+WRITE_ONCE_CACHE_FILES = re.compile(r"^f_[0-9a-f]{6}$")
+
+# Archivos de bloqueo de una instancia previa que impedirían abrir el clon
+LOCK_NAMES = {"SingletonLock", "SingletonCookie", "SingletonSocket", "lock", ".parentlock", "parent.lock"}
+
+
+def _reflink(src, dst):
+    """Intenta clonar el archivo copy-on-write; retorna False si el sistema no lo soporta"""
+    if fcntl is None:
+        return False
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        shutil.copystat(src, dst)
+        return True
+    except OSError:
+        if os.path.exists(dst):
+            os.remove(dst)
+        return False
+
+
+def _copy_tree(source, destination):
+    """
+    Clona un perfil: hardlink para los blobs de caché que no se reescriben, reflink
+    (copy-on-write) cuando el sistema de archivos lo soporta y copia para el resto
+
+    Returns:
+        dict: Cantidad de archivos enlazados, clonados con reflink y copiados
+    """
+    counts = {"hardlink": 0, "reflink": 0, "copy": 0}
+    for root, dirs, files in os.walk(source):
+        relative = os.path.relpath(root, source)
+        target_root = os.path.join(destination, relative) if relative != "." else destination
+        os.makedirs(target_root, exist_ok=True)
+        cache_dir = not CACHE_DIRS.isdisjoint(relative.split(os.sep))
+        for name in files:
+            if name in LOCK_NAMES or name in (READY_MARKER, LOCK_FILE):
+                continue
+            src, dst = os.path.join(root, name), os.path.join(target_root, name)
+            if os.path.islink(src):
+                continue
+            if cache_dir and WRITE_ONCE_CACHE_FILES.match(name):
+                try:
+                    os.link(src, dst)
+                    counts["hardlink"] += 1
+                    continue
+                except OSError:
+                    pass  # Otro sistema de archivos o sin soporte: se copia
+            if _reflink(src, dst):
+                counts["reflink"] += 1
+                continue
+            shutil.copy2(src, dst)
+            counts["copy"] += 1
+    return counts
+
+
+class ProfileTemplate:
+    """Clase que construye la plantilla de perfil y entrega clones para cada driver"""
+
+    def __init__(self, browser, template_dir=None, clones_dir=None):
+        """
+        Args:
+            browser (str): chrome o firefox
+            template_dir (str): Directorio de la plantilla (marcador y generaciones)
+            clones_dir (str): Directorio donde se crean los clones
+        """
+        self.browser = browser
+        self.template_dir = os.path.abspath(template_dir or os.path.join(Config.PROFILE_DIR, f"template_{browser}"))
+        self.clones_dir = os.path.abspath(clones_dir or os.path.join(Config.PROFILE_DIR, "clones"))
+
+    @property
+    def current(self):
+        """Marcador de la generación publicada (None si todavía no hay plantilla)"""
+        try:
+            with open(os.path.join(self.template_dir, READY_MARKER), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    @property
+    def ready(self):
+        return self.current is not None
+
+    def _usable(self, max_age_hours):
+        """Directorio de la generación publicada si existe y no venció, si no None"""
+        marker = self.current
+        if not marker or "build" not in marker:
+            return None
+        if max_age_hours > 0 and time.time() - marker.get("built_at", 0) > max_age_hours * 3600:
+            return None
+        return os.path.join(self.template_dir, marker["build"])
+
+    def ensure(self, max_age_hours=None):
+        """
+        Construye la plantilla si no existe o venció (protegido por lock entre workers)
+
+        Args:
+            max_age_hours (float): Antigüedad máxima; por defecto Config.PROFILE_MAX_AGE_HOURS
+        Returns:
+            str: Directorio de la generación vigente, del que se clona
+        """
+        max_age_hours = Config.PROFILE_MAX_AGE_HOURS if max_age_hours is None else max_age_hours
+        source = self._usable(max_age_hours)
+        if source:
+            return source
+        os.makedirs(os.path.dirname(self.template_dir), exist_ok=True)
+        lock_path = self.template_dir + ".lock"
+        deadline = time.time() + 300
+        while True:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.close(fd)
+                break
+            except FileExistsError:
+                source = self._usable(max_age_hours)
+                if source:
+                    return source  # Otro worker terminó de construirla
+                try:
+                    if time.time() > deadline or time.time() - os.path.getmtime(lock_path) > 300:
+                        logger.warning("Lock de plantilla vencido, se elimina: %s", lock_path)
+                        os.remove(lock_path)
+                except FileNotFoundError:
+                    continue  # El otro worker liberó el lock
+                time.sleep(0.5)
+        try:
+            # El lock se mantiene desde la verificación hasta publicar la nueva generación
+            return self._usable(max_age_hours) or self._build()
+        finally:
+            os.remove(lock_path)
+
+    def _build(self):
+        """
+        Lanza el navegador sobre una generación nueva, la precalienta, la cierra y la publica
+
+        La generación anterior se conserva (puede haber clones en curso desde ella); las
+        más viejas se eliminan.
+
+        Returns:
+            str: Directorio de la nueva generación
+        """
+        from src.base import DriverFactory
+
+        previous = (self.current or {}).get("build")
+        os.makedirs(self.template_dir, exist_ok=True)
+        generation = tempfile.mkdtemp(prefix="build_", dir=self.template_dir)
+        build = os.path.basename(generation)
+        logger.info("Construyendo plantilla de perfil %s: %s", self.browser, generation)
+        start = time.perf_counter()
+        driver = DriverFactory.create_driver(self.browser, profile_dir=generation)
+        try:
+            for url in Config.PROFILE_WARMUP_URLS or [Config.BASE_URL]:
+                driver.get(url)
+            driver.add_cookie({
+                "name": "i18n-prefs",
+                "value": Config.CURRENCY,
+                "path": "/",
+                "expiry": int(time.time()) + 365 * 24 * 3600,
+            })
+            driver.get(driver.current_url)
+        finally:
+            driver.quit()
+        marker_path = os.path.join(self.template_dir, READY_MARKER)
+        with open(marker_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({
+                "build": build,
+                "browser": self.browser,
+                "built_at": time.time(),
+                "locale": Config.PROFILE_LOCALE,
+                "currency": Config.CURRENCY,
+                "build_seconds": round(time.perf_counter() - start, 2),
+            }, f)
+        os.replace(marker_path + ".tmp", marker_path)
+        for name in os.listdir(self.template_dir):
+            if name.startswith("build_") and name not in (build, previous):
+                shutil.rmtree(os.path.join(self.template_dir, name), ignore_errors=True)
+        logger.info("Plantilla de perfil lista en %.1fs", time.perf_counter() - start)
+        return generation
+
+    def clone(self):
+        """
+        Crea un clon de la plantilla para un driver nuevo
+
+        Returns:
+            str: Directorio del clon
+        """
+        source = self.ensure()
+        os.makedirs(self.clones_dir, exist_ok=True)
+        destination = tempfile.mkdtemp(prefix=f"{self.browser}_", dir=self.clones_dir)
+        start = time.perf_counter()
+        counts = _copy_tree(source, destination)
+        logger.info("Perfil clonado en %.0fms %s: %s", (time.perf_counter() - start) * 1000, counts, destination)
+        return destination
+
+
+class StartupStats:
+    """Clase que acumula tiempos de arranque y primera navegación por modo (template / cold / remote)"""
+
+    def __init__(self, history=50):
+        self.history = history
+        self.samples = {}
+
+    def record(self, mode, metric, seconds):
+        """Registra una medición (segundos) para un modo y métrica"""
+        self.samples.setdefault(mode, {}).setdefault(metric, []).append(round(seconds, 3))
+
+    def save(self, path):
+        """
+        Combina las mediciones con las de corridas anteriores y guarda el resumen
+
+        Returns:
+            dict: Resumen por modo y métrica, con la mejora del template contra cold
+        """
+        if not self.samples:
+            return None
+        data = {"samples": {}}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except Exception:
+                pass
+        for mode, metrics in self.samples.items():
+            for metric, values in metrics.items():
+                stored = data.setdefault("samples", {}).setdefault(mode, {}).setdefault(metric, [])
+                stored.extend(values)
+                del stored[:-self.history]
+
+        summary = {}
+        for mode, metrics in data["samples"].items():
+            summary[mode] = {metric: {"count": len(values), "median_s": round(statistics.median(values), 3)}
+                             for metric, values in metrics.items() if values}
+        for metric, stats in summary.get("template", {}).items():
+            cold = summary.get("cold", {}).get(metric)
+            if cold and stats["median_s"]:
+                stats["speedup_vs_cold"] = round(cold["median_s"] / stats["median_s"], 2)
+        data["summary"] = summary
+        data["updated_at"] = datetime.now().isoformat(timespec="seconds")
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        logger.info("Arranque de navegador (mediana): %s", summary)
+        return summary
+
+
+startup_stats = StartupStats()
+
+
+def track_first_navigation(driver, mode):
+    """
+    Mide la primera navegación del driver y la registra en startup_stats
+
+    Args:
+        driver: WebDriver instance
+        mode (str): template, cold o remote
+    """
+    original_get = driver.get
+
+    def get(url):
+        start = time.perf_counter()
+        try:
+            return original_get(url)
+        finally:
+            startup_stats.record(mode, "first_navigation_s", time.perf_counter() - start)
+            driver.get = original_get
+
+    driver.get = get
@@ -0,0 +1,155 @@
+"""
+Budgets - Presupuestos de tiempo como aserciones de rendimiento
+
+Uso en un step:
+    with allure.step("Buscar y filtrar"), budget("busqueda + filtros", 8):
+        ...
+
+Uso en un test completo:
+    @pytest.mark.budget(seconds=90, retries=1)
+    def test_flujo(driver): ...
+"""
+
+import json
+import logging
+import time
+from contextlib import contextmanager
+
+import pytest
+
+from config.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class BudgetExceeded(AssertionError):
+    """Se lanza cuando un bloque supera su presupuesto de tiempo (más la tolerancia)"""
+
+
+class BudgetTracker:
+    """Clase que acumula los resultados de presupuestos del test en ejecución"""
+
+    def __init__(self):
+        self.results = []
+        self.attempt = 1
+
+    def reset(self):
+        """Descarta los resultados del test anterior"""
+        self.results = []
+        self.attempt = 1
+
+    def record(self, name, budget_s, measured_s, tolerance):
+        """
+        Registra una medición y retorna si está dentro del presupuesto
+
+        Args:
+            name (str): Nombre del presupuesto
+            budget_s (float): Presupuesto en segundos
+            measured_s (float): Tiempo medido en segundos
+            tolerance (float): Tolerancia relativa (0.1 = 10%)
+        Returns:
+            dict: Resultado registrado
+        """
+        limit = budget_s * (1 + tolerance)
+        result = {
+            "name": name,
+            "attempt": self.attempt,
+            "budget_s": round(budget_s, 3),
+            "limit_s": round(limit, 3),
+            "measured_s": round(measured_s, 3),
+            "ratio": round(measured_s / budget_s, 3) if budget_s else None,
+            "passed": measured_s <= limit,
+        }
+        self.results.append(result)
+        level = logging.INFO if result["passed"] else logging.WARNING
+        logger.log(level, f"Presupuesto '{name}': {measured_s:.3f}s / {budget_s:.3f}s "
+                          f"(límite {limit:.3f}s) -> {'OK' if result['passed'] else 'EXCEDIDO'}")
+        return result
+
+    def as_html(self):
+        """Tabla HTML con los resultados (para pytest-html)"""
+        rows = "".join(
+            f"<tr><td>{r['name']} (intento {r['attempt']})</td><td>{r['measured_s']}s</td><td>{r['budget_s']}s</td>"
+            f"<td>{r['limit_s']}s</td><td>{'OK' if r['passed'] else 'EXCEDIDO'}</td></tr>"
+            for r in self.results
+        )
+        return ("<table><tr><th>Presupuesto</th><th>Medido</th><th>Objetivo</th>"
+                f"<th>Límite</th><th>Estado</th></tr>{rows}</table>")
+
+    def as_json(self):
+        """Resultados serializados (para Allure)"""
+        return json.dumps(self.results, indent=2, ensure_ascii=False)
+
+
+budget_tracker = BudgetTracker()
+
+
+def marker_seconds(marker, test_name):
+    """
+    Presupuesto en segundos de un marker budget (posicional o seconds=)
+
+    Raises:
+        pytest.UsageError: Si el marker no indica el presupuesto o no es un número positivo
+    """
+    seconds = marker.kwargs.get("seconds", marker.args[0] if marker.args else None)
+    if isinstance(seconds, bool) or not isinstance(seconds, (int, float)) or seconds <= 0:
+        raise pytest.UsageError(
+            f"@pytest.mark.budget de {test_name} necesita un presupuesto en segundos "
+            f"(ej: @pytest.mark.budget(seconds=90, retries=1)), recibió {seconds!r}"
+        )
+    return seconds
+
+
+def run_with_budget(pyfuncitem, on_retry=None):
+    """
+    Ejecuta la función de un test aplicando su marker budget y reintentando
+    cuando se excede un presupuesto (del test o de alguno de sus steps)
+
+    Args:
+        pyfuncitem: Item de pytest a ejecutar
+        on_retry (callable): Se llama antes de cada reintento (ej: descartar checkpoints)
+    """
+    marker = pyfuncitem.get_closest_marker("budget")
+    retries = marker.kwargs.get("retries", Config.BUDGET_RETRIES) if marker else Config.BUDGET_RETRIES
+    seconds = marker_seconds(marker, pyfuncitem.name) if marker else None
+    testargs = {arg: pyfuncitem.funcargs[arg] for arg in pyfuncitem._fixtureinfo.argnames}
+
+    for attempt in range(1, retries + 2):
+        budget_tracker.attempt = attempt
+        if attempt > 1 and on_retry:
+            on_retry()
+        try:
+            if marker:
+                with budget(f"test {pyfuncitem.name}", seconds, marker.kwargs.get("tolerance")):
+                    pyfuncitem.obj(**testargs)
+            else:
+                pyfuncitem.obj(**testargs)
+            return
+        except BudgetExceeded as e:
+            if attempt > retries:
+                raise
+            logger.warning("%s. Reintentando (%s/%s)...", e, attempt, retries)
+
+
+@contextmanager
+def budget(name, seconds, tolerance=None):
+    """
+    Context manager que mide un bloque y falla si supera el presupuesto
+
+    Args:
+        name (str): Nombre del presupuesto (aparece en los reportes)
+        seconds (float): Presupuesto en segundos
+        tolerance (float): Tolerancia relativa; por defecto Config.BUDGET_TOLERANCE
+    Raises:
+        BudgetExceeded: Si el bloque tardó más que seconds * (1 + tolerance)
+    """
+    tolerance = Config.BUDGET_TOLERANCE if tolerance is None else tolerance
+    start = time.perf_counter()
+    yield
+    # Solo se evalúa si el bloque terminó sin errores: un fallo funcional tiene prioridad
+    result = budget_tracker.record(name, seconds, time.perf_counter() - start, tolerance)
+    if not result["passed"] and Config.BUDGET_ENFORCE:
+        raise BudgetExceeded(
+            f"Presupuesto '{name}' excedido: {result['measured_s']}s > {result['limit_s']}s "
+            f"(objetivo {seconds}s + {tolerance:.0%})"
+        )
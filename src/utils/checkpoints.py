@@ -0,0 +1,222 @@
+"""
+Checkpoints - Steps de allure reanudables
+
+Cada step completado guarda un checkpoint (URL, cookies, datos retornados y
+duración). Si el test falla y se reintenta, los steps ya completados se saltan
+(devolviendo sus datos guardados), la sesión del navegador se reemplaza si dejó de
+responder, se restaura al estado del último checkpoint y la ejecución continúa desde
+el primer step pendiente.
+"""
+
+import json
+import logging
+import os
+import re
+import time
+
+import allure
+
+from config.config import Config
+from src.utils.session_state import SessionStateStore
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointFlow:
+    """Clase que ejecuta steps de allure registrando checkpoints reanudables"""
+
+    def __init__(self, driver, test_id, directory=None, resume=None, ttl_minutes=None, replace_driver=None):
+        """
+        Args:
+            driver: WebDriver instance
+            test_id (str): Identificador del test (nodeid)
+            directory (str): Directorio de checkpoints
+            resume (bool): Reanudar desde checkpoints previos en disco (ej: rerun de CI)
+            ttl_minutes (float): Antigüedad máxima de un checkpoint en disco para reanudar
+            replace_driver (callable): Recibe el driver y lo pasa a una sesión nueva (ver recover)
+        """
+        self.driver = driver
+        self.replace_driver = replace_driver
+        self.test_id = test_id
+        directory = directory or Config.CHECKPOINTS_DIR
+        self.path = os.path.join(directory, re.sub(r"[^\w.-]+", "_", test_id) + ".json")
+        self.checkpoints = []
+        self.index = 0
+        self.skipping = False
+        self.time_saved_s = 0.0
+        self.resumes = 0
+
+        resume = Config.CHECKPOINT_RESUME if resume is None else resume
+        ttl_minutes = Config.CHECKPOINT_TTL_MINUTES if ttl_minutes is None else ttl_minutes
+        if resume and os.path.exists(self.path) and time.time() - os.path.getmtime(self.path) < ttl_minutes * 60:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.checkpoints = json.load(f)
+            self.skipping = bool(self.checkpoints)
+            if self.skipping:
+                self.resumes += 1
+                logger.info("Checkpoints previos encontrados para %s: %s steps", test_id, len(self.checkpoints))
+
+    def step(self, title, action=None):
+        """
+        Ejecuta un step (o lo salta si ya tiene checkpoint al reanudar)
+
+        Args:
+            title (str): Título del step de allure
+            action (callable): Función sin argumentos; su retorno debe ser serializable a JSON
+        Returns:
+            Lo retornado por action (o los datos guardados si el step se saltó)
+        """
+        position = self.index
+        self.index += 1
+
+        if self.skipping:
+            saved = self.checkpoints[position] if position < len(self.checkpoints) else None
+            if saved and saved["title"] == title:
+                with allure.step(f"{title} (reanudado desde checkpoint)"):
+                    self.time_saved_s += saved["duration_s"]
+                return saved["data"]
+            self.skipping = False
+            if position > 0:
+                self._restore(self.checkpoints[position - 1])
+
+        with allure.step(title):
+            start = time.perf_counter()
+            data = action() if action else None
+            duration = time.perf_counter() - start
+
+        del self.checkpoints[position:]
+        self.checkpoints.append({
+            "title": title,
+            "url": self.driver.current_url,
+            "cookies": self.driver.get_cookies(),
+            "data": data,
+            "duration_s": round(duration, 3),
+        })
+        self._persist()
+        return data
+
+    def _restore(self, checkpoint):
+        """Restaura cookies y URL del último checkpoint antes del primer step pendiente"""
+        logger.info("Reanudando %s desde el checkpoint '%s' (%.1fs ahorrados)",
+                    self.test_id, checkpoint["title"], self.time_saved_s)
+        origin = "/".join(checkpoint["url"].split("/")[:3])
+        SessionStateStore().restore(self.driver, {
+            "name": f"checkpoint:{checkpoint['title']}",
+            "origin": origin,
+            "cookies": checkpoint["cookies"],
+            "local_storage": {},
+        })
+        self.driver.get(checkpoint["url"])
+
+    def session_alive(self):
+        """Indica si la sesión del driver sigue respondiendo"""
+        try:
+            self.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def recover(self):
+        """
+        Reemplaza la sesión del driver si dejó de responder, antes de reanudar
+
+        replace_driver conecta el mismo objeto driver a la sesión nueva, porque los page
+        objects del test guardan esa referencia. El próximo step pendiente restaura en ella
+        el último checkpoint.
+
+        Returns:
+            bool: True si se reemplazó la sesión
+        """
+        if self.replace_driver is None or self.session_alive():
+            return False
+        logger.warning("La sesión del driver de %s no responde: se crea una nueva", self.test_id)
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+        self.replace_driver(self.driver)
+        return True
+
+    def _persist(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.checkpoints, f)
+
+    def rewind(self, keep=True):
+        """
+        Prepara un nuevo intento del test
+
+        Args:
+            keep (bool): True reanuda desde los checkpoints; False vuelve a ejecutar todo
+        """
+        self.index = 0
+        if not keep:
+            self.checkpoints = []
+        self.skipping = bool(self.checkpoints)
+        if self.skipping:
+            self.resumes += 1
+
+    def summary(self):
+        """Resumen de la reanudación para reportes"""
+        return {
+            "steps": len(self.checkpoints),
+            "resumes": self.resumes,
+            "time_saved_s": round(self.time_saved_s, 2),
+        }
+
+    def discard(self):
+        """Elimina los checkpoints en disco para que un rerun no reanude (ej: falló una verificación)"""
+        self.checkpoints = []
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def finish(self):
+        """El test terminó bien: descarta los checkpoints y reporta el tiempo ahorrado"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        if self.resumes:
+            summary = self.summary()
+            logger.info("Test %s completado reanudando desde checkpoints: %s", self.test_id, summary)
+            try:
+                allure.attach(json.dumps(summary, indent=2), name="Checkpoints",
+                              attachment_type=allure.attachment_type.JSON)
+            except Exception:
+                pass
+
+
+def run_resumable(pyfuncitem, run):
+    """
+    Ejecuta un test marcado como resumable, reintentando desde el último checkpoint
+
+    Solo se reanudan los errores de infraestructura (WebDriver, red, timeouts); antes de
+    reanudar se reemplaza la sesión del driver si murió (CheckpointFlow.recover). Un
+    AssertionError (incluido BudgetExceeded, tras agotar los reintentos de presupuesto)
+    es el resultado del test: se propaga sin reanudar y se descartan los checkpoints,
+    porque reanudar saltaría todos los steps y el test pasaría sin verificar nada.
+
+    Args:
+        pyfuncitem: Item de pytest
+        run (callable): Ejecuta un intento completo del test
+    """
+    marker = pyfuncitem.get_closest_marker("resumable")
+    retries = marker.kwargs.get("retries", Config.CHECKPOINT_RETRIES)
+    flow = pyfuncitem.funcargs.get("checkpoints")
+
+    for attempt in range(1, retries + 2):
+        try:
+            run()
+            if flow:
+                flow.finish()
+                pyfuncitem.user_properties.append(("checkpoints", flow.summary()))
+            return
+        except AssertionError:
+            if flow:
+                flow.discard()
+            raise
+        except Exception as e:
+            if attempt > retries or flow is None or not flow.checkpoints:
+                raise
+            logger.warning("Falló el intento %s de %s: %s. Reanudando desde el checkpoint '%s'...",
+                           attempt, pyfuncitem.name, e, flow.checkpoints[-1]["title"])
+            flow.recover()
+            flow.rewind(keep=True)
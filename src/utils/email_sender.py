@@ -181,7 +181,8 @@ class EmailSender:
         try:
             allure_results = os.path.join(report_path, "allure-results")
             if os.path.exists(allure_results):
-                # Crear ZIP de los resultados
+                # Crear ZIP de los resultados: ZIP completo a propósito, el destinatario no tiene
+                # acceso al almacén de artefactos (.artifacts) del agente para resolver referencias
                 zip_path = os.path.join(report_path, "allure-results.zip")
                 shutil.make_archive(
                     os.path.join(report_path, "allure-results"),
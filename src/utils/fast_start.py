@@ -0,0 +1,84 @@
+"""
+Fast start - Lanzador de pytest para ejecuciones locales rápidas (smoke)
+
+pytest.ini activa por defecto los reportes (pytest-html, Allure, cobertura), y pytest importa
+todos los plugins registrados por entry point antes de leer conftest.py: desde conftest ya es
+tarde para evitarlo. Este lanzador agrega "-p no:<plugin>" por cada plugin de reportes cuya
+opción no aparece en los argumentos, quita sus opciones del addopts de pytest.ini, agrega
+--no-cov si no se pidió cobertura, y activa --fast.
+
+Uso:
+    python -m src.utils.fast_start -m smoke
+    python -m src.utils.fast_start -m smoke --alluredir=reports/allure-results
+"""
+
+import configparser
+import os
+import shlex
+import sys
+
+import pytest
+
+PYTEST_INI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "pytest.ini")
+
+# Plugin -> prefijos de opciones que lo necesitan (si aparece alguna, el plugin se conserva)
+REPORT_PLUGINS = {
+    "html": ("--html", "--self-contained-html", "--css"),
+    "html_fixtures": ("--html",),
+    "metadata": ("--html", "--metadata", "--json-report"),
+    "allure_pytest": ("--alluredir", "--allure-"),
+}
+
+# La cobertura se desactiva con --no-cov: pytest-cov ignora entonces las --cov* de addopts
+COVERAGE_OPTIONS = ("--cov", "--no-cov")
+
+
+def ini_addopts(path=PYTEST_INI):
+    """
+    Lee el addopts de pytest.ini
+
+    Args:
+        path (str): Ruta de pytest.ini
+    Returns:
+        list: Argumentos de addopts (vacía si no hay pytest.ini)
+    """
+    parser = configparser.ConfigParser()
+    parser.read(path, encoding="utf-8")
+    return shlex.split(parser.get("pytest", "addopts", fallback=""))
+
+
+def fast_args(argv, addopts=None):
+    """
+    Argumentos de pytest con --fast y sin los plugins de reportes no pedidos
+
+    Args:
+        argv (list): Argumentos originales de pytest
+        addopts (list): addopts de pytest.ini (por defecto se lee el archivo)
+    Returns:
+        list: Argumentos para pytest.main
+    """
+    args = list(argv)
+    addopts = ini_addopts() if addopts is None else list(addopts)
+    disabled, removed = [], ()
+    for plugin, options in REPORT_PLUGINS.items():
+        if not any(arg.startswith(options) for arg in args) and f"no:{plugin}" not in args:
+            disabled += ["-p", f"no:{plugin}"]
+            removed += options
+    if removed:
+        # Sin el plugin, sus opciones en addopts serían argumentos no reconocidos
+        kept = [arg for arg in addopts if not arg.startswith(removed)]
+        disabled += ["-o", "addopts=" + shlex.join(kept)]
+    if not any(arg.startswith(COVERAGE_OPTIONS) for arg in args):
+        disabled.append("--no-cov")
+    if "--fast" not in args:
+        args.insert(0, "--fast")
+    return disabled + args
+
+
+def main(argv=None):
+    """Punto de entrada de línea de comandos"""
+    return pytest.main(fast_args(sys.argv[1:] if argv is None else argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
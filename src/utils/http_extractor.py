@@ -0,0 +1,307 @@
+"""
+HTTP Extractor - Extracción de resultados sin navegador con una sesión HTTP reutilizable
+
+Para la recolección de datos de solo lectura (cantidad de resultados, nombre y precio de
+los primeros productos) descarga la página de resultados con una sesión de requests con
+pool de conexiones keep-alive y la procesa con html.parser, usando las mismas reglas de
+extracción que ProductResultsPage (format_price, parse_result_count).
+
+Limita la concurrencia y espacia los pedidos al mismo sitio (politeness delay); con un
+RateLimit creado sobre un contexto de multiprocessing el límite es común a todos los
+procesos worker (ver BatchRunner). Si la
+respuesta necesita JavaScript (captcha, página sin resultados renderizados) se lanza
+JavascriptRequired y search_with_fallback usa el flujo con navegador.
+"""
+
+import ctypes
+import logging
+import threading
+import time
+from html.parser import HTMLParser
+from urllib.parse import urlencode, urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config.config import Config
+from src.pages.product_results_page import ProductResultsPage, format_price, parse_result_count
+
+logger = logging.getLogger(__name__)
+
+# Opciones de ProductResultsPage.sort_by -> parámetro "s" de la URL de resultados
+SORT_PARAMS = {
+    "price_high_low": "price-desc-rank",
+    "avg_review": "review-rank",
+    "newest": "date-desc-rank",
+}
+
+# Marcas de páginas que solo se resuelven con un navegador real
+JAVASCRIPT_MARKERS = ("validateCaptcha", "Type the characters you see", "api-services-support@amazon.com")
+
+VOID_ELEMENTS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+DEFAULT_HEADERS = {
+    "User-Agent": ("Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) "
+                   "Chrome/120.0 Safari/537.36"),
+    "Accept": "text/html,application/xhtml+xml",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+class JavascriptRequired(Exception):
+    """La respuesta no trae los resultados en el HTML: se necesita el navegador"""
+
+
+class ResultsParser(HTMLParser):
+    """Parser de la página de resultados con los mismos selectores que ProductResultsPage"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.cards = []
+        self.count_text = None
+        self.next_url = None
+        self.card = None
+        self.stack = []  # (tag, etiqueta de captura, textos)
+
+    def _inside(self, label):
+        return any(entry[1] == label for entry in self.stack)
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = (attrs.get("class") or "").split()
+        label = None
+        if tag == "div" and attrs.get("data-component-type") == "s-search-result":
+            self.card = {"asin": attrs.get("data-asin") or "", "name": None, "whole": None,
+                         "fraction": None, "see_options": False}
+            label = "card"
+        elif self.card is not None:
+            if tag == "h2":
+                label = "h2"
+            elif tag == "span" and self.card["name"] is None and self._inside("h2") and not self._inside("name"):
+                label = "name"
+            elif tag == "span" and attrs.get("class") == "a-price-whole":
+                label = "whole"
+            elif tag == "span" and attrs.get("class") == "a-price-fraction":
+                label = "fraction"
+            elif tag == "a":
+                label = "link"
+        elif tag == "span":
+            label = "info"
+        if tag == "a" and "s-pagination-next" in classes and attrs.get("href"):
+            self.next_url = attrs["href"]
+        if tag not in VOID_ELEMENTS:
+            self.stack.append((tag, label, []))
+
+    def handle_endtag(self, tag):
+        if not any(entry[0] == tag for entry in self.stack):
+            return  # Cierre sin apertura (HTML mal formado)
+        while self.stack:
+            open_tag, label, texts = self.stack.pop()
+            self._close(label, "".join(texts).strip())
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        for entry in self.stack:
+            if entry[1]:
+                entry[2].append(data)
+
+    def _close(self, label, text):
+        if label == "card":
+            self.cards.append(self.card)
+            self.card = None
+        elif label == "name" and self.card["name"] is None:
+            self.card["name"] = text
+        elif label in ("whole", "fraction") and self.card[label] is None:
+            self.card[label] = text
+        elif label == "link" and "See options" in text:
+            self.card["see_options"] = True
+        elif label == "info" and self.count_text is None and "results for" in text:
+            self.count_text = text
+
+    def close(self):
+        super().close()
+        while self.stack:
+            self.handle_endtag(self.stack[-1][0])
+
+
+def parse_results_page(html, url=""):
+    """
+    Extrae cantidad de resultados, productos y página siguiente del HTML
+
+    Args:
+        html (str): HTML de la página de resultados
+        url (str): URL de la página (para resolver el link de la página siguiente)
+    Returns:
+        dict: product_count, products (name, price, asin) y next_url
+    Raises:
+        JavascriptRequired: Si el HTML no trae resultados procesables
+    """
+    if any(marker in html for marker in JAVASCRIPT_MARKERS):
+        raise JavascriptRequired(f"La página pide verificación (captcha): {url}")
+    parser = ResultsParser()
+    parser.feed(html)
+    parser.close()
+    if not parser.cards and parser.count_text is None:
+        raise JavascriptRequired(f"La página no trae resultados en el HTML: {url}")
+    return {
+        "product_count": parse_result_count(parser.count_text),
+        "products": [{
+            "name": card["name"],
+            "price": format_price(card["whole"], card["fraction"], card["see_options"]),
+            "asin": card["asin"],
+        } for card in parser.cards if card["name"]],
+        "next_url": urljoin(url, parser.next_url) if parser.next_url else None,
+    }
+
+
+class RateLimit:
+    """Clase con el límite de pedidos simultáneos y el politeness delay hacia el sitio"""
+
+    def __init__(self, max_concurrency=None, delay=None, context=None):
+        """
+        Args:
+            max_concurrency (int): Pedidos simultáneos máximos; por defecto Config.HTTP_CONCURRENCY
+            delay (float): Segundos mínimos entre el inicio de dos pedidos; por defecto Config.HTTP_DELAY
+            context: Contexto de multiprocessing; si se indica, el semáforo, el lock y el instante
+                del próximo pedido se comparten con los procesos que reciben este objeto
+        """
+        self.max_concurrency = max_concurrency or Config.HTTP_CONCURRENCY
+        self.delay = Config.HTTP_DELAY if delay is None else delay
+        if context is None:
+            self.slots = threading.BoundedSemaphore(self.max_concurrency)
+            self.lock = threading.Lock()
+            self.next_request_at = ctypes.c_double(0.0)
+        else:
+            self.slots = context.BoundedSemaphore(self.max_concurrency)
+            self.lock = context.Lock()
+            self.next_request_at = context.RawValue(ctypes.c_double, 0.0)
+
+    def wait_turn(self):
+        """Espacia el inicio de los pedidos según el politeness delay"""
+        with self.lock:
+            # Reloj de pared: es el mismo en todos los procesos
+            now = time.time()
+            start = max(now, self.next_request_at.value)
+            self.next_request_at.value = start + self.delay
+        if start > now:
+            time.sleep(start - now)
+
+
+class HttpSearchClient:
+    """Clase que descarga y procesa páginas de resultados con una sesión HTTP compartida"""
+
+    def __init__(self, base_url=None, max_concurrency=None, delay=None, timeout=15.0, currency=None,
+                 rate_limit=None):
+        """
+        Args:
+            base_url (str): URL base del sitio; por defecto Config.BASE_URL
+            max_concurrency (int): Pedidos simultáneos máximos (tamaño del pool de conexiones)
+            delay (float): Segundos mínimos entre el inicio de dos pedidos al sitio
+            timeout (float): Timeout de cada pedido en segundos
+            currency (str): Moneda preferida (cookie de preferencias del sitio)
+            rate_limit (RateLimit): Límite compartido con otros clientes (reemplaza
+                max_concurrency y delay); por defecto uno propio del cliente
+        """
+        self.base_url = (base_url or Config.BASE_URL).rstrip("/")
+        self.rate_limit = rate_limit or RateLimit(max_concurrency, delay)
+        self.max_concurrency = self.rate_limit.max_concurrency
+        self.delay = self.rate_limit.delay
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency,
+                              max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=(500, 502, 504)))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(DEFAULT_HEADERS)
+        self.session.cookies.set(ProductResultsPage.CURRENCY_COOKIE, currency or Config.CURRENCY)
+        self.stats = {"requests": 0, "bytes": 0, "fallbacks": 0}
+
+    def search_url(self, keywords, brand=None, price_range=None, sort=None, page=1):
+        """URL de resultados con los mismos filtros que aplica ProductResultsPage"""
+        params = {"k": keywords}
+        if brand:
+            params["rh"] = f"p_89:{brand}"
+        if price_range:
+            params["low-price"], params["high-price"] = price_range.split("-")
+        if sort:
+            params["s"] = SORT_PARAMS.get(sort, sort)
+        if page > 1:
+            params["page"] = page
+        return f"{self.base_url}/s?{urlencode(params)}"
+
+    def fetch(self, url):
+        """
+        Descarga una página de resultados y la procesa
+
+        Returns:
+            dict: Ver parse_results_page
+        Raises:
+            JavascriptRequired: Si la respuesta necesita el navegador
+        """
+        with self.rate_limit.slots:
+            self.rate_limit.wait_turn()
+            response = self.session.get(url, timeout=self.timeout)
+        self.stats["requests"] += 1
+        self.stats["bytes"] += len(response.content)
+        if response.status_code in (403, 503):
+            raise JavascriptRequired(f"Respuesta {response.status_code} (bloqueo o captcha): {url}")
+        response.raise_for_status()
+        return parse_results_page(response.text, response.url)
+
+    def search(self, keywords, brand=None, price_range=None, sort=None, page=1, top=5):
+        """
+        Cantidad de resultados y primeros productos de una búsqueda
+
+        Returns:
+            dict: product_count, products (los primeros top), next_url y source
+        """
+        result = self.fetch(self.search_url(keywords, brand, price_range, sort, page))
+        result["products"] = result["products"][:top] if top else result["products"]
+        result["source"] = "http"
+        return result
+
+    def close(self):
+        self.session.close()
+
+
+def run_search_http(client, job, top=5):
+    """
+    Equivalente HTTP de batch_runner.run_search (mismo formato de resultado)
+
+    Args:
+        client (HttpSearchClient): Cliente HTTP
+        job (dict): Trabajo de búsqueda (keywords, brand, price_range, sorts)
+    Returns:
+        dict: Cantidad de resultados y primeros productos por ordenamiento
+    Raises:
+        JavascriptRequired: Si alguna página necesita el navegador
+    """
+    filters = {"brand": job.get("brand"), "price_range": job.get("price_range")}
+    first = client.search(job["keywords"], top=top, **filters)
+    result = {"brand_applied": None, "product_count": first["product_count"], "sorts": {}, "source": "http"}
+    for sort_option in job.get("sorts") or []:
+        result["sorts"][sort_option] = client.search(job["keywords"], sort=sort_option, top=top, **filters)["products"]
+    if not job.get("sorts"):
+        result["products"] = first["products"]
+    return result
+
+
+def search_with_fallback(client, job, browser_search):
+    """
+    Ejecuta la búsqueda por HTTP y, si la página necesita JavaScript, con el navegador
+
+    Args:
+        client (HttpSearchClient): Cliente HTTP
+        job (dict): Trabajo de búsqueda
+        browser_search (callable): Recibe el trabajo y lo ejecuta con el navegador
+    Returns:
+        dict: Resultado con "source" = http o browser
+    """
+    try:
+        return run_search_http(client, job)
+    except (JavascriptRequired, requests.RequestException) as e:
+        client.stats["fallbacks"] += 1
+        logger.info("Extracción HTTP no disponible para '%s' (%s): se usa el navegador", job["keywords"], e)
+        return dict(browser_search(job), source="browser")
@@ -0,0 +1,132 @@
+"""
+Logging Setup - Pipeline de logging no bloqueante
+
+El thread del test solo crea el LogRecord y lo encola (QueueHandler). Un
+QueueListener en segundo plano formatea los mensajes y realiza toda la E/S:
+log de texto y JSON-lines con rotación por tamaño, y consola.
+"""
+
+import json
+import logging
+import logging.handlers
+import os
+import queue
+from datetime import datetime
+
+TEXT_FORMAT = '%(asctime)s - %(worker_id)s - %(name)s - %(levelname)s - %(message)s'
+
+_context = {"test_id": "", "worker_id": os.getenv("PYTEST_XDIST_WORKER", "main")}
+_listener = None
+
+
+def set_current_test(test_id):
+    """Define el test en ejecución que se agrega a cada registro de log"""
+    _context["test_id"] = test_id or ""
+
+
+class ContextFilter(logging.Filter):
+    """Agrega test_id y worker_id al registro en el thread que lo emite"""
+
+    def filter(self, record):
+        record.test_id = _context["test_id"]
+        record.worker_id = _context["worker_id"]
+        return True
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler que no formatea en el thread emisor
+
+    El QueueHandler estándar llama a format() en prepare() para poder serializar el
+    registro; como la cola es en memoria del mismo proceso, el registro se encola tal
+    cual y el formateo (incluido msg % args) ocurre en el listener.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formatea cada registro como un objeto JSON por línea"""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "test": getattr(record, "test_id", ""),
+            "worker": getattr(record, "worker_id", ""),
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def setup_logging(log_dir, worker_id=None, level=logging.INFO, max_bytes=10 * 1024 * 1024,
+                  backup_count=5, console=True):
+    """
+    Configura el logging raíz con cola + listener en segundo plano
+
+    Args:
+        log_dir (str): Directorio de los archivos de log
+        worker_id (str): Worker de xdist; cada worker escribe sus propios archivos
+        level (int): Nivel mínimo de log
+        max_bytes (int): Tamaño máximo por archivo antes de rotar
+        backup_count (int): Archivos rotados a conservar
+        console (bool): Emitir también por consola
+    Returns:
+        QueueListener: Listener iniciado
+    """
+    global _listener
+    shutdown_logging()
+
+    worker_id = worker_id or _context["worker_id"]
+    _context["worker_id"] = worker_id
+    suffix = "" if worker_id == "main" else f"_{worker_id}"
+    os.makedirs(log_dir, exist_ok=True)
+
+    text_handler = logging.handlers.RotatingFileHandler(
+        os.path.join(log_dir, f"test{suffix}.log"), maxBytes=max_bytes,
+        backupCount=backup_count, encoding="utf-8"
+    )
+    text_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    json_handler = logging.handlers.RotatingFileHandler(
+        os.path.join(log_dir, f"test{suffix}.jsonl"), maxBytes=max_bytes,
+        backupCount=backup_count, encoding="utf-8"
+    )
+    json_handler.setFormatter(JsonLinesFormatter())
+
+    handlers = [text_handler, json_handler]
+    if console:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+        handlers.append(stream_handler)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging():
+    """Vacía la cola y detiene el listener (cierra los archivos)"""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
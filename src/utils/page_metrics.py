@@ -0,0 +1,122 @@
+"""
+Page Metrics - Captura de Navigation Timing, Resource Timing y Paint del navegador
+
+Después de cada acción de un Page Object que ejecutó un comando capaz de cambiar de
+documento (get, click, send_keys, cambio de ventana; ver tracer.instrument_driver) se
+consulta performance.timeOrigin; si cambió, se registran las métricas del nuevo documento.
+Un click que navega puede terminar la acción antes de que cambie el documento: la
+navegación queda pendiente y se vuelve a consultar en las acciones siguientes hasta ver
+un timeOrigin nuevo o hasta que pasen NAVIGATION_GRACE_S segundos desde el comando.
+Fuera de ese margen, las acciones de solo lectura no agregan ningún round trip.
+"""
+
+import json
+import logging
+import os
+import time
+from datetime import datetime
+
+import allure
+
+from src.utils.tracer import tracer
+
+logger = logging.getLogger(__name__)
+
+# Segundos desde un comando que puede navegar durante los que se sigue esperando un documento nuevo
+NAVIGATION_GRACE_S = 10.0
+
+# Script ejecutado en el navegador (Navigation Timing Level 2 + Resource/Paint Timing)
+PERFORMANCE_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+const paint = {};
+performance.getEntriesByType('paint').forEach(p => { paint[p.name] = p.startTime; });
+let transferred = nav ? (nav.transferSize || 0) : 0;
+resources.forEach(r => { transferred += (r.transferSize || 0); });
+return {
+    time_origin: performance.timeOrigin,
+    url: location.href,
+    ttfb_ms: nav ? nav.responseStart - nav.startTime : null,
+    dom_content_loaded_ms: nav ? nav.domContentLoadedEventEnd - nav.startTime : null,
+    load_ms: nav && nav.loadEventEnd > 0 ? nav.loadEventEnd - nav.startTime : null,
+    first_paint_ms: paint['first-paint'] !== undefined ? paint['first-paint'] : null,
+    first_contentful_paint_ms: paint['first-contentful-paint'] !== undefined ? paint['first-contentful-paint'] : null,
+    transferred_bytes: transferred,
+    request_count: resources.length + (nav ? 1 : 0)
+};
+"""
+
+
+class PageMetricsCollector:
+    """Clase para recolectar métricas de rendimiento del sitio después de cada navegación"""
+
+    def __init__(self, output_path=None, enabled=True):
+        """
+        Inicializa el recolector
+
+        Args:
+            output_path (str): Archivo JSON-lines donde se guardan las métricas
+            enabled (bool): Si la captura está activa
+        """
+        self.enabled = enabled
+        self.output_path = output_path
+
+    def collect_if_navigated(self, driver):
+        """
+        Recolecta métricas si el documento actual es distinto al último medido
+
+        Args:
+            driver: WebDriver instance
+        Returns:
+            dict: Métricas del nuevo documento o None si no hubo navegación
+        """
+        if not self.enabled:
+            return None
+        # Sin instrumentar no se sabe qué comandos se ejecutaron: se consulta siempre
+        pending = driver.__dict__.get("_navigation_pending", True)
+        if pending is False:
+            return None
+        try:
+            metrics = driver.execute_script(PERFORMANCE_SCRIPT)
+        except Exception as e:
+            logger.debug("No se pudieron obtener métricas de rendimiento: %s", e)
+            metrics = None
+        if not metrics or metrics.get("time_origin") == getattr(driver, "_last_time_origin", None):
+            # La navegación pudo no haber empezado todavía: sigue pendiente dentro del margen
+            if pending is not True and time.monotonic() - pending > NAVIGATION_GRACE_S:
+                driver._navigation_pending = False
+            return None
+        driver._navigation_pending = False
+        driver._last_time_origin = metrics["time_origin"]
+
+        metrics["test"] = (os.getenv("PYTEST_CURRENT_TEST") or "").rsplit(" ", 1)[0]
+        metrics["timestamp"] = datetime.now().isoformat(timespec="seconds")
+        self._publish(metrics)
+        return metrics
+
+    def _publish(self, metrics):
+        """Adjunta las métricas al step de allure actual y las agrega al archivo de resultados"""
+        logger.info(
+            "Navegación %s: TTFB=%sms DCL=%sms load=%sms %s requests / %s bytes",
+            metrics["url"], metrics["ttfb_ms"], metrics["dom_content_loaded_ms"], metrics["load_ms"],
+            metrics["request_count"], metrics["transferred_bytes"]
+        )
+        tracer.instant("page metrics", "navigation", metrics)
+        try:
+            allure.attach(
+                json.dumps(metrics, indent=2),
+                name=f"Page timing: {metrics['url'][:80]}",
+                attachment_type=allure.attachment_type.JSON
+            )
+        except Exception:
+            pass  # Sin reporte de allure activo no hay donde adjuntar
+        if self.output_path:
+            try:
+                os.makedirs(os.path.dirname(self.output_path) or ".", exist_ok=True)
+                with open(self.output_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(metrics) + "\n")
+            except Exception as e:
+                logger.warning("No se pudieron guardar las métricas de página: %s", e)
+
+
+page_metrics = PageMetricsCollector(enabled=False)
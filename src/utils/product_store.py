@@ -0,0 +1,374 @@
+"""
+Product Store - Registros de productos tipados y snapshots columnares por ejecución
+
+Los productos extraídos (precio como texto: "129.99", "Varía según opciones",
+"Precio no disponible") se normalizan a ProductRecord (precio Decimal, moneda,
+disponibilidad, ASIN) y se guardan en un snapshot columnar por ejecución (.npz de
+NumPy, una columna por campo). El diff entre dos snapshots es vectorizado: cambios de
+precio, productos nuevos o eliminados y cambios de posición por ordenamiento.
+
+Uso:
+    python -m src.utils.product_store list
+    python -m src.utils.product_store diff 20240101_120000 20240102_120000 --top 20
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+import numpy as np
+
+from config.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Texto de precio de una tarjeta sin precio único (ver format_price en ProductResultsPage)
+PRICE_VARIES = "Varía según opciones"
+PRICE_UNAVAILABLE = "Precio no disponible"
+
+COLUMNS = ("query", "sort", "rank", "asin", "name", "price_cents", "currency", "available")
+
+
+def parse_price(text):
+    """
+    Convierte el precio extraído a Decimal
+
+    Args:
+        text (str): Precio como texto (ej: "1,299.99")
+    Returns:
+        Decimal: Precio o None si la tarjeta no tiene un precio único
+    """
+    if text is None or text in (PRICE_VARIES, PRICE_UNAVAILABLE):
+        return None
+    try:
+        return Decimal(str(text).replace(",", "").replace("$", "").strip())
+    except InvalidOperation:
+        logger.debug("Precio no reconocido: %s", text)
+        return None
+
+
+class ProductRecord:
+    """Producto normalizado: precio decimal, moneda, disponibilidad y ASIN"""
+
+    __slots__ = ("asin", "name", "price", "currency", "available", "query", "sort", "rank")
+
+    def __init__(self, asin, name, price, currency, available, query="", sort="", rank=0):
+        self.asin = asin
+        self.name = name
+        self.price = price
+        self.currency = currency
+        self.available = available
+        self.query = query
+        self.sort = sort
+        self.rank = rank
+
+    @classmethod
+    def from_extracted(cls, product, query="", sort="", rank=0, currency=None):
+        """
+        Normaliza un producto tal como lo devuelven los Page Objects
+
+        Args:
+            product (dict): name, price (texto) y asin
+            query (str): Búsqueda que lo devolvió
+            sort (str): Ordenamiento aplicado
+            rank (int): Posición dentro de los resultados (1 = primero)
+            currency (str): Moneda; por defecto Config.CURRENCY
+        Returns:
+            ProductRecord: Registro tipado
+        """
+        return cls(
+            asin=product.get("asin") or "",
+            name=product.get("name") or "",
+            price=parse_price(product.get("price")),
+            currency=currency or Config.CURRENCY,
+            available=product.get("price") != PRICE_UNAVAILABLE,
+            query=query,
+            sort=sort,
+            rank=product.get("position") or rank,
+        )
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f"ProductRecord({self.asin}, {self.price} {self.currency}, rank={self.rank}, sort={self.sort})"
+
+
+class ProductSnapshot:
+    """
+    Clase que acumula registros y los guarda como columnas de NumPy
+
+    Cada (query, sort, asin) aparece una sola vez: si un test se reintenta o se reanuda
+    y vuelve a registrar los mismos productos, la fila existente se reemplaza.
+    """
+
+    def __init__(self, columns=None):
+        self.columns = columns or {name: [] for name in COLUMNS}
+        self._rows = {key: row for row, key in enumerate(zip(
+            self.columns["query"], self.columns["sort"], self.columns["asin"]))}
+
+    def __len__(self):
+        return len(self.columns["asin"])
+
+    def add(self, products, query="", sort="", currency=None):
+        """
+        Agrega productos extraídos (dicts de los Page Objects) o ProductRecord
+
+        Args:
+            products (list): Productos en orden de aparición
+            query (str): Búsqueda
+            sort (str): Ordenamiento aplicado
+            currency (str): Moneda de los precios
+        """
+        for rank, product in enumerate(products, start=1):
+            record = product if isinstance(product, ProductRecord) else \
+                ProductRecord.from_extracted(product, query, sort, rank, currency)
+            values = {
+                "query": record.query,
+                "sort": record.sort,
+                "rank": record.rank,
+                "asin": record.asin,
+                "name": record.name,
+                # Centavos exactos (-1 = sin precio único) para no perder precisión con float
+                "price_cents": -1 if record.price is None else int(record.price * 100),
+                "currency": record.currency,
+                "available": record.available,
+            }
+            key = (record.query, record.sort, record.asin)
+            row = self._rows.get(key)
+            if row is None:
+                self._rows[key] = len(self)
+                for name, value in values.items():
+                    self.columns[name].append(value)
+            else:
+                for name, value in values.items():
+                    self.columns[name][row] = value
+
+    def to_arrays(self):
+        """Columnas como arrays de NumPy tipados"""
+        return {
+            "query": np.array(self.columns["query"], dtype=str),
+            "sort": np.array(self.columns["sort"], dtype=str),
+            "rank": np.array(self.columns["rank"], dtype=np.int32),
+            "asin": np.array(self.columns["asin"], dtype=str),
+            "name": np.array(self.columns["name"], dtype=str),
+            "price_cents": np.array(self.columns["price_cents"], dtype=np.int64),
+            "currency": np.array(self.columns["currency"], dtype=str),
+            "available": np.array(self.columns["available"], dtype=bool),
+        }
+
+
+class ProductStore:
+    """Clase que guarda y lee snapshots columnares (un .npz por ejecución)"""
+
+    def __init__(self, directory=None):
+        """
+        Args:
+            directory (str): Directorio de snapshots; por defecto Config.PRODUCT_STORE_DIR
+        """
+        self.directory = directory or Config.PRODUCT_STORE_DIR
+
+    def _path(self, run_id):
+        return run_id if run_id.endswith(".npz") else os.path.join(self.directory, f"{run_id}.npz")
+
+    def runs(self):
+        """Ejecuciones guardadas, de la más antigua a la más nueva"""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name[:-4] for name in os.listdir(self.directory) if name.endswith(".npz"))
+
+    def _acquire(self, run_id, timeout=60):
+        """
+        Toma el lock del snapshot (archivo creado con O_EXCL, seguro entre procesos)
+
+        Returns:
+            str: Ruta del lock, a liberar con os.remove
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        lock_path = self._path(run_id) + ".lock"
+        deadline = time.time() + timeout
+        while True:
+            try:
+                os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return lock_path
+            except FileExistsError:
+                try:
+                    if time.time() > deadline or time.time() - os.path.getmtime(lock_path) > timeout:
+                        logger.warning("Lock de snapshot de productos vencido, se elimina: %s", lock_path)
+                        os.remove(lock_path)
+                except FileNotFoundError:
+                    continue  # El otro proceso liberó el lock
+                time.sleep(0.05)
+
+    def save(self, snapshot, run_id=None):
+        """
+        Guarda un snapshot; si la ejecución ya tiene uno, agrega las filas nuevas
+        (las de un mismo query, sort y asin reemplazan a las guardadas). Los workers de
+        xdist guardan en la misma ejecución: la lectura y el reemplazo van bajo lock
+
+        Args:
+            snapshot (ProductSnapshot): Registros a guardar
+            run_id (str): Identificador de la ejecución; por defecto fecha y hora actual
+        Returns:
+            str: run_id guardado
+        """
+        run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        if not len(snapshot):
+            return run_id
+        arrays = snapshot.to_arrays()
+        path = self._path(run_id)
+        lock_path = self._acquire(run_id)
+        try:
+            if os.path.exists(path):
+                previous = self.load(run_id)
+                previous_codes, new_codes = _encode_keys(previous, arrays)
+                keep = ~np.isin(previous_codes, new_codes)
+                arrays = {name: np.concatenate([previous[name][keep], arrays[name]]) for name in COLUMNS}
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".npz.tmp")
+            with os.fdopen(fd, "wb") as f:
+                np.savez_compressed(f, created_at=np.float64(time.time()), **arrays)
+            os.replace(tmp_path, path)
+        finally:
+            os.remove(lock_path)
+        logger.info("Snapshot de productos guardado: %s (%s filas)", path, len(arrays["asin"]))
+        return run_id
+
+    def load(self, run_id):
+        """
+        Lee un snapshot
+
+        Returns:
+            dict: Columna -> array de NumPy
+        """
+        with np.load(self._path(run_id), allow_pickle=False) as data:
+            return {name: data[name] for name in COLUMNS}
+
+
+def _encode_keys(old, new):
+    """
+    Codifica la clave (query, sort, asin) de ambos snapshots a un entero por fila
+
+    Cada columna se factoriza por separado y los códigos se combinan en un int64, lo que
+    evita construir y ordenar strings compuestos.
+
+    Returns:
+        tuple: (códigos del snapshot anterior, códigos del snapshot nuevo)
+    """
+    combined = np.zeros(len(old["asin"]) + len(new["asin"]), dtype=np.int64)
+    for name in ("query", "sort", "asin"):
+        uniques, codes = np.unique(np.concatenate([old[name], new[name]]), return_inverse=True)
+        combined = combined * len(uniques) + codes.ravel()
+    return combined[:len(old["asin"])], combined[len(old["asin"]):]
+
+
+def diff_snapshots(old, new):
+    """
+    Compara dos snapshots de forma vectorizada, por (búsqueda, ordenamiento, ASIN)
+
+    Args:
+        old (dict): Columnas del snapshot anterior
+        new (dict): Columnas del snapshot nuevo
+    Returns:
+        dict: price_changes, added, removed y rank_shifts (columnas como arrays) y summary
+    """
+    old_codes, new_codes = _encode_keys(old, new)
+    _, old_idx, new_idx = np.intersect1d(old_codes, new_codes, return_indices=True)
+    added_idx = np.flatnonzero(~np.isin(new_codes, old_codes))
+    removed_idx = np.flatnonzero(~np.isin(old_codes, new_codes))
+
+    old_price, new_price = old["price_cents"][old_idx], new["price_cents"][new_idx]
+    changed = old_price != new_price
+    old_rank, new_rank = old["rank"][old_idx], new["rank"][new_idx]
+    moved = old_rank != new_rank
+
+    def rows(columns, index, **extra):
+        selected = {name: columns[name][index] for name in ("query", "sort", "asin", "name")}
+        selected.update(extra)
+        return selected
+
+    result = {
+        "price_changes": rows(new, new_idx[changed], old_price_cents=old_price[changed],
+                              new_price_cents=new_price[changed],
+                              delta_cents=np.where((old_price[changed] >= 0) & (new_price[changed] >= 0),
+                                                   new_price[changed] - old_price[changed], 0)),
+        "added": rows(new, added_idx, rank=new["rank"][added_idx], price_cents=new["price_cents"][added_idx]),
+        "removed": rows(old, removed_idx, rank=old["rank"][removed_idx], price_cents=old["price_cents"][removed_idx]),
+        # shift > 0: el producto subió posiciones
+        "rank_shifts": rows(new, new_idx[moved], old_rank=old_rank[moved], new_rank=new_rank[moved],
+                            shift=old_rank[moved] - new_rank[moved]),
+    }
+    result["summary"] = {
+        "old_rows": int(len(old["asin"])),
+        "new_rows": int(len(new["asin"])),
+        "common": int(len(old_idx)),
+        **{name: int(len(result[name]["asin"])) for name in ("price_changes", "added", "removed", "rank_shifts")},
+    }
+    return result
+
+
+def diff_to_json(diff, top=None):
+    """
+    Convierte el resultado de diff_snapshots a listas de filas serializables
+
+    Args:
+        diff (dict): Resultado de diff_snapshots
+        top (int): Máximo de filas por sección (las de mayor cambio primero)
+    """
+    output = {"summary": diff["summary"]}
+    order_by = {"price_changes": "delta_cents", "rank_shifts": "shift"}
+    for section in ("price_changes", "added", "removed", "rank_shifts"):
+        columns = diff[section]
+        index = np.arange(len(columns["asin"]))
+        if section in order_by:
+            index = np.argsort(-np.abs(columns[order_by[section]]), kind="stable")
+        index = index[:top] if top else index
+        output[section] = [{name: values[i].item() for name, values in columns.items()} for i in index]
+    return output
+
+
+def main(argv=None):
+    """Punto de entrada de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Snapshots de productos y comparación entre ejecuciones")
+    parser.add_argument("--store", default=Config.PRODUCT_STORE_DIR, help="Directorio de snapshots")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("list", help="Listar ejecuciones guardadas")
+    diff = subparsers.add_parser("diff", help="Comparar dos ejecuciones (por defecto las dos últimas)")
+    diff.add_argument("old", nargs="?", help="run_id o archivo .npz anterior")
+    diff.add_argument("new", nargs="?", help="run_id o archivo .npz nuevo")
+    diff.add_argument("--top", type=int, default=20, help="Filas por sección en la salida")
+    diff.add_argument("--output", default=None, help="Guardar el diff completo en JSON")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    store = ProductStore(args.store)
+    if args.command == "list":
+        for run_id in store.runs():
+            print(run_id)
+        return 0
+
+    old, new = args.old, args.new
+    if not (old and new):
+        runs = store.runs()
+        if len(runs) < 2:
+            print("Se necesitan al menos dos snapshots para comparar")
+            return 1
+        old, new = runs[-2], runs[-1]
+    start = time.perf_counter()
+    diff = diff_snapshots(store.load(old), store.load(new))
+    elapsed = time.perf_counter() - start
+    print(f"Diff {old} -> {new} en {elapsed:.2f}s: {diff['summary']}")
+    print(json.dumps(diff_to_json(diff, args.top), indent=2, ensure_ascii=False))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(diff_to_json(diff), f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
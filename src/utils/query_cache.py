@@ -0,0 +1,255 @@
+"""
+Query Cache - Caché compartido de resultados de búsqueda (SQLite en modo WAL)
+
+Guarda la cantidad de resultados y los productos extraídos por estado canónico de la
+búsqueda (sitio, moneda, palabras clave, marca, rango de precio, ordenamiento y página),
+con vencimiento (TTL) y expulsión de las entradas menos usadas (LRU). El archivo SQLite en
+modo WAL se comparte entre workers de pytest-xdist y procesos del batch runner: las
+lecturas no bloquean y las escrituras concurrentes esperan su turno (busy timeout).
+
+Uso:
+    python -m src.utils.query_cache stats
+    python -m src.utils.query_cache clear
+"""
+
+import argparse
+import glob
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+from config.config import Config
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed);
+"""
+
+
+def _normalize(value):
+    return " ".join(str(value).split()).lower() if value not in (None, "") else None
+
+
+def canonical_key(keywords, brand=None, price_range=None, sort=None, page=1, base_url=None, currency=None):
+    """
+    Clave canónica del estado de una búsqueda (sin importar mayúsculas ni espacios)
+
+    Returns:
+        str: JSON con los campos normalizados en orden fijo
+    """
+    return json.dumps({
+        "site": (base_url or Config.BASE_URL).rstrip("/").lower(),
+        "currency": (currency or Config.CURRENCY).upper(),
+        "keywords": _normalize(keywords),
+        "brand": _normalize(brand),
+        "price_range": _normalize(price_range),
+        "sort": _normalize(sort) or "relevance",
+        "page": int(page or 1),
+    }, sort_keys=True, separators=(",", ":"))
+
+
+class QueryCache:
+    """Clase que guarda resultados de búsqueda en un SQLite compartido entre procesos"""
+
+    def __init__(self, path=None, ttl=None, max_entries=None):
+        """
+        Args:
+            path (str): Archivo SQLite; por defecto Config.QUERY_CACHE_FILE
+            ttl (float): Segundos de vigencia de cada entrada
+            max_entries (int): Entradas máximas (se expulsan las menos usadas)
+        """
+        self.path = path or Config.QUERY_CACHE_FILE
+        self.ttl = Config.QUERY_CACHE_TTL_MINUTES * 60 if ttl is None else ttl
+        self.max_entries = max_entries or Config.QUERY_CACHE_MAX_ENTRIES
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "bypassed": 0, "stored": 0, "evicted": 0}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+
+    def get(self, key):
+        """
+        Returns:
+            dict: Resultado guardado, o None si no existe o venció
+        """
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT value, created FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            if now - row[1] > self.ttl:
+                self._db.execute("DELETE FROM results WHERE key = ? AND created = ?", (key, row[1]))
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return None
+            self._db.execute("UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+            self.stats["hits"] += 1
+        return json.loads(row[0])
+
+    def put(self, key, value):
+        """Guarda un resultado y expulsa las entradas menos usadas si se supera el máximo"""
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute("INSERT OR REPLACE INTO results (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                                 (key, json.dumps(value, ensure_ascii=False), now, now))
+                evicted = self._db.execute(
+                    "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY accessed DESC "
+                    "LIMIT -1 OFFSET ?)", (self.max_entries,)).rowcount
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+            self.stats["stored"] += 1
+            self.stats["evicted"] += max(evicted, 0)
+
+    def get_or_compute(self, key, compute, bypass=False):
+        """
+        Resultado del caché o, si no está (o se pide bypass), el calculado con compute
+
+        Args:
+            key (str): Clave canónica (ver canonical_key)
+            compute (callable): Ejecuta la búsqueda real y retorna el resultado
+            bypass (bool): No leer el caché (el resultado nuevo sí se guarda)
+        Returns:
+            tuple: (resultado, True si vino del caché)
+        """
+        if bypass:
+            self.stats["bypassed"] += 1
+        else:
+            cached = self.get(key)
+            if cached is not None:
+                return cached, True
+        value = compute()
+        self.put(key, value)
+        return value, False
+
+    def hit_rate(self):
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return round(self.stats["hits"] / lookups, 3) if lookups else None
+
+    def entries(self):
+        return self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM results")
+
+    def close(self):
+        self._db.close()
+
+
+def job_entries(job):
+    """Claves canónicas de un trabajo de búsqueda: una por ordenamiento (o relevancia)"""
+    base = {"keywords": job["keywords"], "brand": job.get("brand"), "price_range": job.get("price_range")}
+    return {sort: canonical_key(sort=sort, **base) for sort in (job.get("sorts") or [None])}
+
+
+def cached_job_search(cache, job, search, bypass=False):
+    """
+    Ejecuta un trabajo del batch runner usando el caché por cada ordenamiento
+
+    Si todos los ordenamientos del trabajo están en el caché no se ejecuta la búsqueda;
+    si falta alguno se ejecuta el trabajo completo (la navegación es la misma) y se guardan todos.
+
+    Args:
+        cache (QueryCache): Caché compartido
+        job (dict): Trabajo (keywords, brand, price_range, sorts)
+        search (callable): Recibe el trabajo y retorna el resultado de batch_runner.run_search
+        bypass (bool): Ignorar lo guardado y refrescar con la búsqueda real
+    Returns:
+        dict: Resultado con el mismo formato de run_search ("cached": True si no se buscó)
+    """
+    keys = job_entries(job)
+    cached = {} if bypass else {sort: cache.get(key) for sort, key in keys.items()}
+    if bypass:
+        cache.stats["bypassed"] += 1
+    if cached and all(entry is not None for entry in cached.values()):
+        first = next(iter(cached.values()))
+        result = {"brand_applied": first["brand_applied"], "product_count": first["product_count"],
+                  "sorts": {}, "source": "cache", "cached": True}
+        if job.get("sorts"):
+            result["sorts"] = {sort: entry["products"] for sort, entry in cached.items()}
+        else:
+            result["products"] = first["products"]
+        return result
+
+    result = search(job)
+    for sort, key in keys.items():
+        products = result["sorts"].get(sort) if sort else result.get("products")
+        if products is not None:
+            cache.put(key, {"brand_applied": result.get("brand_applied"), "product_count": result["product_count"],
+                            "products": products})
+    return dict(result, cached=False)
+
+
+def save_stats(path, stats):
+    """Guarda las estadísticas de un proceso (un archivo por worker de xdist)"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(stats, f, indent=2)
+
+
+def merge_stats(paths):
+    """
+    Suma las estadísticas de varios procesos y calcula la tasa de aciertos
+
+    Returns:
+        dict: Contadores sumados y hit_rate
+    """
+    total = {}
+    for path in paths:
+        try:
+            with open(path, encoding="utf-8") as f:
+                for name, value in json.load(f).items():
+                    if isinstance(value, (int, float)) and name != "hit_rate":
+                        total[name] = total.get(name, 0) + value
+        except (OSError, ValueError):
+            continue
+    lookups = total.get("hits", 0) + total.get("misses", 0)
+    total["hit_rate"] = round(total.get("hits", 0) / lookups, 3) if lookups else None
+    return total
+
+
+def worker_stats_paths(stats_file):
+    """Archivos de estadísticas por worker (query_cache_stats_<worker>.json)"""
+    return glob.glob(stats_file.replace(".json", "_*.json"))
+
+
+def main(argv=None):
+    """Punto de entrada de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Caché compartido de resultados de búsqueda")
+    parser.add_argument("command", choices=("stats", "clear"))
+    parser.add_argument("--path", default=Config.QUERY_CACHE_FILE, help="Archivo SQLite del caché")
+    args = parser.parse_args(argv)
+
+    cache = QueryCache(args.path)
+    if args.command == "clear":
+        cache.clear()
+        print(f"Caché vaciado: {args.path}")
+    else:
+        print(f"{cache.entries()} entradas en {args.path}")
+        if os.path.exists(Config.QUERY_CACHE_STATS_FILE):
+            with open(Config.QUERY_CACHE_STATS_FILE, encoding="utf-8") as f:
+                print(f"Última sesión de tests: {json.load(f)}")
+    cache.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
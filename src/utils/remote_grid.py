@@ -0,0 +1,168 @@
+"""
+Remote Grid - Backend remoto para DriverFactory (Selenium Grid o cualquier endpoint WebDriver)
+
+Consulta /status de cada endpoint configurado, descarta los que no responden o no
+ofrecen el navegador pedido, ordena por carga (slots ocupados / totales) y crea la
+sesión en el menos cargado, pasando al siguiente si la creación falla. Un endpoint donde
+falló la creación de sesión queda marcado como caído y se salta durante un tiempo.
+"""
+
+import logging
+import time
+
+import requests
+from selenium import webdriver
+
+logger = logging.getLogger(__name__)
+
+
+class GridEndpoint:
+    """Estado de un endpoint remoto según su respuesta de /status"""
+
+    def __init__(self, url, healthy=False, total_slots=0, free_slots=0, browsers=None,
+                 platforms=None, latency_ms=None, error=None):
+        self.url = url.rstrip("/")
+        self.healthy = healthy
+        self.total_slots = total_slots
+        self.free_slots = free_slots
+        self.browsers = browsers or set()
+        self.platforms = platforms or set()
+        self.latency_ms = latency_ms
+        self.error = error
+
+    @property
+    def load(self):
+        """Proporción de slots ocupados (0 = libre, 1 = lleno)"""
+        if not self.total_slots:
+            return 0.0
+        return (self.total_slots - self.free_slots) / self.total_slots
+
+    def supports(self, browser, platform=None):
+        """
+        Negociación de capacidades contra los stereotypes de los nodos
+
+        Un endpoint que no publica nodos (ej: chromedriver directo) se considera compatible.
+        """
+        if self.browsers and browser not in self.browsers:
+            return False
+        if platform and self.platforms and platform.lower() not in self.platforms:
+            return False
+        return True
+
+    def __repr__(self):
+        return (f"GridEndpoint({self.url}, healthy={self.healthy}, "
+                f"free={self.free_slots}/{self.total_slots}, browsers={sorted(self.browsers)})")
+
+
+class GridSelector:
+    """Clase que selecciona el endpoint remoto menos cargado con health check y failover"""
+
+    # url -> instante (time.monotonic) hasta el que el endpoint se considera caído.
+    # Compartido por proceso: DriverFactory crea un selector por driver.
+    down_until = {}
+
+    def __init__(self, urls, timeout=3.0, down_cooldown=60.0):
+        """
+        Args:
+            urls (list): Endpoints remotos (ej: http://grid:4444 o http://grid:4444/wd/hub)
+            timeout (float): Timeout del health check en segundos
+            down_cooldown (float): Segundos que se salta un endpoint después de fallar una sesión
+        """
+        self.urls = [url.strip().rstrip("/") for url in urls if url and url.strip()]
+        self.timeout = timeout
+        self.down_cooldown = down_cooldown
+
+    def mark_down(self, url):
+        """Marca un endpoint como caído durante down_cooldown segundos"""
+        GridSelector.down_until[url] = time.monotonic() + self.down_cooldown
+
+    def is_down(self, url):
+        """Indica si el endpoint sigue marcado como caído"""
+        return GridSelector.down_until.get(url, 0) > time.monotonic()
+
+    def probe(self, url):
+        """
+        Consulta GET {url}/status y arma el estado del endpoint
+
+        Args:
+            url (str): Endpoint remoto
+        Returns:
+            GridEndpoint: Estado del endpoint (healthy=False si no responde o no está listo)
+        """
+        start = time.perf_counter()
+        try:
+            response = requests.get(f"{url}/status", timeout=self.timeout)
+            response.raise_for_status()
+            value = response.json().get("value", {})
+        except Exception as e:
+            logger.warning("Endpoint remoto no disponible %s: %s", url, e)
+            return GridEndpoint(url, error=str(e))
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        total = free = 0
+        browsers, platforms = set(), set()
+        for node in value.get("nodes", []):
+            if node.get("availability", "UP") != "UP":
+                continue
+            for slot in node.get("slots", []):
+                stereotype = slot.get("stereotype", {})
+                browsers.add(str(stereotype.get("browserName", "")).lower())
+                if stereotype.get("platformName"):
+                    platforms.add(str(stereotype["platformName"]).lower())
+                total += 1
+                if not slot.get("session"):
+                    free += 1
+        if not value.get("nodes"):
+            # Endpoint WebDriver simple: una sesión a la vez si está listo
+            total, free = 1, 1 if value.get("ready", False) else 0
+
+        return GridEndpoint(url, healthy=bool(value.get("ready", False)), total_slots=total,
+                            free_slots=free, browsers=browsers, platforms=platforms,
+                            latency_ms=round(latency_ms, 1))
+
+    def rank(self, browser, platform=None):
+        """
+        Endpoints sanos y compatibles ordenados del menos al más cargado
+
+        Args:
+            browser (str): Navegador requerido
+            platform (str): Plataforma requerida (opcional)
+        Returns:
+            list: Lista de GridEndpoint
+        """
+        # Si todos están marcados como caídos se vuelven a probar todos
+        urls = [url for url in self.urls if not self.is_down(url)] or self.urls
+        endpoints = [self.probe(url) for url in urls]
+        candidates = [e for e in endpoints if e.healthy and e.supports(browser, platform)]
+        candidates.sort(key=lambda e: (e.free_slots == 0, e.load, e.latency_ms or 0))
+        logger.info("Endpoints remotos para %s: %s", browser, candidates)
+        return candidates
+
+    def create_driver(self, browser, options, platform=None):
+        """
+        Crea un Remote WebDriver en el endpoint menos cargado, con failover
+
+        Args:
+            browser (str): Navegador requerido
+            options: Options de Selenium con las capacidades a negociar
+            platform (str): Plataforma requerida (opcional)
+        Returns:
+            WebDriver: Remote WebDriver
+        Raises:
+            RuntimeError: Si ningún endpoint pudo crear la sesión
+        """
+        if platform:
+            options.platform_name = platform
+        errors = []
+        for endpoint in self.rank(browser, platform):
+            try:
+                driver = webdriver.Remote(command_executor=endpoint.url, options=options)
+                driver.grid_endpoint = endpoint.url
+                logger.info("Sesión remota creada en %s (carga %.0f%%)", endpoint.url, endpoint.load * 100)
+                GridSelector.down_until.pop(endpoint.url, None)
+                return driver
+            except Exception as e:
+                logger.warning("Falló la creación de sesión en %s: %s. Probando siguiente endpoint...", endpoint.url, e)
+                self.mark_down(endpoint.url)
+                errors.append(f"{endpoint.url}: {e}")
+        raise RuntimeError(f"Ningún endpoint remoto pudo crear una sesión de {browser}: {errors or self.urls}")
@@ -0,0 +1,230 @@
+"""
+Resource Monitor - Consumo de recursos del árbol de procesos del navegador
+
+Muestrea RSS, CPU y handles abiertos del driver (chromedriver / geckodriver) y
+todos sus procesos hijos (navegador, renderers, GPU) durante cada test, detecta
+procesos que sobreviven a quit() y los finaliza.
+"""
+
+import logging
+import threading
+import time
+
+try:
+    import psutil
+except ImportError:  # psutil es opcional: sin él el monitoreo queda desactivado
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+
+def _handle_count(process):
+    """Handles abiertos: file descriptors en Linux/Mac, handles en Windows"""
+    try:
+        return process.num_handles() if hasattr(process, "num_handles") else process.num_fds()
+    except (psutil.Error, AttributeError):
+        return 0
+
+
+class BrowserResourceMonitor:
+    """Clase que muestrea en un thread separado los recursos del árbol de procesos del navegador"""
+
+    def __init__(self, driver, interval=1.0):
+        """
+        Inicializa el monitor
+
+        Args:
+            driver: WebDriver instance (local)
+            interval (float): Segundos entre muestras
+        """
+        self.interval = interval
+        self.samples = []
+        self.running = False
+        self.thread = None
+        self.root = None
+        self._processes = {}
+        self._parents = {}
+        self._lock = threading.Lock()
+
+        service = getattr(driver, "service", None)
+        process = getattr(service, "process", None)
+        if psutil is None:
+            logger.warning("psutil no está instalado: monitoreo de recursos desactivado")
+        elif process is None:
+            logger.info("El driver no tiene un proceso local (remoto?): monitoreo de recursos desactivado")
+        else:
+            try:
+                self.root = psutil.Process(process.pid)
+            except psutil.Error as e:
+                logger.warning("No se pudo acceder al proceso del driver: %s", e)
+
+    @property
+    def enabled(self):
+        return self.root is not None
+
+    def _tree(self):
+        """Procesos vivos del árbol; conserva los objetos para que cpu_percent sea incremental"""
+        try:
+            current = [self.root] + self.root.children(recursive=True)
+        except psutil.Error:
+            current = []
+        with self._lock:
+            for proc in current:
+                if proc.pid not in self._processes:
+                    self._processes[proc.pid] = proc
+                    try:
+                        self._parents[proc.pid] = proc.ppid()
+                    except psutil.Error:
+                        pass
+            return [self._processes[proc.pid] for proc in current]
+
+    def sample(self):
+        """Toma una muestra del árbol de procesos"""
+        rss = cpu = handles = 0
+        tree = self._tree()
+        for proc in tree:
+            try:
+                rss += proc.memory_info().rss
+                cpu += proc.cpu_percent(None)
+                handles += _handle_count(proc)
+            except psutil.Error:
+                continue
+        entry = {"t": time.time(), "rss": rss, "cpu": cpu, "handles": handles, "processes": len(tree)}
+        self.samples.append(entry)
+        return entry
+
+    def _loop(self):
+        while self.running:
+            self.sample()
+            time.sleep(self.interval)
+
+    def start(self):
+        """Inicia el muestreo en un thread separado"""
+        if not self.enabled or self.running:
+            return
+        self.running = True
+        self.sample()
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Detiene el muestreo (antes de quit()) y retorna el resumen
+
+        Returns:
+            dict: Resumen de RSS (MB), CPU (%), handles y procesos, o None si está desactivado
+        """
+        if not self.running:
+            return None
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=self.interval + 1)
+        self.sample()
+        first, last = self.samples[0], self.samples[-1]
+        summary = {
+            "samples": len(self.samples),
+            "duration_s": round(last["t"] - first["t"], 2),
+            "start_rss_mb": round(first["rss"] / MB, 1),
+            "end_rss_mb": round(last["rss"] / MB, 1),
+            "peak_rss_mb": round(max(s["rss"] for s in self.samples) / MB, 1),
+            "avg_cpu_percent": round(sum(s["cpu"] for s in self.samples[1:]) / max(len(self.samples) - 1, 1), 1),
+            "peak_cpu_percent": round(max(s["cpu"] for s in self.samples), 1),
+            "peak_handles": max(s["handles"] for s in self.samples),
+            "peak_processes": max(s["processes"] for s in self.samples),
+        }
+        logger.info("Recursos del navegador: %s", summary)
+        return summary
+
+    def _is_orphan(self, proc, root_created):
+        """
+        Un proceso visto en el árbol es huérfano del navegador si sigue siendo el mismo
+        (pid no reutilizado), no es anterior al driver y su padre sigue siendo un proceso
+        del árbol o murió (el proceso fue re-asignado a init / un subreaper)
+        """
+        try:
+            if not proc.is_running() or proc.create_time() < root_created:
+                return False
+            parent = self._parents.get(proc.pid)
+            if parent is None:
+                return False
+            current_parent = proc.ppid()
+        except psutil.Error:
+            return False
+        if current_parent == parent:
+            return True
+        known_parent = self._processes.get(parent)
+        return known_parent is not None and not known_parent.is_running()
+
+    def reap_orphans(self, grace=3.0):
+        """
+        Finaliza los procesos del árbol que siguen vivos después de quit()
+        (solo los creados por el driver: ver _is_orphan)
+
+        Args:
+            grace (float): Segundos de espera antes de considerar huérfano un proceso
+        Returns:
+            list: Procesos finalizados (pid y nombre)
+        """
+        if not self.enabled:
+            return []
+        with self._lock:
+            known = list(self._processes.values())
+        try:
+            root_created = self.root.create_time()
+        except psutil.Error:
+            return []
+        _, alive = psutil.wait_procs(known, timeout=grace)
+        killed = []
+        for proc in alive:
+            if not self._is_orphan(proc, root_created):
+                continue
+            try:
+                name = proc.name()
+                proc.kill()
+                killed.append({"pid": proc.pid, "name": name})
+            except psutil.Error:
+                continue
+        if killed:
+            logger.warning("Procesos del navegador huérfanos después de quit(), finalizados: %s", killed)
+        return killed
+
+
+class MemoryTrend:
+    """Clase que detecta crecimiento sostenido de memoria entre tests del mismo worker"""
+
+    def __init__(self, window=3, threshold_mb=100):
+        """
+        Args:
+            window (int): Cantidad de tests consecutivos con crecimiento para advertir
+            threshold_mb (float): Crecimiento total mínimo dentro de la ventana
+        """
+        self.window = window
+        self.threshold_mb = threshold_mb
+        self.history = []
+
+    def add(self, test_name, summary):
+        """
+        Registra el pico de memoria de un test y advierte si crece sostenidamente
+
+        Returns:
+            bool: True si se detectó crecimiento
+        """
+        if not summary:
+            return False
+        self.history.append((test_name, summary["peak_rss_mb"]))
+        recent = [rss for _, rss in self.history[-(self.window + 1):]]
+        if len(recent) <= self.window:
+            return False
+        growing = all(b > a for a, b in zip(recent, recent[1:]))
+        if growing and recent[-1] - recent[0] >= self.threshold_mb:
+            logger.warning(
+                "Memoria del navegador creciendo en %s tests consecutivos: %sMB -> %sMB (último: %s)",
+                self.window, recent[0], recent[-1], test_name
+            )
+            return True
+        return False
+
+
+memory_trend = MemoryTrend()
@@ -0,0 +1,185 @@
+"""
+Screenshots - Captura de screenshots en memoria con codificación y adjunto en segundo plano
+
+El thread del test solo pide los bytes PNG al driver (get_screenshot_as_png, sin escribir a
+disco). Un worker en segundo plano calcula un hash perceptual (dHash de 64 bits), descarta
+capturas casi idénticas a la anterior, recodifica a WebP/JPEG con la calidad configurada
+(Pillow opcional; sin él se conserva el PNG y solo se descartan capturas idénticas) y guarda
+el archivo en el almacén de artefactos. Los adjuntos a Allure se agregan en flush() desde el
+thread del test, porque allure-commons asocia cada adjunto al último step/test abierto.
+"""
+
+import hashlib
+import io
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import allure
+import allure_commons
+
+from config.config import Config
+from src.utils.artifact_store import ArtifactStore
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow es opcional: sin él no se recodifica ni se compara por similitud
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# Formato -> (formato de Pillow, extensión, tipo MIME para Allure)
+FORMATS = {
+    "webp": ("WEBP", "webp", "image/webp"),
+    "jpeg": ("JPEG", "jpg", "image/jpeg"),
+    "png": ("PNG", "png", "image/png"),
+}
+
+
+def dhash(pixels):
+    """
+    Hash perceptual por diferencias: un bit por par de píxeles vecinos de cada fila
+
+    Args:
+        pixels (list): Filas de 9 valores de gris (8 filas)
+    Returns:
+        int: Hash de 64 bits
+    """
+    value = 0
+    for row in pixels:
+        for left, right in zip(row, row[1:]):
+            value = (value << 1) | (left > right)
+    return value
+
+
+def image_dhash(image):
+    """dHash de una imagen de Pillow (reducida a 9x8 en escala de grises)"""
+    small = image.convert("L").resize((9, 8))
+    data = list(small.tobytes())  # Modo "L": un byte por píxel
+    return dhash([data[row * 9:(row + 1) * 9] for row in range(8)])
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+class ScreenshotService:
+    """Clase que captura screenshots en el thread del test y los procesa en segundo plano"""
+
+    def __init__(self, driver, image_format=None, quality=None, max_distance=None, directory=None):
+        """
+        Args:
+            driver: WebDriver instance
+            image_format (str): webp, jpeg o png; por defecto Config.SCREENSHOT_FORMAT
+            quality (int): Calidad de compresión (1-100)
+            max_distance (int): Distancia de Hamming máxima para considerar dos capturas iguales
+            directory (str): Directorio de salida; por defecto Config.SCREENSHOTS_DIR
+        """
+        self.driver = driver
+        self.image_format = (image_format or Config.SCREENSHOT_FORMAT).lower()
+        if self.image_format not in FORMATS or Image is None:
+            self.image_format = "png"
+        self.quality = quality or Config.SCREENSHOT_QUALITY
+        self.max_distance = Config.SCREENSHOT_DEDUP_DISTANCE if max_distance is None else max_distance
+        self.directory = directory or Config.SCREENSHOTS_DIR
+        self.stats = {"captured": 0, "skipped": 0, "attached": 0, "capture_ms": 0.0}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="screenshots")
+        self._pending = []
+        self._ready = []
+        self._lock = threading.Lock()
+        self._last_hash = None
+        self._steps = {}
+
+    def capture(self, name, force=False):
+        """
+        Toma el screenshot y delega el procesamiento al worker (retorna enseguida)
+
+        Args:
+            name (str): Nombre del adjunto
+            force (bool): Guardar aunque sea igual a la captura anterior (ej: fallo del test)
+        """
+        taken_at, start = datetime.now(), time.perf_counter()
+        try:
+            png = self.driver.get_screenshot_as_png()
+        except Exception as e:
+            logger.warning("No se pudo tomar el screenshot '%s': %s", name, e)
+            return
+        self.stats["captured"] += 1
+        self.stats["capture_ms"] += (time.perf_counter() - start) * 1000
+        self._pending.append(self._executor.submit(self._process, name, png, taken_at, force))
+
+    def _process(self, name, png, taken_at, force):
+        """Worker: descarta duplicados, recodifica y guarda el archivo"""
+        image = Image.open(io.BytesIO(png)) if Image is not None else None
+        fingerprint = image_dhash(image) if image is not None else hashlib.sha256(png).hexdigest()
+        previous, self._last_hash = self._last_hash, fingerprint
+        if not force and previous is not None and (
+                fingerprint == previous if image is None else hamming(fingerprint, previous) <= self.max_distance):
+            self.stats["skipped"] += 1
+            return
+
+        pil_format, extension, mime_type = FORMATS[self.image_format]
+        data = png
+        if image is not None and self.image_format != "png":
+            buffer = io.BytesIO()
+            image.convert("RGB").save(buffer, pil_format, quality=self.quality)
+            data = buffer.getvalue()
+
+        safe_name = re.sub(r"[^\w.-]+", "_", name).strip("_") or "screenshot"
+        path = os.path.join(self.directory, f"{safe_name}_{taken_at.strftime('%Y%m%d_%H%M%S_%f')}.{extension}")
+        if Config.ARTIFACT_STORE:
+            ArtifactStore().put_bytes(data, path, extension=f".{extension}")
+        else:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(data)
+        with self._lock:
+            self._ready.append((name, path, mime_type, extension))
+
+    def flush(self):
+        """Espera el procesamiento pendiente y adjunta los screenshots a Allure (thread del test)"""
+        pending, self._pending = self._pending, []
+        for future in pending:
+            try:
+                future.result()
+            except Exception as e:
+                logger.warning("No se pudo procesar un screenshot: %s", e)
+        with self._lock:
+            ready, self._ready = self._ready, []
+        for name, path, mime_type, extension in ready:
+            try:
+                allure.attach.file(path, name=name, attachment_type=mime_type, extension=extension)
+                self.stats["attached"] += 1
+            except Exception:
+                pass  # Si falla el adjunto, continuamos sin problema
+            logger.info("Screenshot guardado: %s", path)
+        return [path for _, path, _, _ in ready]
+
+    # Hooks de allure_commons: screenshot al terminar cada allure.step
+    @allure_commons.hookimpl
+    def start_step(self, uuid, title, params):
+        self._steps[uuid] = title
+
+    @allure_commons.hookimpl
+    def stop_step(self, uuid, exc_type, exc_val, exc_tb):
+        title = self._steps.pop(uuid, None)
+        if title:
+            self.capture(f"{'Error en ' if exc_type else ''}{title}", force=exc_type is not None)
+
+    def capture_steps(self):
+        """Registra el servicio como plugin de allure para capturar al final de cada step"""
+        if not allure_commons.plugin_manager.is_registered(self):
+            allure_commons.plugin_manager.register(self)
+
+    def close(self):
+        """Adjunta lo pendiente y detiene el worker"""
+        if allure_commons.plugin_manager.is_registered(self):
+            allure_commons.plugin_manager.unregister(self)
+        self.flush()
+        self._executor.shutdown(wait=True)
+        if self.stats["captured"]:
+            logger.info("Screenshots: %s", self.stats)
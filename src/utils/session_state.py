@@ -0,0 +1,198 @@
+"""
+Session State - Snapshots de cookies y localStorage para saltar setups repetidos
+
+Un flujo de preparación (ej: cambiar la moneda a USD) se ejecuta una sola vez; su
+estado se guarda en disco y se restaura en cada driver nuevo antes de la primera
+navegación, con vencimiento (TTL) y validación. Un lock por estado evita que varios
+workers de xdist ejecuten el mismo flujo de preparación a la vez.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import time
+from urllib.parse import urlparse
+
+from config.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Restaura localStorage una sola vez por pestaña en el origen del snapshot
+LOCAL_STORAGE_SCRIPT = """
+(function () {
+    if (location.origin !== %(origin)s || sessionStorage.getItem('__state_restored')) { return; }
+    var items = %(items)s;
+    Object.keys(items).forEach(function (key) { localStorage.setItem(key, items[key]); });
+    sessionStorage.setItem('__state_restored', '1');
+})();
+"""
+
+
+class SessionStateStore:
+    """Clase que guarda y restaura el estado de sesión del navegador"""
+
+    def __init__(self, directory=None, ttl_hours=None):
+        """
+        Args:
+            directory (str): Directorio de los snapshots
+            ttl_hours (float): Vigencia de un snapshot en horas
+        """
+        self.directory = directory or Config.STATE_DIR
+        self.ttl_hours = Config.STATE_TTL_HOURS if ttl_hours is None else ttl_hours
+
+    def _path(self, name):
+        return os.path.join(self.directory, f"{name}.json")
+
+    def _acquire(self, name, timeout=300):
+        """
+        Toma el lock del estado (archivo creado con O_EXCL, seguro entre procesos)
+
+        Returns:
+            str: Ruta del lock, a liberar con os.remove
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        lock_path = self._path(name) + ".lock"
+        deadline = time.time() + timeout
+        while True:
+            try:
+                os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return lock_path
+            except FileExistsError:
+                try:
+                    if time.time() > deadline or time.time() - os.path.getmtime(lock_path) > timeout:
+                        logger.warning("Lock de estado de sesión vencido, se elimina: %s", lock_path)
+                        os.remove(lock_path)
+                except FileNotFoundError:
+                    continue  # El otro worker liberó el lock
+                time.sleep(0.2)
+
+    def capture(self, driver, name):
+        """
+        Toma el estado actual del driver (cookies y localStorage del origen actual)
+
+        Returns:
+            dict: Snapshot
+        """
+        parsed = urlparse(driver.current_url)
+        return {
+            "name": name,
+            "created_at": time.time(),
+            "origin": f"{parsed.scheme}://{parsed.netloc}",
+            "cookies": driver.get_cookies(),
+            "local_storage": driver.execute_script(
+                "var items = {}; for (var i = 0; i < localStorage.length; i++) {"
+                " var k = localStorage.key(i); items[k] = localStorage.getItem(k); } return items;"
+            ) or {},
+        }
+
+    def save(self, snapshot):
+        """Guarda un snapshot de forma atómica (seguro entre workers)"""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, self._path(snapshot["name"]))
+        logger.info("Snapshot de sesión guardado: %s (%s cookies)", snapshot["name"], len(snapshot["cookies"]))
+
+    def load(self, name):
+        """
+        Lee un snapshot vigente
+
+        Returns:
+            dict: Snapshot o None si no existe o venció
+        """
+        path = self._path(name)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except Exception as e:
+            logger.warning("Snapshot de sesión ilegible %s: %s", path, e)
+            return None
+        age_hours = (time.time() - snapshot.get("created_at", 0)) / 3600
+        if self.ttl_hours > 0 and age_hours > self.ttl_hours:
+            logger.info("Snapshot de sesión vencido: %s (%.1fh)", name, age_hours)
+            return None
+        return snapshot
+
+    def restore(self, driver, snapshot):
+        """
+        Restaura cookies y localStorage en un driver nuevo
+
+        En Chrome se usa CDP y no requiere navegar; en otros navegadores se visita
+        el origen del snapshot para poder agregar las cookies.
+        """
+        now = time.time()
+        cookies = [c for c in snapshot["cookies"] if not c.get("expiry") or c["expiry"] > now]
+        if hasattr(driver, "execute_cdp_cmd"):
+            for cookie in cookies:
+                params = {k: cookie[k] for k in ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite")
+                          if k in cookie}
+                if cookie.get("expiry"):
+                    params["expires"] = cookie["expiry"]
+                params.setdefault("url", snapshot["origin"])
+                driver.execute_cdp_cmd("Network.setCookie", params)
+            if snapshot["local_storage"]:
+                driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
+                    "source": LOCAL_STORAGE_SCRIPT % {
+                        "origin": json.dumps(snapshot["origin"]),
+                        "items": json.dumps(snapshot["local_storage"]),
+                    }
+                })
+        else:
+            driver.get(f"{snapshot['origin']}/robots.txt")
+            for cookie in cookies:
+                try:
+                    driver.add_cookie({k: v for k, v in cookie.items() if k != "sameSite" or v})
+                except Exception as e:
+                    logger.debug("Cookie no restaurada %s: %s", cookie.get("name"), e)
+            for key, value in snapshot["local_storage"].items():
+                driver.execute_script("localStorage.setItem(arguments[0], arguments[1]);", key, value)
+        logger.info("Estado de sesión restaurado: %s (%s cookies)", snapshot["name"], len(cookies))
+
+    def ensure(self, driver, name, setup, validator):
+        """
+        Deja el driver en el estado pedido: restaura el snapshot si es válido o,
+        si no, ejecuta el flujo de preparación y guarda un snapshot nuevo. Solo un
+        worker ejecuta el flujo; los demás esperan el lock y restauran su snapshot
+
+        Args:
+            driver: WebDriver instance
+            name (str): Nombre del estado (ej: currency_usd)
+            setup (callable): Flujo que recibe el driver y lo deja en el estado deseado
+            validator (callable): Recibe un snapshot y retorna True si representa el estado deseado
+        Returns:
+            bool: True si se restauró un snapshot existente
+        """
+        snapshot = self.load(name)
+        if snapshot and validator(snapshot):
+            self.restore(driver, snapshot)
+            return True
+
+        lock_path = self._acquire(name)
+        try:
+            # Otro worker pudo guardar el snapshot mientras se esperaba el lock
+            snapshot = self.load(name)
+            if snapshot and validator(snapshot):
+                self.restore(driver, snapshot)
+                return True
+            if snapshot:
+                logger.warning("Snapshot de sesión inválido, se regenera: %s", name)
+
+            setup(driver)
+            snapshot = self.capture(driver, name)
+            if validator(snapshot):
+                self.save(snapshot)
+            else:
+                logger.warning("El flujo de preparación no dejó un estado válido para '%s': no se guarda snapshot",
+                               name)
+            return False
+        finally:
+            os.remove(lock_path)
+
+
+def cookie_value(snapshot, name):
+    """Valor de una cookie dentro de un snapshot (o None)"""
+    return next((c.get("value") for c in snapshot.get("cookies", []) if c.get("name") == name), None)
@@ -0,0 +1,197 @@
+"""
+Sharding - Reparto de tests entre agentes de CI según su duración histórica
+
+Asigna los tests a N shards con el algoritmo LPT (longest processing time first):
+se ordenan de mayor a menor duración y cada uno va al shard con menos carga
+acumulada. Sin historial, se reparte en partes iguales (round-robin).
+
+Uso:
+    pytest tests/ --shard 1/3
+    python -m src.utils.sharding merge --output reports reports-shard-1 reports-shard-2 reports-shard-3
+"""
+
+import argparse
+import heapq
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+def parse_shard(value):
+    """
+    Interpreta el formato "i/N" (i empieza en 1)
+
+    Returns:
+        tuple: (índice, total)
+    Raises:
+        ValueError: Si el formato o los valores no son válidos
+    """
+    try:
+        index, total = (int(part) for part in value.split("/"))
+    except (ValueError, AttributeError):
+        raise ValueError(f"Formato de shard inválido '{value}': se espera i/N (ej: 1/3)")
+    if total < 1 or not 1 <= index <= total:
+        raise ValueError(f"Shard fuera de rango: {value}")
+    return index, total
+
+
+def load_durations(path):
+    """Duraciones históricas por nodeid (segundos); vacío si no hay historial"""
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning("No se pudo leer el historial de duraciones %s: %s", path, e)
+        return {}
+
+
+def update_durations(path, measured, alpha=0.5):
+    """
+    Combina duraciones nuevas con el historial (media móvil exponencial) y guarda
+
+    Args:
+        path (str): Archivo de historial
+        measured (dict): nodeid -> segundos de esta ejecución
+        alpha (float): Peso de la medición nueva
+    """
+    if not measured:
+        return
+    durations = load_durations(path)
+    for nodeid, seconds in measured.items():
+        previous = durations.get(nodeid)
+        durations[nodeid] = round(seconds if previous is None else alpha * seconds + (1 - alpha) * previous, 3)
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(durations, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def assign_shards(nodeids, durations, total):
+    """
+    Reparte los tests en shards balanceados
+
+    Args:
+        nodeids (list): Tests a repartir (en orden de colección)
+        durations (dict): nodeid -> duración histórica en segundos
+        total (int): Cantidad de shards
+    Returns:
+        list: Una lista de nodeids por shard (conservando el orden de colección)
+    """
+    order = {nodeid: i for i, nodeid in enumerate(nodeids)}
+    known = [durations[n] for n in nodeids if n in durations]
+    shards = [[] for _ in range(total)]
+
+    if not known:
+        for i, nodeid in enumerate(nodeids):
+            shards[i % total].append(nodeid)
+        return shards
+
+    # Los tests sin historial se estiman con la media de los conocidos
+    default = sum(known) / len(known)
+    estimated = sorted(nodeids, key=lambda n: (-durations.get(n, default), order[n]))
+    heap = [(0.0, i) for i in range(total)]
+    for nodeid in estimated:
+        load, shard = heapq.heappop(heap)
+        shards[shard].append(nodeid)
+        heapq.heappush(heap, (load + durations.get(nodeid, default), shard))
+
+    return [sorted(shard, key=order.get) for shard in shards]
+
+
+def write_outcomes(path, results, shard=None, **extra):
+    """
+    Guarda los resultados de la ejecución (por test) en JSON
+
+    Args:
+        path (str): Archivo de salida
+        results (dict): nodeid -> {"outcome": ..., "duration_s": ...}
+        shard (str): Shard ejecutado ("i/N") o None
+    Returns:
+        dict: Contenido guardado
+    """
+    totals = {}
+    for result in results.values():
+        totals[result["outcome"]] = totals.get(result["outcome"], 0) + 1
+    data = {
+        "shard": shard,
+        "finished_at": datetime.now().isoformat(timespec="seconds"),
+        "totals": totals,
+        "duration_s": round(sum(r["duration_s"] for r in results.values()), 3),
+        "tests": results,
+        **extra,
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    return data
+
+
+def merge_shard_reports(inputs, output, durations_path=None):
+    """
+    Combina los reportes de varios shards en uno solo
+
+    Copia allure-results de cada shard (los archivos de Allure tienen nombres únicos)
+    y combina outcomes.json; opcionalmente actualiza el historial de duraciones.
+
+    Args:
+        inputs (list): Directorios de reportes de cada shard
+        output (str): Directorio de reportes combinado
+        durations_path (str): Historial de duraciones a actualizar
+    Returns:
+        dict: Resultados combinados
+    """
+    allure_output = os.path.join(output, "allure-results")
+    os.makedirs(allure_output, exist_ok=True)
+    tests, shards = {}, []
+    for directory in inputs:
+        allure_input = os.path.join(directory, "allure-results")
+        if os.path.isdir(allure_input) and os.path.abspath(allure_input) != os.path.abspath(allure_output):
+            for name in os.listdir(allure_input):
+                shutil.copy2(os.path.join(allure_input, name), os.path.join(allure_output, name))
+        outcomes_path = os.path.join(directory, "outcomes.json")
+        if os.path.exists(outcomes_path):
+            with open(outcomes_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            tests.update(data.get("tests", {}))
+            shards.append({"shard": data.get("shard"), "duration_s": data.get("duration_s"),
+                           "totals": data.get("totals")})
+        else:
+            logger.warning("Shard sin outcomes.json: %s", directory)
+
+    merged = write_outcomes(os.path.join(output, "outcomes.json"), tests, shard="merged", shards=shards)
+
+    if durations_path:
+        # Igual que en conftest: un test saltado no aporta una duración real
+        update_durations(durations_path, {nodeid: result["duration_s"] for nodeid, result in tests.items()
+                                          if result["outcome"] != "skipped"})
+    logger.info("%s shards combinados en %s: %s", len(shards), output, merged["totals"])
+    return merged
+
+
+def main(argv=None):
+    """Punto de entrada de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Herramientas de sharding de tests")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    merge = subparsers.add_parser("merge", help="Combinar reportes de shards")
+    merge.add_argument("inputs", nargs="+", help="Directorios de reportes de cada shard")
+    merge.add_argument("--output", default="reports", help="Directorio de reportes combinado")
+    merge.add_argument("--durations", default=None, help="Historial de duraciones a actualizar")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    merged = merge_shard_reports(args.inputs, args.output, args.durations)
+    return 1 if merged["totals"].get("failed") or merged["totals"].get("error") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
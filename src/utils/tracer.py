@@ -0,0 +1,230 @@
+"""
+Tracer - Exporta líneas de tiempo en formato Chrome Trace Event
+
+Los archivos generados se abren en https://ui.perfetto.dev o chrome://tracing.
+Cada worker (proceso de pytest / xdist) escribe su propio archivo y el proceso
+controlador los combina en una sola línea de tiempo al finalizar la sesión.
+"""
+
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import allure_commons
+
+logger = logging.getLogger(__name__)
+
+
+def _now_us():
+    """Timestamp en microsegundos (reloj de pared, común a todos los workers)"""
+    return time.time_ns() // 1000
+
+
+class Tracer:
+    """Clase para registrar spans anidados en formato Chrome Trace Event"""
+
+    def __init__(self):
+        self.enabled = False
+        self.output_path = None
+        self.process_name = "main"
+        self.pid = os.getpid()
+        self.events = []
+        self._lock = threading.Lock()
+        self._open_steps = {}
+
+    def enable(self, output_path, process_name="main"):
+        """
+        Activa el registro de eventos
+
+        Args:
+            output_path (str): Archivo .json donde se guardará la traza
+            process_name (str): Nombre del proceso en la línea de tiempo (ej: gw0)
+        """
+        self.enabled = True
+        self.output_path = output_path
+        self.process_name = process_name
+        self.pid = os.getpid()
+        self.events = [{
+            "name": "process_name", "ph": "M", "pid": self.pid, "tid": 0,
+            "args": {"name": f"worker {process_name}"}
+        }]
+        logger.info("Tracer activado: %s", output_path)
+
+    def complete(self, name, category, start_us, duration_us, args=None):
+        """Registra un evento completo (ph=X) ya medido"""
+        if not self.enabled:
+            return
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": start_us,
+            "dur": duration_us,
+            "pid": self.pid,
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self.events.append(event)
+
+    def instant(self, name, category, args=None):
+        """Registra un evento instantáneo (ph=i)"""
+        if not self.enabled:
+            return
+        event = {
+            "name": name, "cat": category, "ph": "i", "s": "t",
+            "ts": _now_us(), "pid": self.pid, "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self.events.append(event)
+
+    @contextmanager
+    def span(self, name, category, **args):
+        """
+        Context manager que registra un span con la duración del bloque
+
+        Args:
+            name (str): Nombre del span
+            category (str): Categoría (test, step, page, webdriver, wait, sleep, navigation)
+        """
+        if not self.enabled:
+            yield
+            return
+        start = _now_us()
+        try:
+            yield
+        finally:
+            self.complete(name, category, start, _now_us() - start, args)
+
+    def save(self):
+        """Guarda los eventos registrados en el archivo de salida"""
+        if not self.enabled or not self.output_path:
+            return None
+        os.makedirs(os.path.dirname(self.output_path) or ".", exist_ok=True)
+        with self._lock:
+            events = list(self.events)
+        with open(self.output_path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        logger.info("Traza guardada: %s (%s eventos)", self.output_path, len(events))
+        return self.output_path
+
+    # Hooks de allure_commons: cada allure.step se convierte en un span
+    @allure_commons.hookimpl
+    def start_step(self, uuid, title, params):
+        if self.enabled:
+            self._open_steps[uuid] = (title, _now_us())
+
+    @allure_commons.hookimpl
+    def stop_step(self, uuid, exc_type, exc_val, exc_tb):
+        opened = self._open_steps.pop(uuid, None)
+        if opened:
+            title, start = opened
+            args = {"error": exc_type.__name__} if exc_type else None
+            self.complete(title, "step", start, _now_us() - start, args)
+
+
+tracer = Tracer()
+
+
+def install_allure_hooks():
+    """Registra el tracer como plugin de allure para capturar los steps"""
+    if not allure_commons.plugin_manager.is_registered(tracer):
+        allure_commons.plugin_manager.register(tracer)
+
+
+def traced(category="page"):
+    """
+    Decorador que registra la ejecución de una función como span
+
+    Args:
+        category (str): Categoría del span
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            owner = type(args[0]).__name__ if args else ""
+            with tracer.span(f"{owner}.{func.__name__}" if owner else func.__name__, category):
+                return func(*args, **kwargs)
+        wrapper.__traced__ = True
+        return wrapper
+    return decorator
+
+
+# Comandos WebDriver que implican una navegación del navegador
+NAVIGATION_COMMANDS = {"get", "goBack", "goForward", "refresh"}
+
+# Comandos que pueden cambiar el documento actual (page_metrics solo mide después de alguno)
+DOCUMENT_CHANGING_COMMANDS = NAVIGATION_COMMANDS | {"clickElement", "sendKeysToElement", "switchToWindow"}
+
+
+def instrument_driver(driver):
+    """
+    Envuelve driver.execute para registrar cada comando WebDriver como span
+    y marcar los comandos que pueden cambiar de documento (ver page_metrics)
+
+    Args:
+        driver: WebDriver instance
+    Returns:
+        WebDriver: La misma instancia, instrumentada
+    """
+    if getattr(driver, "_traced", False):
+        return driver
+    original_execute = driver.execute
+
+    def execute(driver_command, params=None):
+        if driver_command in DOCUMENT_CHANGING_COMMANDS:
+            driver._navigation_pending = time.monotonic()  # Momento del comando (ver page_metrics)
+        if not tracer.enabled:
+            return original_execute(driver_command, params)
+        category = "navigation" if driver_command in NAVIGATION_COMMANDS else "webdriver"
+        args = {"url": params.get("url")} if params and "url" in params else None
+        start = _now_us()
+        try:
+            return original_execute(driver_command, params)
+        finally:
+            tracer.complete(driver_command, category, start, _now_us() - start, args)
+
+    driver.execute = execute
+    driver._traced = True
+    return driver
+
+
+def merge_traces(paths, output_path):
+    """
+    Combina varios archivos de traza (uno por worker) en uno solo
+
+    Args:
+        paths (list): Archivos de traza a combinar
+        output_path (str): Archivo resultante
+    Returns:
+        str: Ruta del archivo combinado o None si no había trazas
+    """
+    events = []
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                events.extend(json.load(f).get("traceEvents", []))
+        except Exception as e:
+            logger.warning("No se pudo leer la traza %s: %s", path, e)
+    if not events:
+        return None
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    logger.info("Trazas combinadas en %s (%s workers)", output_path, len(paths))
+    return output_path
+
+
+def worker_trace_paths(trace_dir):
+    """Retorna los archivos de traza por worker dentro de un directorio"""
+    return sorted(str(p) for p in Path(trace_dir).glob("trace_*.json"))
@@ -25,12 +25,9 @@ class VideoRecorder:
         self.recording = False
         self.thread = None
         self.writer = None
+        self.resolution = None
         
-        # Obtener resolución de pantalla
-        screen = ImageGrab.grab()
-        self.resolution = (screen.width, screen.height)
-        
-        logger.info(f"VideoRecorder inicializado: {output_path} ({self.resolution[0]}x{self.resolution[1]}) @ {fps} fps")
+        logger.info("VideoRecorder inicializado: %s @ %s fps", output_path, fps)
     
     def start(self):
         """Inicia la grabación de video en un thread separado"""
@@ -41,6 +38,10 @@ class VideoRecorder:
         self.recording = True
         
         try:
+            # Obtener resolución de pantalla (recién al iniciar, no al construir)
+            screen = ImageGrab.grab()
+            self.resolution = (screen.width, screen.height)
+            
             # Crear codec y writer
             fourcc = cv2.VideoWriter_fourcc(*'XVID')
             self.writer = cv2.VideoWriter(
@@ -54,7 +55,7 @@ class VideoRecorder:
             self.thread = threading.Thread(target=self._record_loop, daemon=True)
             self.thread.start()
             
-            logger.info(f"Grabación iniciada: {self.output_path}")
+            logger.info("Grabación iniciada: %s (%sx%s)", self.output_path, self.resolution[0], self.resolution[1])
         except Exception as e:
             logger.error(f"Error al iniciar grabación: {str(e)}")
             self.recording = False
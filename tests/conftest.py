@@ -1,21 +1,20 @@
+import time
+
+_CONFTEST_IMPORT_START = time.perf_counter()
+
 import pytest
+import json
 import logging
 import os
 from datetime import datetime
-from src.base import DriverFactory
 from config.config import Config
-from src.utils.video_recorder import VideoRecorder
-import allure
+from src.utils.logging_setup import setup_logging, shutdown_logging, set_current_test
+from src.utils.budgets import budget_tracker, run_with_budget
+from src.utils.tracer import tracer, install_allure_hooks, instrument_driver, merge_traces, worker_trace_paths
 
-# Configurar logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(f"{Config.REPORTS_DIR}/test.log"),
-        logging.StreamHandler()
-    ]
-)
+# Selenium, Page Objects, allure, numpy (product_store), psutil, sqlite3 y Pillow se importan
+# en los fixtures y hooks que los usan: la colección no paga su costo de importación
+_CONFTEST_IMPORT_SECONDS = time.perf_counter() - _CONFTEST_IMPORT_START
 
 
 @pytest.fixture(scope="function")
@@ -23,6 +22,12 @@ def video_recorder(request):
     """
     Fixture que proporciona grabación automática de video para cada test
     """
+    if not Config.RECORD_VIDEO:
+        yield None
+        return
+    
+    from src.utils.video_recorder import VideoRecorder
+    
     # Crear directorios necesarios si no existen
     os.makedirs(Config.REPORTS_DIR, exist_ok=True)
     
@@ -34,17 +39,21 @@ def video_recorder(request):
     recorder = VideoRecorder(video_filename, fps=5)
     recorder.start()
     
-    logging.info(f"Iniciando grabación de video: {video_filename}")
+    logging.info("Iniciando grabación de video: %s", video_filename)
     
     yield recorder
     
     # Detener grabación
     recorder.stop()
-    logging.info(f"Video guardado: {video_filename}")
+    logging.info("Video guardado: %s", video_filename)
+    if Config.ARTIFACT_STORE and os.path.exists(video_filename):
+        from src.utils.artifact_store import ArtifactStore
+        ArtifactStore().put_file(video_filename)
     
     # Adjuntar video a Allure si existe
     if os.path.exists(video_filename):
         try:
+            import allure
             allure.attach.file(
                 video_filename,
                 name=f"Video_{request.node.name}",
@@ -54,41 +63,202 @@ def video_recorder(request):
             pass  # Si falla el adjunto, continuamos sin problema
 
 
+def _setup_currency_usd(driver):
+    """Flujo de preparación único: cargar la home y cambiar la moneda a USD"""
+    from src.pages.home_page import HomePage
+    from src.pages.product_results_page import ProductResultsPage
+    
+    HomePage(driver).load()
+    ProductResultsPage(driver).change_money_to_dollars()
+
+
+def _currency_is_configured(snapshot):
+    """Validador del estado: la cookie de moneda coincide con Config.CURRENCY"""
+    from src.pages.product_results_page import ProductResultsPage
+    from src.utils.session_state import cookie_value
+    
+    return cookie_value(snapshot, ProductResultsPage.CURRENCY_COOKIE) == Config.CURRENCY
+
+
+# Estados de sesión que se restauran en cada driver nuevo: nombre -> (setup, validador)
+SESSION_STATES = {
+    "currency_usd": (_setup_currency_usd, _currency_is_configured),
+}
+
+
+@pytest.fixture(scope="session")
+def shared_browser():
+    """
+    Fixture que mantiene un navegador Chrome por proceso para crear contextos aislados
+    (solo se inicia con --shared-browser)
+    """
+    from src.utils.browser_contexts import SharedBrowser
+    
+    browser = SharedBrowser()
+    yield browser
+    browser.close()
+
+
+def _new_driver(request):
+    """WebDriver nuevo (o contexto aislado del navegador compartido) sin instrumentar"""
+    from src.base import DriverFactory
+    
+    if Config.SHARED_BROWSER:
+        return request.getfixturevalue("shared_browser").new_context()
+    return DriverFactory.create_driver()
+
+
+def _replace_session(request, driver_instance):
+    """
+    Conecta driver_instance a una sesión nueva (ver CheckpointFlow.recover)
+    
+    Los page objects del test guardan la referencia al driver, así que se trasladan los
+    atributos de la sesión nueva al mismo objeto y se vuelve a instrumentar.
+    """
+    replacement = _new_driver(request)
+    driver_instance.__dict__.pop("execute", None)
+    driver_instance.__dict__.update(replacement.__dict__)
+    driver_instance._traced = False
+    instrument_driver(driver_instance)
+
+
 @pytest.fixture(scope="function")
 def driver(request, video_recorder):
     """
     Fixture que proporciona una instancia de WebDriver para cada test
+    (con --shared-browser, un contexto aislado dentro del navegador compartido)
     """
+    from src.utils.screenshots import ScreenshotService
+    
     logging.info("Inicializando WebDriver")
     
     # Crear directorios necesarios
     os.makedirs(Config.SCREENSHOTS_DIR, exist_ok=True)
     os.makedirs(Config.REPORTS_DIR, exist_ok=True)
     
-    driver_instance = DriverFactory.create_driver()
+    driver_instance = instrument_driver(_new_driver(request))
+    
+    # Screenshots en segundo plano: al fallar el test, en cada step (opcional) y take_screenshot
+    screenshots = ScreenshotService(driver_instance)
+    if Config.SCREENSHOT_ON_STEP:
+        screenshots.capture_steps()
+    request.node._screenshots = screenshots
+    
+    if Config.STATE_SNAPSHOTS:
+        from src.utils.session_state import SessionStateStore
+        store = SessionStateStore()
+        for name, (setup, validator) in SESSION_STATES.items():
+            try:
+                store.ensure(driver_instance, name, setup, validator)
+            except Exception as e:
+                logging.warning("No se pudo preparar el estado de sesión '%s': %s", name, e)
+    
+    monitor = None
+    if Config.RESOURCE_MONITOR:
+        from src.utils.resource_monitor import BrowserResourceMonitor
+        monitor = BrowserResourceMonitor(driver_instance, interval=Config.RESOURCE_MONITOR_INTERVAL)
+        monitor.start()
     
     yield driver_instance
     
+    summary = monitor.stop() if monitor else None
+    screenshots.close()
+    
     logging.info("Cerrando WebDriver")
     driver_instance.quit()
+    
+    if monitor and monitor.enabled:
+        from src.utils.resource_monitor import memory_trend
+        summary = dict(summary or {}, orphans_killed=monitor.reap_orphans())
+        memory_trend.add(request.node.name, summary)
+        request.node.user_properties.append(("browser_resources", summary))
+        try:
+            import allure
+            allure.attach(json.dumps(summary, indent=2), name="Recursos del navegador",
+                          attachment_type=allure.attachment_type.JSON)
+        except Exception:
+            pass
 
 
 @pytest.fixture(scope="function")
-def take_screenshot(driver):
+def checkpoints(request, driver):
     """
-    Fixture para tomar screenshots en caso de fallo
+    Fixture que ejecuta steps de allure con checkpoints reanudables
+    (ver marker resumable)
+    """
+    from src.utils.checkpoints import CheckpointFlow
+    
+    # Al reanudar, una sesión muerta se reemplaza por una nueva sobre el mismo objeto driver
+    return CheckpointFlow(driver, request.node.nodeid,
+                          replace_driver=lambda driver_instance: _replace_session(request, driver_instance))
+
+
+@pytest.fixture(scope="session")
+def product_snapshot(request):
+    """
+    Fixture que acumula los productos extraídos en la sesión y al final los guarda
+    como snapshot columnar (PRODUCT_STORE_DIR) para compararlos entre ejecuciones
+    (con xdist, todos los workers agregan sus filas a la ejecución del controlador)
+    """
+    from src.utils.product_store import ProductSnapshot, ProductStore
+    
+    snapshot = ProductSnapshot()
+    yield snapshot
+    if Config.PRODUCT_STORE and len(snapshot):
+        ProductStore().save(snapshot, request.config.product_run_id)
+
+
+@pytest.fixture(scope="session")
+def query_cache():
+    """
+    Fixture con el caché de resultados de búsqueda compartido entre workers
+    (None con --no-query-cache); al final guarda las estadísticas del proceso
+    """
+    if not Config.QUERY_CACHE:
+        yield None
+        return
+    from src.utils.query_cache import QueryCache, save_stats
+    
+    cache = QueryCache()
+    yield cache
+    stats = dict(cache.stats, hit_rate=cache.hit_rate())
+    save_stats(Config.QUERY_CACHE_STATS_FILE.replace(".json", f"_{_worker_id()}.json"), stats)
+    logging.info("Caché de consultas: %s", stats)
+    cache.close()
+
+
+@pytest.fixture(scope="function")
+def search_results(request, query_cache):
+    """
+    Fixture que resuelve búsquedas (keywords, brand, price_range, sorts) desde el caché
+    compartido; solo abre el navegador si falta algún resultado. Los tests con
+    @pytest.mark.live siempre buscan en vivo (y refrescan el caché)
+    """
+    from src.utils.batch_runner import run_search
+    from src.utils.query_cache import cached_job_search
+    
+    live = request.node.get_closest_marker("live") is not None
+    
+    def _search(keywords, brand=None, price_range=None, sorts=None):
+        job = {"keywords": keywords, "brand": brand, "price_range": price_range, "sorts": list(sorts or [])}
+        
+        def browser_search(job):
+            return run_search(request.getfixturevalue("driver"), job)
+        
+        if query_cache is None:
+            return dict(browser_search(job), cached=False)
+        return cached_job_search(query_cache, job, browser_search, bypass=live)
+    
+    return _search
+
+
+@pytest.fixture(scope="function")
+def take_screenshot(request, driver):
+    """
+    Fixture para tomar screenshots (se procesan en segundo plano y se adjuntan al final del test)
     """
     def _take_screenshot(name):
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{Config.SCREENSHOTS_DIR}/{name}_{timestamp}.png"
-        driver.save_screenshot(filename)
-        logging.info(f"Screenshot guardado: {filename}")
-        # Adjuntar screenshot a Allure
-        allure.attach.file(
-            filename,
-            name=name,
-            attachment_type=allure.attachment_type.PNG
-        )
+        request.node._screenshots.capture(name)
     
     return _take_screenshot
 
@@ -113,6 +283,311 @@ def pytest_addoption(parser):
         default=Config.BASE_URL,
         help="URL base del sitio web"
     )
+    parser.addoption(
+        "--remote-url",
+        action="append",
+        default=None,
+        help="Endpoint Selenium Grid / WebDriver remoto (repetible; reemplaza REMOTE_URLS)"
+    )
+    parser.addoption(
+        "--trace-timeline",
+        action="store_true",
+        default=Config.TRACE_TIMELINE,
+        help="Generar trazas de línea de tiempo (Perfetto / chrome://tracing) en reports/traces"
+    )
+    parser.addoption(
+        "--no-page-metrics",
+        action="store_true",
+        default=not Config.PAGE_METRICS,
+        help="Desactivar la captura de métricas de navegación del sitio"
+    )
+    parser.addoption(
+        "--record-video",
+        action="store",
+        default=str(Config.RECORD_VIDEO),
+        help="Grabar video de cada test: True / False"
+    )
+    parser.addoption(
+        "--profile-template",
+        action="store_true",
+        default=Config.PROFILE_TEMPLATE,
+        help="Arrancar cada driver sobre un clon de un perfil precalentado"
+    )
+    parser.addoption(
+        "--shared-browser",
+        action="store_true",
+        default=Config.SHARED_BROWSER,
+        help="Un navegador por proceso con un contexto aislado por test (solo Chrome local)"
+    )
+    parser.addoption(
+        "--state-snapshots",
+        action="store_true",
+        default=Config.STATE_SNAPSHOTS,
+        help="Restaurar snapshots de estado de sesión (moneda, idioma) en cada driver nuevo"
+    )
+    parser.addoption(
+        "--fast",
+        action="store_true",
+        default=Config.FAST_START,
+        help="Arranque rápido: sin video, trazas, métricas de página ni monitoreo de recursos"
+    )
+    parser.addoption(
+        "--shard",
+        action="store",
+        default=Config.SHARD or None,
+        help="Ejecutar solo el shard i de N (formato i/N), balanceado por duraciones históricas"
+    )
+    parser.addoption(
+        "--step-screenshots",
+        action="store_true",
+        default=Config.SCREENSHOT_ON_STEP,
+        help="Tomar un screenshot al final de cada allure.step (se descartan los casi idénticos)"
+    )
+    parser.addoption(
+        "--no-query-cache",
+        action="store_true",
+        default=not Config.QUERY_CACHE,
+        help="No usar el caché compartido de resultados de búsqueda (todas las búsquedas en vivo)"
+    )
+
+
+# Resultado y duración por test (en el controlador cuando se usa xdist)
+_test_outcomes = {}
+
+
+def _worker_id():
+    """Identificador del worker de pytest-xdist (o 'main' si no se usa xdist)"""
+    return os.getenv("PYTEST_XDIST_WORKER", "main")
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """(xdist) Pasa a cada worker el identificador de ejecución elegido por el controlador"""
+    node.workerinput["product_run_id"] = node.config.product_run_id
+
+
+def pytest_configure(config):
+    """Configura el logging, el tracer de línea de tiempo y la captura de métricas de página"""
+    Config.RECORD_VIDEO = config.getoption("--record-video").lower() == "true"
+    Config.PROFILE_TEMPLATE = config.getoption("--profile-template")
+    Config.STATE_SNAPSHOTS = config.getoption("--state-snapshots")
+    Config.SHARED_BROWSER = config.getoption("--shared-browser")
+    Config.SCREENSHOT_ON_STEP = config.getoption("--step-screenshots")
+    Config.QUERY_CACHE = not config.getoption("--no-query-cache")
+    # Una sola ejecución de productos por sesión: los workers usan la del controlador
+    config.product_run_id = (config.workerinput["product_run_id"] if hasattr(config, "workerinput")
+                             else datetime.now().strftime("%Y%m%d_%H%M%S"))
+    if not hasattr(config, "workerinput"):
+        # Estadísticas del caché de ejecuciones anteriores
+        from src.utils.query_cache import worker_stats_paths
+        for path in worker_stats_paths(Config.QUERY_CACHE_STATS_FILE):
+            os.remove(path)
+    if Config.SHARED_BROWSER and (config.getoption("--browser") != "chrome" or Config.REMOTE_URLS
+                                  or config.getoption("--remote-url")):
+        logging.warning("--shared-browser requiere Chrome local: se usa un navegador por test")
+        Config.SHARED_BROWSER = False
+    if config.getoption("--fast"):
+        Config.RECORD_VIDEO = False
+        Config.RESOURCE_MONITOR = False
+        Config.SCREENSHOT_ON_STEP = False
+        config.option.trace_timeline = False
+        config.option.no_page_metrics = True
+        # Antes del pytest_configure de pytest-html y allure (los hooks de conftest se llaman
+        # primero): los reportes de addopts no se escriben. La cobertura ya arrancó al cargar
+        # los plugins; solo fast_start (--no-cov) la evita.
+        config.option.htmlpath = None
+        config.option.allure_report_dir = None
+    
+    setup_logging(
+        Config.REPORTS_DIR,
+        worker_id=_worker_id(),
+        max_bytes=Config.LOG_MAX_BYTES,
+        backup_count=Config.LOG_BACKUP_COUNT
+    )
+    if not config.getoption("--no-page-metrics"):
+        from src.utils.page_metrics import page_metrics
+        page_metrics.enabled = True
+        page_metrics.output_path = Config.PAGE_METRICS_FILE
+        if not hasattr(config, "workerinput") and os.path.exists(Config.PAGE_METRICS_FILE):
+            os.remove(Config.PAGE_METRICS_FILE)
+    if config.getoption("--trace-timeline"):
+        os.makedirs(Config.TRACES_DIR, exist_ok=True)
+        if not hasattr(config, "workerinput"):
+            # Limpiar trazas de ejecuciones anteriores antes de que arranquen los workers
+            for path in worker_trace_paths(Config.TRACES_DIR):
+                os.remove(path)
+        tracer.enable(f"{Config.TRACES_DIR}/trace_{_worker_id()}.json", process_name=_worker_id())
+        install_allure_hooks()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    """Registra cada test como span raíz de la línea de tiempo y lo asocia a los logs"""
+    set_current_test(item.nodeid)
+    with tracer.span(item.nodeid, "test"):
+        yield
+    set_current_test(None)
+
+
+def pytest_collection(session):
+    """Marca el inicio de la colección para reportar el tiempo de arranque"""
+    session.config._collection_start = time.perf_counter()
+
+
+def pytest_collection_modifyitems(config, items):
+    """Deja solo los tests del shard pedido (--shard i/N)"""
+    shard = config.getoption("--shard")
+    if not shard:
+        return
+    from src.utils.sharding import assign_shards, load_durations, parse_shard
+    
+    try:
+        index, total = parse_shard(shard)
+    except ValueError as e:
+        raise pytest.UsageError(str(e))
+    durations = load_durations(Config.DURATIONS_FILE)
+    selected = set(assign_shards([item.nodeid for item in items], durations, total)[index - 1])
+    deselected = [item for item in items if item.nodeid not in selected]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if item.nodeid in selected]
+    estimate = sum(durations.get(nodeid, 0) for nodeid in selected)
+    logging.info("Shard %s: %s tests (estimado %.0fs según historial)", shard, len(items), estimate)
+
+
+def pytest_runtest_logreport(report):
+    """Acumula resultado y duración (setup + call + teardown) de cada test"""
+    result = _test_outcomes.setdefault(report.nodeid, {"outcome": "passed", "duration_s": 0.0})
+    result["duration_s"] = round(result["duration_s"] + report.duration, 3)
+    if report.failed:
+        result["outcome"] = "failed" if report.when == "call" else "error"
+    elif report.skipped and result["outcome"] == "passed":
+        result["outcome"] = "skipped"
+
+
+def pytest_collection_finish(session):
+    """Reporta tiempos de importación y colección (antes del primer navegador)"""
+    collection_s = time.perf_counter() - getattr(session.config, "_collection_start", time.perf_counter())
+    message = (f"Arranque: conftest importado en {_CONFTEST_IMPORT_SECONDS * 1000:.0f}ms, "
+               f"colección en {collection_s * 1000:.0f}ms")
+    try:
+        import psutil
+        message += f", {time.time() - psutil.Process().create_time():.2f}s desde el inicio del proceso"
+    except ImportError:
+        pass
+    logging.info(message)
+    reporter = session.config.pluginmanager.get_plugin("terminalreporter")
+    if reporter:
+        reporter.write_line(message)
+
+
+def pytest_runtest_setup(item):
+    """Reinicia los resultados de presupuestos de tiempo para el nuevo test"""
+    budget_tracker.reset()
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    """Ejecuta los tests con presupuesto de tiempo (budget / BUDGET_RETRIES) y checkpoints (resumable)"""
+    resumable = pyfuncitem.get_closest_marker("resumable") is not None
+    if pyfuncitem.get_closest_marker("budget") is None and Config.BUDGET_RETRIES == 0 and not resumable:
+        return None
+    flow = pyfuncitem.funcargs.get("checkpoints")
+    # Un reintento por presupuesto vuelve a medir el flujo completo: no se reanuda
+    on_retry = (lambda: flow.rewind(keep=False)) if flow else None
+    if resumable:
+        from src.utils.checkpoints import run_resumable
+        run_resumable(pyfuncitem, lambda: run_with_budget(pyfuncitem, on_retry))
+    else:
+        run_with_budget(pyfuncitem, on_retry)
+    return True
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Screenshot de fallo y presupuestos medido vs objetivo en pytest-html y Allure"""
+    outcome = yield
+    report = outcome.get_result()
+    screenshots = getattr(item, "_screenshots", None)
+    if report.when == "call" and screenshots:
+        if report.failed and Config.SCREENSHOT_ON_FAILURE:
+            screenshots.capture(f"Fallo_{item.name}", force=True)
+        screenshots.flush()
+    if report.when != "call" or not budget_tracker.results:
+        return
+    item.user_properties.append(("budgets", budget_tracker.results))
+    pytest_html = item.config.pluginmanager.getplugin("html")
+    if pytest_html:
+        extras = getattr(report, "extras", [])
+        extras.append(pytest_html.extras.html(budget_tracker.as_html()))
+        report.extras = extras
+    try:
+        import allure
+        allure.attach(budget_tracker.as_json(), name="Presupuestos de tiempo",
+                      attachment_type=allure.attachment_type.JSON)
+    except Exception:
+        pass
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """
+    Guarda tiempos de arranque y la traza del worker; en el controlador combina las trazas,
+    guarda los resultados del shard y actualiza el historial de duraciones (solo sin --shard:
+    con shards, el historial lo actualiza el merge para que todos los agentes repartan igual)
+    """
+    from src.utils.browser_profile import startup_stats
+    from src.utils.sharding import update_durations, write_outcomes
+    
+    startup_stats.save(Config.STARTUP_STATS_FILE if _worker_id() == "main"
+                       else Config.STARTUP_STATS_FILE.replace(".json", f"_{_worker_id()}.json"))
+    if not hasattr(session.config, "workerinput") and _test_outcomes:
+        shard = session.config.getoption("--shard")
+        write_outcomes(Config.OUTCOMES_FILE, _test_outcomes, shard=shard)
+        if not shard:
+            update_durations(Config.DURATIONS_FILE, {nodeid: result["duration_s"] for nodeid, result in
+                                                     _test_outcomes.items() if result["outcome"] != "skipped"})
+    if not hasattr(session.config, "workerinput") and Config.ARTIFACT_STORE:
+        _store_artifacts(session.config)
+    if not hasattr(session.config, "workerinput"):
+        _report_query_cache()
+    if not tracer.enabled:
+        return
+    tracer.save()
+    if not hasattr(session.config, "workerinput"):
+        merge_traces(worker_trace_paths(Config.TRACES_DIR), f"{Config.TRACES_DIR}/timeline.json")
+
+
+def _report_query_cache():
+    """Combina las estadísticas del caché de consultas de todos los workers"""
+    from src.utils.query_cache import merge_stats, save_stats, worker_stats_paths
+    
+    paths = worker_stats_paths(Config.QUERY_CACHE_STATS_FILE)
+    if not paths:
+        return    
+    stats = merge_stats(paths)
+    save_stats(Config.QUERY_CACHE_STATS_FILE, stats)
+    logging.info("Caché de consultas: %s aciertos de %s consultas (tasa %s)",
+                 stats.get("hits", 0), stats.get("hits", 0) + stats.get("misses", 0), stats["hit_rate"])
+
+
+def _store_artifacts(config):
+    """Reemplaza los adjuntos de allure-results y los screenshots por hardlinks al almacén"""
+    from src.utils.artifact_store import ALLURE_ATTACHMENT_PATTERNS, ArtifactStore, write_manifest
+    
+    store = ArtifactStore()
+    manifests = {Config.SCREENSHOTS_DIR: store.ingest(Config.SCREENSHOTS_DIR)}
+    alluredir = getattr(config.option, "allure_report_dir", None)
+    if alluredir:
+        manifests[alluredir] = store.ingest(alluredir, ALLURE_ATTACHMENT_PATTERNS)
+    if any(manifests.values()):
+        write_manifest(Config.ARTIFACT_MANIFEST, manifests)
+        store.gc()
+        logging.info("Almacén de artefactos: %s", store.stats)
+
+
+def pytest_unconfigure(config):
+    """Vacía la cola de logging y cierra los archivos de log"""
+    shutdown_logging()
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -123,13 +598,19 @@ def configure_test_environment(request):
     Config.BROWSER = request.config.getoption("--browser")
     Config.HEADLESS = request.config.getoption("--headless")
     Config.BASE_URL = request.config.getoption("--base-url")
+    if request.config.getoption("--remote-url"):
+        Config.REMOTE_URLS = request.config.getoption("--remote-url")
     
-    logging.info(f"Ambiente configurado:")
-    logging.info(f"  - Browser: {Config.BROWSER}")
-    logging.info(f"  - Headless: {Config.HEADLESS}")
-    logging.info(f"  - Base URL: {Config.BASE_URL}")
+    logging.info("Ambiente configurado:")
+    logging.info("  - Browser: %s", Config.BROWSER)
+    logging.info("  - Headless: %s", Config.HEADLESS)
+    logging.info("  - Base URL: %s", Config.BASE_URL)
+    logging.info("  - Remote: %s", Config.REMOTE_URLS or "local")
     
-    # Agregar información al reporte de Allure
+    # Agregar información al reporte de Allure (sin el plugin de allure no se importa)
+    if not request.config.pluginmanager.has_plugin("allure_pytest"):
+        return
+    import allure
     allure.dynamic.parameter("browser", Config.BROWSER)
     allure.dynamic.parameter("headless", Config.HEADLESS)
     allure.dynamic.parameter("base_url", Config.BASE_URL)
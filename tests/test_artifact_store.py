@@ -0,0 +1,49 @@
+import os
+import time
+from src.utils.artifact_store import ArtifactStore
+
+
+class TestArtifactStore:
+    """Suite de tests para el almacén de artefactos por contenido"""
+
+    def test_identical_files_share_one_blob(self, tmp_path):
+        """Dos archivos con el mismo contenido quedan como hardlinks al mismo blob"""
+        store = ArtifactStore(str(tmp_path / "store"))
+        reports = tmp_path / "reports"
+        reports.mkdir()
+        (reports / "a-attachment.png").write_bytes(b"png" * 100)
+        (reports / "b-attachment.png").write_bytes(b"png" * 100)
+        (reports / "c-result.json").write_text("{}")
+
+        manifest = store.ingest(str(reports), ("*-attachment*",))
+
+        assert set(manifest) == {"a-attachment.png", "b-attachment.png"}
+        assert manifest["a-attachment.png"]["sha256"] == manifest["b-attachment.png"]["sha256"]
+        assert os.path.samefile(reports / "a-attachment.png", reports / "b-attachment.png")
+        assert store.stats["stored"] == 1 and store.stats["deduplicated"] == 1
+        assert store.put_bytes(b"png" * 100, str(reports / "shot.png"), ".png") == manifest["a-attachment.png"]["sha256"]
+        assert os.path.samefile(reports / "shot.png", reports / "a-attachment.png")
+
+    def test_gc_by_age_and_quota(self, tmp_path):
+        """El gc elimina los blobs vencidos y luego los menos usados hasta entrar en la cuota"""
+        store = ArtifactStore(str(tmp_path))
+        old, recent, newest = (store.put_bytes(bytes([i]) * 1000) for i in range(3))
+        stale = time.time() - 30 * 86400
+        os.utime(store.blob_path(old), (stale, stale))
+        os.utime(store.blob_path(recent), (time.time() - 60, time.time() - 60))
+
+        result = store.gc(max_age_days=14, max_bytes=1500)
+
+        assert result["removed"] == 2
+        assert [os.path.exists(store.blob_path(d)) for d in (old, recent, newest)] == [False, False, True]
+
+    def test_files_already_linked_are_not_counted_as_savings(self, tmp_path):
+        """Reingerir un archivo que ya es hardlink a su blob no suma deduplicados ni bytes ahorrados"""
+        store = ArtifactStore(str(tmp_path / "store"))
+        shot = tmp_path / "reports" / "shot.png"
+        store.put_bytes(b"png" * 100, str(shot), ".png")
+
+        store.ingest(str(shot.parent))
+        store.put_file(str(shot))
+
+        assert store.stats == {"stored": 1, "deduplicated": 0, "bytes_saved": 0}
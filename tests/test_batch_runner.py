@@ -0,0 +1,100 @@
+import json
+import os
+import time
+import pytest
+from src.utils.batch_runner import BatchRunner, completed_job_ids, job_id, read_jobs
+from src.utils.product_store import ProductSnapshot
+
+
+def fake_worker(worker_id, browser, tasks, results, http=False, cache=False, rate_limit=None):
+    """Worker sin navegador: el trabajo indica cuánto tarda o si el proceso se cae"""
+    while True:
+        job = tasks.get()
+        if job is None:
+            break
+        if job.get("crash"):
+            os._exit(3)
+        time.sleep(job.get("sleep", 0))
+        result = {"product_count": len(job["keywords"]), "cached": job.get("cached", False),
+                  "products": [{"name": job["keywords"], "price": "10.00", "asin": job["id"]}]}
+        results.send(("done", worker_id, {"id": job["id"], "job": job, "worker": worker_id, "status": "ok",
+                                          "result": result, "duration_s": job.get("sleep", 0)}))
+
+
+class FakeBatchRunner(BatchRunner):
+    worker_target = staticmethod(fake_worker)
+
+
+def read_results(path):
+    with open(path, encoding="utf-8") as f:
+        return {result["id"]: result for result in map(json.loads, f)}
+
+
+class TestBatchRunner:
+    """Suite de tests para la lectura de trabajos y la reanudación del batch"""
+    
+    def test_job_id_is_stable(self):
+        """Sin id explícito, el id depende solo de los parámetros de la búsqueda"""
+        job = {"keywords": "zapatos", "brand": "Skechers", "sorts": ["newest"]}
+        assert job_id(job) == job_id(dict(job))
+        assert job_id(job) != job_id(dict(job, brand="Nike"))
+        assert job_id({"id": "fijo", "keywords": "x"}) == "fijo"
+    
+    def test_read_jobs_skips_invalid_lines(self, tmp_path):
+        """Líneas vacías, comentarios, JSON inválido y trabajos sin keywords se ignoran"""
+        path = tmp_path / "jobs.jsonl"
+        path.write_text('{"keywords": "zapatos"}\n\n# comentario\n{mal json\n{"brand": "Nike"}\n{"id": "b", "keywords": "botas"}\n')
+        assert [job["keywords"] for job in read_jobs(str(path))] == ["zapatos", "botas"]
+    
+    def test_resume_skips_completed_jobs(self, tmp_path):
+        """Los trabajos con resultado se saltan; los fallidos solo si no se pide repetirlos"""
+        output = tmp_path / "results.jsonl"
+        lines = [{"id": "a", "status": "ok"}, {"id": "b", "status": "failed"}, {"id": "c", "status": "timeout"}]
+        output.write_text("\n".join(json.dumps(line) for line in lines) + '\n{"id": "d", "sta')
+        assert completed_job_ids(str(output)) == {"a", "b", "c"}
+        assert completed_job_ids(str(output), retry_failed=True) == {"a"}
+    
+    def test_run_distributes_jobs_and_writes_results(self, tmp_path):
+        """Cada trabajo se ejecuta una vez y su resultado se escribe al terminar"""
+        output = tmp_path / "results.jsonl"
+        jobs = [{"id": str(index), "keywords": "x" * index, "sleep": 0.1} for index in range(1, 7)]
+        summary = FakeBatchRunner(workers=2, output_path=str(output)).run(iter(jobs))
+        
+        results = read_results(output)
+        assert summary["jobs"] == summary["ok"] == 6
+        assert {result["worker"] for result in results.values()} == {1, 2}
+        assert results["4"]["result"]["product_count"] == 4
+    
+    @pytest.mark.parametrize("job, status", [({"sleep": 30}, "timeout"), ({"crash": True}, "failed")])
+    def test_stuck_or_crashed_worker_is_replaced(self, tmp_path, job, status):
+        """El worker que se pasa del timeout o se cae se reemplaza y el batch continúa"""
+        output = tmp_path / "results.jsonl"
+        jobs = [dict(job, id="malo", keywords="a"), {"id": "b", "keywords": "b"}, {"id": "c", "keywords": "c"}]
+        summary = FakeBatchRunner(workers=1, job_timeout=2, output_path=str(output)).run(iter(jobs))
+        
+        results = read_results(output)
+        assert results["malo"]["status"] == status
+        assert results["b"]["status"] == results["c"]["status"] == "ok"
+        assert summary[status] == 1 and summary["ok"] == 2
+    
+    def test_resume_counts_only_skipped_jobs(self, tmp_path):
+        """Al reanudar se saltan los trabajos completados y el resumen cuenta solo los saltados"""
+        output = tmp_path / "results.jsonl"
+        output.write_text(json.dumps({"id": "a", "status": "ok"}) + "\n")
+        jobs = [{"id": "a", "keywords": "a"}, {"id": "b", "keywords": "b"}]
+        skip_ids = completed_job_ids(str(output)) | {"de-otro-archivo"}
+        
+        summary = FakeBatchRunner(workers=1, output_path=str(output)).run(iter(jobs), skip_ids)
+        
+        assert summary["skipped"] == 1 and summary["jobs"] == 1
+        assert list(read_results(output)) == ["a", "b"]
+    
+    def test_cached_results_are_not_added_to_snapshot(self, tmp_path):
+        """El snapshot solo registra productos buscados en esta ejecución, no los del caché"""
+        snapshot = ProductSnapshot()
+        jobs = [{"id": "vivo", "keywords": "zapatos"}, {"id": "cacheado", "keywords": "botas", "cached": True}]
+        summary = FakeBatchRunner(workers=1, output_path=str(tmp_path / "results.jsonl"), snapshot=snapshot,
+                                  cache=True).run(iter(jobs))
+        
+        assert summary["cache_hits"] == 1
+        assert snapshot.columns["asin"] == ["vivo"]
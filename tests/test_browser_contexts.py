@@ -0,0 +1,62 @@
+import pytest
+from selenium.webdriver.remote.command import Command
+from src.utils.browser_contexts import SharedBrowser
+from src.utils.browser_profile import StartupStats
+
+
+class FakeSession:
+    """Sesión WebDriver mínima que registra los comandos y simula los targets de CDP"""
+    
+    def __init__(self):
+        self.commands = []
+        self.targets = [{"targetId": "HOME", "browserContextId": "default"}]
+    
+    def execute(self, driver_command, params=None):
+        self.commands.append((driver_command, params))
+        if driver_command == "executeCdpCommand":
+            method, cdp_params = params["cmd"], params["params"]
+            if method == "Target.createBrowserContext":
+                return {"value": {"browserContextId": f"ctx{len(self.targets)}"}}
+            if method == "Target.createTarget":
+                target_id = f"T{len(self.targets)}"
+                self.targets.append({"targetId": target_id, "browserContextId": cdp_params["browserContextId"]})
+                return {"value": {"targetId": target_id}}
+            if method == "Target.getTargets":
+                return {"value": {"targetInfos": self.targets}}
+            if method == "Target.disposeBrowserContext":
+                self.targets = [t for t in self.targets if t["browserContextId"] != cdp_params["browserContextId"]]
+            return {"value": {}}
+        if driver_command == Command.W3C_GET_WINDOW_HANDLES:
+            return {"value": [t["targetId"] for t in self.targets]}
+        return {"value": None}
+
+
+@pytest.fixture(autouse=True)
+def startup_stats(monkeypatch):
+    """Los arranques de contexto de los tests no se mezclan con reports/startup_stats.json"""
+    stats = StartupStats()
+    monkeypatch.setattr("src.utils.browser_contexts.startup_stats", stats)
+    return stats
+
+
+class TestBrowserContexts:
+    """Suite de tests para los contextos aislados dentro de un navegador compartido"""
+    
+    def test_each_context_driver_runs_in_its_own_tab(self):
+        """Cada fachada se posiciona en su pestaña antes de ejecutar y solo ve sus pestañas"""
+        session = FakeSession()
+        shared = SharedBrowser()
+        shared.driver, shared.home_handle, shared.active_handle = session, "HOME", "HOME"
+        
+        first, second = shared.new_context(), shared.new_context()
+        first.execute(Command.GET, {"url": "http://a"})
+        second.execute(Command.GET, {"url": "http://b"})
+        
+        switches = [params["handle"] for command, params in session.commands if command == Command.SWITCH_TO_WINDOW]
+        assert switches[-2:] == [first.context_handle, second.context_handle]
+        assert first.execute(Command.W3C_GET_WINDOW_HANDLES)["value"] == [first.context_handle]
+        
+        first.quit()
+        assert first.browser_context_id not in {t["browserContextId"] for t in session.targets}
+        assert second.execute(Command.W3C_GET_WINDOW_HANDLES)["value"] == [second.context_handle]
+        assert len(shared.contexts) == 1
@@ -0,0 +1,115 @@
+import os
+import pytest
+from config.config import Config
+from src.base import DriverFactory
+from src.utils import browser_profile
+from src.utils.browser_profile import ProfileTemplate, StartupStats, _copy_tree
+
+
+class FakeDriver:
+    def implicitly_wait(self, seconds):
+        pass
+
+    def set_page_load_timeout(self, seconds):
+        pass
+
+    def get(self, url):
+        pass
+
+
+class WarmupDriver:
+    """Driver falso que deja un perfil mínimo en el directorio de la plantilla"""
+
+    current_url = "https://www.amazon.com"
+
+    def __init__(self, profile_dir):
+        self.profile_dir = profile_dir
+
+    def get(self, url):
+        os.makedirs(os.path.join(self.profile_dir, "Default"), exist_ok=True)
+        with open(os.path.join(self.profile_dir, "Default", "Preferences"), "w") as f:
+            f.write("{}")
+
+    def add_cookie(self, cookie):
+        pass
+
+    def quit(self):
+        pass
+
+
+class FakeGridSelector:
+    def __init__(self, urls, timeout=None, down_cooldown=None):
+        pass
+
+    def create_driver(self, browser, options, platform=None):
+        return FakeDriver()
+
+
+@pytest.fixture
+def template(tmp_path):
+    """Perfil con caché simple (Cache_Data), caché blockfile (Cache) y archivos de perfil"""
+    root = tmp_path / "template"
+    files = {
+        "Default/Cache/Cache_Data/1a2b3c_0": "entrada",
+        "Default/Cache/Cache_Data/index-dir/the-real-index": "indice simple",
+        "Default/Cache/f_000001": "blob",
+        "Default/Cache/data_1": "bloques",
+        "Default/Cache/index": "indice",
+        "Default/Preferences": "{}",
+        "SingletonLock": "",
+    }
+    for relative, content in files.items():
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return root
+
+
+class TestBrowserProfile:
+    """Suite de tests para el clonado de la plantilla de perfil y las estadísticas de arranque"""
+
+    def test_only_write_once_cache_blobs_are_hardlinked(self, template, tmp_path):
+        """Solo los blobs f_* se enlazan; lo que Chrome reescribe en el lugar se copia"""
+        clone = tmp_path / "clone"
+        counts = _copy_tree(str(template), str(clone))
+
+        assert os.path.samefile(template / "Default/Cache/f_000001", clone / "Default/Cache/f_000001")
+        for relative in ("Default/Cache/Cache_Data/1a2b3c_0", "Default/Cache/Cache_Data/index-dir/the-real-index",
+                         "Default/Cache/data_1", "Default/Cache/index", "Default/Preferences"):
+            assert not os.path.samefile(template / relative, clone / relative)
+            assert (clone / relative).read_text() == (template / relative).read_text()
+        assert not (clone / "SingletonLock").exists()
+        assert counts["hardlink"] == 1 and counts["reflink"] + counts["copy"] == 5
+
+    def test_rebuild_keeps_previous_generation_for_running_clones(self, tmp_path, monkeypatch):
+        """Un rebuild publica una generación nueva sin borrar la que otros workers clonan"""
+        monkeypatch.setattr(Config, "PROFILE_WARMUP_URLS", ["https://www.amazon.com"])
+        monkeypatch.setattr(DriverFactory, "create_driver",
+                            staticmethod(lambda browser, profile_dir=None: WarmupDriver(profile_dir)))
+        template = ProfileTemplate("chrome", template_dir=str(tmp_path / "template"),
+                                   clones_dir=str(tmp_path / "clones"))
+
+        first = template.ensure(max_age_hours=1)
+        assert template.ensure(max_age_hours=1) == first
+        second = template.ensure(max_age_hours=1e-9)
+        third = template.ensure(max_age_hours=1e-9)
+
+        assert len({first, second, third}) == 3
+        assert os.path.exists(os.path.join(second, "Default", "Preferences"))
+        assert not os.path.exists(first)
+        assert template.current["build"] == os.path.basename(third)
+        clone = template.clone()
+        assert os.path.exists(os.path.join(clone, "Default", "Preferences"))
+
+    def test_remote_drivers_are_not_counted_as_cold(self, monkeypatch):
+        """El arranque en un Grid remoto se registra aparte y no altera la comparación con cold"""
+        stats = StartupStats()
+        monkeypatch.setattr(browser_profile, "startup_stats", stats)
+        monkeypatch.setattr("src.base.startup_stats", stats)
+        monkeypatch.setattr("src.utils.remote_grid.GridSelector", FakeGridSelector)
+        monkeypatch.setattr(Config, "REMOTE_URLS", ["http://grid:4444"])
+
+        DriverFactory.create_driver("chrome").get("https://www.amazon.com")
+
+        assert set(stats.samples) == {"remote"}
+        assert set(stats.samples["remote"]) == {"driver_start_s", "first_navigation_s"}
@@ -0,0 +1,49 @@
+import time
+import pytest
+from config.config import Config
+from src.utils.budgets import BudgetExceeded, budget, budget_tracker, marker_seconds
+
+
+class TestBudgets:
+    """Suite de tests para los presupuestos de tiempo"""
+    
+    def setup_method(self):
+        budget_tracker.reset()
+    
+    def test_budget_within_limit_is_recorded(self):
+        """Un bloque dentro del presupuesto se registra como OK"""
+        with budget("rápido", 1.0):
+            pass
+        
+        assert budget_tracker.results[0]["name"] == "rápido"
+        assert budget_tracker.results[0]["passed"]
+    
+    def test_budget_exceeded_raises(self):
+        """Un bloque que supera presupuesto + tolerancia falla como aserción"""
+        with pytest.raises(BudgetExceeded):
+            with budget("lento", 0.01, tolerance=0):
+                time.sleep(0.05)
+        
+        assert not budget_tracker.results[0]["passed"]
+    
+    def test_tolerance_extends_limit(self):
+        """La tolerancia amplía el límite efectivo"""
+        with budget("con tolerancia", 0.04, tolerance=5):
+            time.sleep(0.05)
+        
+        assert budget_tracker.results[0]["limit_s"] == pytest.approx(0.24)
+    
+    def test_budget_not_enforced_only_records(self, monkeypatch):
+        """Con BUDGET_ENFORCE desactivado solo se reporta"""
+        monkeypatch.setattr(Config, "BUDGET_ENFORCE", False)
+        with budget("informativo", 0.001, tolerance=0):
+            time.sleep(0.01)
+        
+        assert not budget_tracker.results[0]["passed"]
+    
+    def test_marker_without_seconds_is_a_usage_error(self):
+        """budget(retries=1) sin presupuesto falla con un mensaje claro y no con TypeError"""
+        assert marker_seconds(pytest.mark.budget(90).mark, "test_x") == 90
+        assert marker_seconds(pytest.mark.budget(seconds=1.5).mark, "test_x") == 1.5
+        with pytest.raises(pytest.UsageError, match="necesita un presupuesto"):
+            marker_seconds(pytest.mark.budget(retries=1).mark, "test_x")
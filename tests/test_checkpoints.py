@@ -0,0 +1,147 @@
+import types
+import pytest
+from src.utils.budgets import BudgetExceeded
+from src.utils.checkpoints import CheckpointFlow, run_resumable
+
+
+class FakeDriver:
+    """Driver mínimo con URL y cookies para probar los checkpoints sin navegador"""
+    
+    def __init__(self, session_id="original"):
+        self.current_url = "https://www.amazon.com/s?k=zapatos"
+        self.session_id = session_id
+        self.alive = True
+        self.visited = []
+    
+    def execute_script(self, script):
+        if not self.alive:
+            raise RuntimeError("invalid session id")
+        return 1
+    
+    def get_cookies(self):
+        return [{"name": "i18n-prefs", "value": "USD"}]
+    
+    def execute_cdp_cmd(self, command, params):
+        pass
+    
+    def get(self, url):
+        self.visited.append(url)
+
+
+def resumable_item(flow, retries=1):
+    """Item de pytest mínimo marcado con @pytest.mark.resumable(retries=...)"""
+    marker = types.SimpleNamespace(kwargs={"retries": retries})
+    return types.SimpleNamespace(name="test_flujo", funcargs={"checkpoints": flow}, user_properties=[],
+                                 get_closest_marker=lambda name: marker if name == "resumable" else None)
+
+
+class TestCheckpointFlow:
+    """Suite de tests para los steps reanudables"""
+    
+    def test_retry_resumes_from_last_checkpoint(self, tmp_path):
+        """Un reintento salta los steps completados y devuelve sus datos guardados"""
+        driver = FakeDriver()
+        flow = CheckpointFlow(driver, "tests/x.py::test_flujo", directory=str(tmp_path), resume=False)
+        executed = []
+        
+        flow.step("cargar", lambda: executed.append("cargar"))
+        flow.step("contar", lambda: executed.append("contar") or 42)
+        with pytest.raises(RuntimeError):
+            flow.step("ordenar", lambda: (_ for _ in ()).throw(RuntimeError("flaky")))
+        
+        flow.rewind(keep=True)
+        assert flow.step("cargar", lambda: executed.append("cargar")) is None
+        assert flow.step("contar", lambda: executed.append("contar") or 0) == 42
+        flow.step("ordenar", lambda: executed.append("ordenar"))
+        
+        assert executed == ["cargar", "contar", "ordenar"]
+        assert driver.visited == ["https://www.amazon.com/s?k=zapatos"]
+        assert flow.summary()["resumes"] == 1
+    
+    def test_rewind_without_keep_runs_everything(self, tmp_path):
+        """Descartar checkpoints vuelve a ejecutar el flujo completo"""
+        flow = CheckpointFlow(FakeDriver(), "tests/x.py::test_flujo", directory=str(tmp_path), resume=False)
+        executed = []
+        flow.step("cargar", lambda: executed.append(1))
+        
+        flow.rewind(keep=False)
+        flow.step("cargar", lambda: executed.append(2))
+        
+        assert executed == [1, 2]
+    
+    def test_checkpoints_on_disk_resume_in_new_process(self, tmp_path):
+        """Un rerun en otro proceso reanuda desde los checkpoints en disco"""
+        first = CheckpointFlow(FakeDriver(), "tests/x.py::test_flujo", directory=str(tmp_path), resume=False)
+        first.step("cargar", lambda: "ok")
+        
+        second = CheckpointFlow(FakeDriver(), "tests/x.py::test_flujo", directory=str(tmp_path), resume=True)
+        
+        assert second.step("cargar", lambda: "otra vez") == "ok"
+        second.finish()
+        assert not list(tmp_path.iterdir())
+    
+    def test_infrastructure_errors_resume(self, tmp_path):
+        """Un error de WebDriver/red reintenta desde el último checkpoint"""
+        flow = CheckpointFlow(FakeDriver(), "tests/x.py::test_flujo", directory=str(tmp_path), resume=False)
+        executed, attempts = [], []
+        
+        def run():
+            attempts.append(1)
+            flow.step("cargar", lambda: executed.append("cargar"))
+            if len(attempts) == 1:
+                raise RuntimeError("session deleted")
+            flow.step("contar", lambda: executed.append("contar"))
+        
+        run_resumable(resumable_item(flow), run)
+        assert executed == ["cargar", "contar"] and len(attempts) == 2
+    
+    def test_dead_session_is_replaced_before_resuming(self, tmp_path):
+        """Si la sesión murió, el reintento usa una sesión nueva con el checkpoint restaurado"""
+        driver = FakeDriver()
+        page_driver = driver  # Referencia guardada por un page object
+        replaced = []
+        
+        def replace_driver(old):
+            replaced.append(old.session_id)
+            old.__dict__.update(FakeDriver(session_id="nueva").__dict__)
+        
+        flow = CheckpointFlow(driver, "tests/x.py::test_flujo", directory=str(tmp_path), resume=False,
+                              replace_driver=replace_driver)
+        attempts, sessions = [], []
+        
+        def run():
+            attempts.append(1)
+            flow.step("cargar", lambda: "ok")
+            if len(attempts) == 1:
+                driver.alive = False
+                raise RuntimeError("invalid session id")
+            flow.step("contar", lambda: sessions.append(page_driver.session_id))
+        
+        run_resumable(resumable_item(flow), run)
+        
+        assert replaced == ["original"]
+        assert sessions == ["nueva"]
+        assert driver.visited == ["https://www.amazon.com/s?k=zapatos"]
+    
+    def test_live_session_is_kept(self, tmp_path):
+        """Una sesión que responde no se reemplaza al reanudar"""
+        flow = CheckpointFlow(FakeDriver(), "tests/x.py::test_flujo", directory=str(tmp_path), resume=False,
+                              replace_driver=lambda old: pytest.fail("no debía reemplazarse"))
+        
+        assert flow.recover() is False
+    
+    @pytest.mark.parametrize("error", [AssertionError("precio incorrecto"), BudgetExceeded("12.0s > 10s")])
+    def test_assertion_failures_are_not_resumed(self, tmp_path, error):
+        """Una verificación fallida o un presupuesto agotado falla sin reanudar ni dejar checkpoints"""
+        flow = CheckpointFlow(FakeDriver(), "tests/x.py::test_flujo", directory=str(tmp_path), resume=False)
+        attempts = []
+        
+        def run():
+            attempts.append(1)
+            flow.step("cargar", lambda: "ok")
+            raise error
+        
+        with pytest.raises(type(error)):
+            run_resumable(resumable_item(flow, retries=2), run)
+        assert len(attempts) == 1
+        assert not list(tmp_path.iterdir())
@@ -0,0 +1,30 @@
+from src.utils.fast_start import fast_args, ini_addopts
+
+ADDOPTS = ["-v", "--html=reports/report.html", "--self-contained-html",
+           "--alluredir=reports/allure-results", "--cov=src", "--cov-report=term-missing"]
+
+
+class TestFastStart:
+    """Suite de tests para el lanzador de arranque rápido"""
+    
+    def test_report_defaults_are_disabled(self):
+        """Sin opciones de reportes se descargan los plugins y se quitan sus opciones de addopts"""
+        args = fast_args(["-m", "smoke"], addopts=ADDOPTS)
+        
+        assert "no:html" in args
+        assert "no:allure_pytest" in args
+        assert "--no-cov" in args
+        assert "addopts=-v --cov=src --cov-report=term-missing" in args
+        assert args[-3:] == ["--fast", "-m", "smoke"]
+    
+    def test_requested_report_is_kept(self):
+        """Un reporte pedido explícitamente conserva su plugin y sus opciones de addopts"""
+        args = fast_args(["--alluredir=out", "--cov=src"], addopts=ADDOPTS)
+        
+        assert "no:allure_pytest" not in args
+        assert "--no-cov" not in args
+        assert "addopts=-v --alluredir=reports/allure-results --cov=src --cov-report=term-missing" in args
+    
+    def test_reads_pytest_ini_addopts(self):
+        """Por defecto se usa el addopts de pytest.ini del proyecto"""
+        assert "--alluredir=reports/allure-results" in ini_addopts()
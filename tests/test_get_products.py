@@ -12,47 +12,73 @@ logger = logging.getLogger(__name__)
 class TestGetProducts:
     """Suite de tests para la página de productos"""
     
-    def test_get_information_of_products(self, driver):
+    @pytest.mark.live
+    @pytest.mark.budget(seconds=120, retries=1)
+    @pytest.mark.resumable(retries=1)
+    def test_get_information_of_products(self, driver, checkpoints, product_snapshot):
         """Verifica que se puedan obtener la información de los productos correctamente"""
         home = HomePage(driver)
         products = ProductResultsPage(driver)
         
-        with allure.step("Cargar página de inicio"):
-            home.load()
+        def verify_brand_filter():
+            assert products.is_brand_filter_applied("Skechers"), "El filtro de marca no se aplicó correctamente"
+        
+        def sort_and_get_products(sort_option):
+            products.sort_by(sort_option)
+            return products.get_first_five_products_info()
+        
+        def record_products(sort_option, info):
+            product_snapshot.add(info, query="zapatos|Skechers|100-200", sort=sort_option)
         
-        with allure.step("Buscar un producto específico"):
-            home.search_product("zapatos")
+        checkpoints.step("Cargar página de inicio", home.load)
+        
+        checkpoints.step("Buscar un producto específico", lambda: home.search_product("zapatos"))
 
-        with allure.step("Cambiar moneda a USD si es necesario"):
-            products.change_money_to_dollars()
+        checkpoints.step("Cambiar moneda a USD si es necesario", products.change_money_to_dollars)
         
-        with allure.step("Filtrar resultados por Marca"):
-            products.apply_brand_filter("Skechers")
+        checkpoints.step("Filtrar resultados por Marca", lambda: products.apply_brand_filter("Skechers"))
 
-        with allure.step("Verificar que el filtro de marca se aplicó correctamente"):
-            assert products.is_brand_filter_applied("Skechers"), "El filtro de marca no se aplicó correctamente"
+        checkpoints.step("Verificar que el filtro de marca se aplicó correctamente", verify_brand_filter)
 
-        with allure.step("Filtrar por rango de precio"):
-            products.apply_price_filter("100-200")
+        checkpoints.step("Filtrar por rango de precio", lambda: products.apply_price_filter("100-200"))
             
-        with allure.step("Obtener el número de productos encontrados"):
-            product_count = products.get_product_count()
-            print(f"\n*** NÚMERO DE PRODUCTOS ENCONTRADOS: {product_count} ***\n")
-
-        with allure.step("Ordenar por Precio de más alto a más bajo y obtener el nombre y precio de los cinco primeros productos"):
-            products.sort_by("price_high_low")
-            price_desc_product_info = products.get_first_five_products_info()
-            for idx, info in enumerate(price_desc_product_info, start=1):
-                print(f"Producto por precio descendente {idx}: {info['name']} - Precio: {info['price']}")
-
-        with allure.step("Ordenar por Nuevos lanzamiento y obtener el nombre y precio de los cinco primeros productos"):
-            products.sort_by("newest")
-            newest_product_info = products.get_first_five_products_info()
-            for idx, info in enumerate(newest_product_info, start=1):
-                print(f"Nuevo Producto {idx}: {info['name']} - Precio: {info['price']}")
-
-        with allure.step("Ordenar por Opinión del cliente y obtener el nombre y precio de los cinco primeros productos"):
-            products.sort_by("avg_review")
-            review_product_info = products.get_first_five_products_info()
-            for idx, info in enumerate(review_product_info, start=1):
-                print(f"Producto con mejor opinión {idx}: {info['name']} - Precio: {info['price']}")
\ No newline at end of file
+        product_count = checkpoints.step("Obtener el número de productos encontrados", products.get_product_count)
+        print(f"\n*** NÚMERO DE PRODUCTOS ENCONTRADOS: {product_count} ***\n")
+
+        price_desc_product_info = checkpoints.step(
+            "Ordenar por Precio de más alto a más bajo y obtener el nombre y precio de los cinco primeros productos",
+            lambda: sort_and_get_products("price_high_low")
+        )
+        record_products("price_high_low", price_desc_product_info)
+        for idx, info in enumerate(price_desc_product_info, start=1):
+            print(f"Producto por precio descendente {idx}: {info['name']} - Precio: {info['price']}")
+
+        newest_product_info = checkpoints.step(
+            "Ordenar por Nuevos lanzamiento y obtener el nombre y precio de los cinco primeros productos",
+            lambda: sort_and_get_products("newest")
+        )
+        record_products("newest", newest_product_info)
+        for idx, info in enumerate(newest_product_info, start=1):
+            print(f"Nuevo Producto {idx}: {info['name']} - Precio: {info['price']}")
+
+        review_product_info = checkpoints.step(
+            "Ordenar por Opinión del cliente y obtener el nombre y precio de los cinco primeros productos",
+            lambda: sort_and_get_products("avg_review")
+        )
+        record_products("avg_review", review_product_info)
+        for idx, info in enumerate(review_product_info, start=1):
+            print(f"Producto con mejor opinión {idx}: {info['name']} - Precio: {info['price']}")
+
+    @pytest.mark.budget(seconds=120)
+    def test_sorted_results_have_products(self, search_results):
+        """Verifica que cada ordenamiento devuelva productos con nombre y precio (usa el caché si está vigente)"""
+        sorts = ["price_high_low", "newest", "avg_review"]
+        results = search_results("zapatos", brand="Skechers", price_range="100-200", sorts=sorts)
+        
+        with allure.step("Verificar los productos de cada ordenamiento"):
+            for sort_option in sorts:
+                products = results["sorts"][sort_option]
+                assert 0 < len(products) <= 5, f"Cantidad inesperada de productos para {sort_option}"
+                assert all(product["name"] and product["price"] for product in products)
+        logger.info("Resultados %s: %s productos",
+                    "del caché" if results["cached"] else "en vivo", results["product_count"])
@@ -0,0 +1,57 @@
+import pytest
+from benchmarks.fixture_server import PAGE_SIZE, FixtureServer
+from config.config import Config
+from src.utils.batch_runner import BatchRunner
+from src.utils.http_extractor import HttpSearchClient, JavascriptRequired, parse_results_page, search_with_fallback
+
+
+@pytest.fixture(scope="module")
+def fixture_server():
+    """Servidor local que reemplaza al sitio real"""
+    with FixtureServer() as server:
+        yield server
+
+
+class TestHttpExtractor:
+    """Suite de tests para la extracción HTTP sin navegador"""
+    
+    def test_search_against_local_server(self, fixture_server):
+        """La búsqueda HTTP extrae cantidad, productos y página siguiente con las reglas de la página"""
+        client = HttpSearchClient(fixture_server.url, max_concurrency=2, delay=0)
+        result = client.search("zapatos", brand="Skechers", sort="price_high_low", top=None)
+        
+        assert result["product_count"] == 2000
+        assert len(result["products"]) == PAGE_SIZE
+        assert result["products"][0]["name"].startswith("Skechers zapatos")
+        assert result["products"][0]["asin"].startswith("B0FIX")
+        prices = [p["price"] for p in result["products"]]
+        assert "Varía según opciones" in prices or all(price.replace(".", "").isdigit() for price in prices)
+        assert "page=2" in result["next_url"]
+        assert client.stats["requests"] == 1
+    
+    def test_page_without_results_requires_javascript(self):
+        """Una página sin resultados en el HTML pide el navegador"""
+        with pytest.raises(JavascriptRequired):
+            parse_results_page("<html><body><noscript>Enable JavaScript</noscript></body></html>")
+    
+    def test_fallback_to_browser(self, fixture_server):
+        """Si el sitio no devuelve resultados procesables se usa el flujo con navegador"""
+        client = HttpSearchClient(fixture_server.url + "/no-existe", delay=0)
+        result = search_with_fallback(client, {"keywords": "zapatos"}, lambda job: {"product_count": 7})
+        assert result == {"product_count": 7, "source": "browser"}
+        assert client.stats["fallbacks"] == 1
+    
+    def test_delay_is_shared_between_batch_workers(self, fixture_server, tmp_path, monkeypatch):
+        """Dos workers del batch respetan juntos un solo pedido a la vez separado por HTTP_DELAY"""
+        monkeypatch.setenv("BASE_URL", fixture_server.url)  # Config de los procesos worker
+        monkeypatch.setattr(Config, "HTTP_CONCURRENCY", 1)
+        monkeypatch.setattr(Config, "HTTP_DELAY", 0.2)
+        fixture_server.request_log.clear()
+        jobs = [{"id": str(index), "keywords": f"zapatos {index}"} for index in range(6)]
+        
+        summary = BatchRunner(workers=2, output_path=str(tmp_path / "results.jsonl"), http=True).run(iter(jobs))
+        
+        assert summary["ok"] == 6
+        times = sorted(timestamp for timestamp, path in fixture_server.request_log if path.startswith("/s?"))
+        assert len(times) == 6
+        assert min(b - a for a, b in zip(times, times[1:])) >= 0.18
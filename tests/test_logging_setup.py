@@ -0,0 +1,48 @@
+import json
+import logging
+import logging.handlers
+import threading
+import pytest
+from config.config import Config
+from src.utils import logging_setup
+from src.utils.logging_setup import DeferredQueueHandler, set_current_test, setup_logging, shutdown_logging
+
+
+@pytest.fixture
+def isolated_logging(tmp_path):
+    """Configura el logging en un directorio temporal y al final restaura el de la sesión"""
+    context = dict(logging_setup._context)
+    yield tmp_path
+    shutdown_logging()
+    logging_setup._context.update(context)
+    setup_logging(Config.REPORTS_DIR, worker_id=context["worker_id"], max_bytes=Config.LOG_MAX_BYTES,
+                  backup_count=Config.LOG_BACKUP_COUNT)
+
+
+class TestLoggingSetup:
+    """Suite de tests para el pipeline de logging con cola y listener"""
+
+    def test_records_are_queued_and_written_by_listener(self, isolated_logging):
+        """El test solo encola; el listener formatea y escribe texto y JSON-lines"""
+        setup_logging(str(isolated_logging), worker_id="gw3", console=False)
+        root = logging.getLogger()
+        assert [type(h) for h in root.handlers if isinstance(h, logging.handlers.QueueHandler)] == \
+            [DeferredQueueHandler]
+
+        set_current_test("tests/test_x.py::test_a")
+        logger = logging.getLogger("prueba")
+        thread = threading.Thread(target=lambda: logger.warning("precio %s", "10.00"), name="worker-x")
+        thread.start()
+        thread.join()
+        for index in range(200):
+            logger.info("mensaje %d", index)
+        set_current_test(None)
+        shutdown_logging()  # Debe vaciar la cola antes de cerrar los archivos
+
+        text = (isolated_logging / "test_gw3.log").read_text(encoding="utf-8").splitlines()
+        entries = [json.loads(line) for line in (isolated_logging / "test_gw3.jsonl").read_text(encoding="utf-8")
+                   .splitlines()]
+        assert len(text) == len(entries) == 201
+        assert "gw3 - prueba - WARNING - precio 10.00" in text[0]
+        assert entries[0]["test"] == "tests/test_x.py::test_a" and entries[0]["thread"] == "worker-x"
+        assert entries[-1]["message"] == "mensaje 199"
@@ -0,0 +1,59 @@
+from src.utils import page_metrics
+from src.utils.page_metrics import PageMetricsCollector
+from src.utils.tracer import instrument_driver
+
+
+class FakeDriver:
+    """Driver mínimo: cada navegación cambia el timeOrigin del documento"""
+
+    def __init__(self):
+        self.time_origin = 0
+        self.scripts = 0
+
+    def execute(self, driver_command, params=None):
+        if driver_command == "get":
+            self.time_origin += 1
+        return {"value": None}
+
+    def execute_script(self, script):
+        self.scripts += 1
+        return {"time_origin": self.time_origin, "url": "http://localhost/", "ttfb_ms": 1,
+                "dom_content_loaded_ms": 2, "load_ms": 3, "request_count": 1, "transferred_bytes": 10}
+
+
+class TestPageMetrics:
+    """Suite de tests para la captura de métricas después de las navegaciones"""
+
+    def test_only_document_changing_actions_query_the_browser(self):
+        """Las acciones de solo lectura no ejecutan el script de métricas"""
+        collector = PageMetricsCollector(enabled=True)
+        driver = instrument_driver(FakeDriver())
+
+        driver.execute("get", {"url": "http://localhost/"})
+        assert collector.collect_if_navigated(driver)["time_origin"] == 1
+        driver.execute("findElement", {"using": "css selector", "value": "#q"})
+        assert collector.collect_if_navigated(driver) is None
+        assert driver.scripts == 1
+
+        driver.execute("clickElement", {"id": "boton"})  # El click no navegó: timeOrigin igual
+        assert collector.collect_if_navigated(driver) is None
+        assert driver.scripts == 2
+
+    def test_late_navigation_after_click_is_measured(self, monkeypatch):
+        """Si el documento cambia después de la acción del click, se mide en la acción siguiente"""
+        collector = PageMetricsCollector(enabled=True)
+        driver = instrument_driver(FakeDriver())
+        driver.execute("get", {"url": "http://localhost/"})
+        collector.collect_if_navigated(driver)
+
+        driver.execute("clickElement", {"id": "filtro-marca"})
+        assert collector.collect_if_navigated(driver) is None  # Todavía no cambió el documento
+        driver.time_origin += 1  # La navegación del click terminó
+        assert collector.collect_if_navigated(driver)["time_origin"] == 2
+
+        driver.execute("clickElement", {"id": "checkbox"})  # Un click que nunca navega
+        monkeypatch.setattr(page_metrics, "NAVIGATION_GRACE_S", 0)
+        assert collector.collect_if_navigated(driver) is None
+        scripts = driver.scripts
+        assert collector.collect_if_navigated(driver) is None
+        assert driver.scripts == scripts  # Vencido el margen no se vuelve a consultar
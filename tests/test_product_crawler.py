@@ -0,0 +1,119 @@
+import time
+from src.pages.product_results_page import READ_PRODUCTS_SCRIPT, ProductResultsPage, format_price
+from src.utils.tracer import tracer
+
+
+class FakeResultsDriver:
+    """Driver mínimo que simula páginas de resultados paginadas sin navegador"""
+    
+    def __init__(self, pages):
+        self.pages = pages
+        self.current_url = "/s?page=1"
+        self.visited = [self.current_url]
+    
+    def _page(self):
+        return int(self.current_url.rsplit("=", 1)[1])
+    
+    def execute_script(self, script, *args):
+        if script == READ_PRODUCTS_SCRIPT:
+            return self.pages[self._page() - 1]
+        if "querySelector(arguments[0])" in script:
+            return f"/s?page={self._page() + 1}" if self._page() < len(self.pages) else None
+        return None
+    
+    def get(self, url):
+        self.current_url = url
+        self.visited.append(url)
+
+
+class FakeTabsDriver(FakeResultsDriver):
+    """Driver con pestañas: window.open abre una pestaña de fondo sin cambiar la activa"""
+    
+    def __init__(self, pages):
+        self.tabs = {"original": "/s?page=1"}
+        self.current_window_handle = "original"
+        self.switch_to = self
+        super().__init__(pages)
+    
+    @property
+    def current_url(self):
+        return self.tabs[self.current_window_handle]
+    
+    @current_url.setter
+    def current_url(self, url):
+        self.tabs[self.current_window_handle] = url
+    
+    @property
+    def window_handles(self):
+        return list(self.tabs)
+    
+    def execute_script(self, script, *args):
+        if script.startswith("window.open"):
+            self.tabs[f"tab{len(self.tabs)}"] = args[0]
+            return None
+        return super().execute_script(script, *args)
+    
+    def window(self, handle):
+        self.current_window_handle = handle
+    
+    def close(self):
+        del self.tabs[self.current_window_handle]
+
+
+def card(asin, whole="10", fraction="00"):
+    return {"asin": asin, "name": f"Producto {asin}", "whole": whole, "fraction": fraction, "see_options": False}
+
+
+class TestProductCrawler:
+    """Suite de tests para el recorrido paginado de resultados"""
+    
+    def test_format_price(self):
+        """Las reglas de precio coinciden con las de get_first_five_products_info"""
+        assert format_price("1,299.", "99") == "1299.99"
+        assert format_price(None, None, see_options=True) == "Varía según opciones"
+        assert format_price(None, "99") == "Precio no disponible"
+    
+    def test_deduplicates_by_asin_across_pages(self):
+        """Un ASIN repetido en la página siguiente se entrega una sola vez"""
+        driver = FakeResultsDriver([[card("A"), card("B")], [card("B"), card("C")]])
+        products = list(ProductResultsPage(driver).iter_products())
+        assert [p["asin"] for p in products] == ["A", "B", "C"]
+        assert [(p["page"], p["position"]) for p in products] == [(1, 1), (1, 2), (2, 3)]
+    
+    def test_stops_without_loading_extra_pages(self):
+        """Con max_items o stop_when alcanzados no se navega a la página siguiente"""
+        pages = [[card("A"), card("B")], [card("C", "5")], [card("D")]]
+        driver = FakeResultsDriver(pages)
+        assert len(list(ProductResultsPage(driver).iter_products(max_items=2))) == 2
+        assert driver.visited == ["/s?page=1"]
+        
+        driver = FakeResultsDriver(pages)
+        products = ProductResultsPage(driver).iter_products(stop_when=lambda p: float(p["price"]) < 10)
+        assert [p["asin"] for p in products] == ["A", "B"]
+        assert driver.visited == ["/s?page=1", "/s?page=2"]
+    
+    def test_prefetch_keeps_the_original_tab(self):
+        """Con prefetch la navegación ocurre en la pestaña original y la de precarga se cierra"""
+        driver = FakeTabsDriver([[card("A")], [card("B")], [card("C")]])
+        
+        products = list(ProductResultsPage(driver).iter_products(prefetch=True))
+        
+        assert [p["asin"] for p in products] == ["A", "B", "C"]
+        assert driver.window_handles == ["original"]
+        assert driver.current_window_handle == "original"
+        assert driver.current_url == "/s?page=3"
+    
+    def test_iteration_is_traced_per_step(self, tmp_path):
+        """Los spans miden el trabajo al iterar, no la creación del generador ni al consumidor"""
+        tracer.enable(str(tmp_path / "trace.json"))
+        try:
+            products = ProductResultsPage(FakeResultsDriver([[card("A")], [card("B")]])).iter_products()
+            assert not [event for event in tracer.events if event["ph"] == "X"]
+            for _ in products:
+                time.sleep(0.05)  # Trabajo del consumidor entre items
+            spans = [event for event in tracer.events if event["name"] == "ProductResultsPage.iter_products"]
+        finally:
+            tracer.enabled = False
+            tracer.events = []
+        assert len(spans) == 3  # Un span por avance: A, B (tras cargar la página 2) y el final
+        assert all(span["dur"] < 50_000 for span in spans)
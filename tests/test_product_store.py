@@ -0,0 +1,79 @@
+import multiprocessing
+from decimal import Decimal
+from src.utils.product_store import ProductRecord, ProductSnapshot, ProductStore, diff_snapshots, parse_price
+
+
+def save_worker_rows(directory, worker, count, barrier):
+    """Guarda desde otro proceso las filas de un worker en la misma ejecución"""
+    barrier.wait()  # Ambos workers guardan a la vez
+    for i in range(count):
+        snapshot = ProductSnapshot()
+        snapshot.add([{"name": f"{worker}{i}", "price": "10.00", "asin": f"{worker}{i}"}], query="zapatos")
+        ProductStore(directory).save(snapshot, "sesion")
+
+
+class TestProductStore:
+    """Suite de tests para los registros tipados y el diff de snapshots"""
+    
+    def test_record_normalizes_extracted_product(self):
+        """El precio texto se convierte a Decimal y se marca la disponibilidad"""
+        record = ProductRecord.from_extracted({"name": "Zapato", "price": "1,299.99", "asin": "B01"}, currency="USD")
+        assert record.price == Decimal("1299.99") and record.available and record.currency == "USD"
+        assert parse_price("Varía según opciones") is None
+        assert not ProductRecord.from_extracted({"name": "X", "price": "Precio no disponible"}).available
+    
+    def test_diff_between_runs(self, tmp_path):
+        """El diff detecta cambios de precio, altas, bajas y cambios de posición por ordenamiento"""
+        store = ProductStore(str(tmp_path))
+        old, new = ProductSnapshot(), ProductSnapshot()
+        old.add([{"name": "A", "price": "10.00", "asin": "A"}, {"name": "B", "price": "20.00", "asin": "B"},
+                 {"name": "C", "price": "30.00", "asin": "C"}], query="zapatos", sort="newest")
+        new.add([{"name": "B", "price": "18.50", "asin": "B"}, {"name": "A", "price": "10.00", "asin": "A"},
+                 {"name": "D", "price": "Varía según opciones", "asin": "D"}], query="zapatos", sort="newest")
+        store.save(old, "run1")
+        store.save(new, "run2")
+        assert store.runs() == ["run1", "run2"]
+        
+        diff = diff_snapshots(store.load("run1"), store.load("run2"))
+        
+        assert list(diff["price_changes"]["asin"]) == ["B"]
+        assert int(diff["price_changes"]["delta_cents"][0]) == -150
+        assert list(diff["added"]["asin"]) == ["D"] and list(diff["removed"]["asin"]) == ["C"]
+        shifts = dict(zip(diff["rank_shifts"]["asin"], diff["rank_shifts"]["shift"]))
+        assert shifts == {"A": -1, "B": 1}
+    
+    def test_repeated_products_replace_existing_rows(self, tmp_path):
+        """Un reintento que registra los mismos productos no duplica filas (query, sort, asin)"""
+        snapshot = ProductSnapshot()
+        snapshot.add([{"name": "A", "price": "10.00", "asin": "A"}, {"name": "B", "price": "20.00", "asin": "B"}],
+                     query="zapatos", sort="newest")
+        snapshot.add([{"name": "A", "price": "9.00", "asin": "A"}], query="zapatos", sort="newest")
+        snapshot.add([{"name": "A", "price": "9.00", "asin": "A"}], query="zapatos", sort="price_high_low")
+        assert len(snapshot) == 3
+        assert snapshot.columns["price_cents"][0] == 900
+        
+        store = ProductStore(str(tmp_path))
+        store.save(snapshot, "run1")
+        retry = ProductSnapshot()
+        retry.add([{"name": "B", "price": "21.00", "asin": "B"}], query="zapatos", sort="newest")
+        store.save(retry, "run1")
+        
+        saved = store.load("run1")
+        assert len(saved["asin"]) == 3
+        assert dict(zip(saved["asin"][saved["sort"] == "newest"], saved["price_cents"][saved["sort"] == "newest"])) \
+            == {"A": 900, "B": 2100}
+    
+    def test_workers_merge_into_one_run(self, tmp_path):
+        """Los workers que guardan a la vez en la misma ejecución no pierden filas"""
+        context = multiprocessing.get_context("spawn")
+        barrier = context.Barrier(2)
+        workers = [context.Process(target=save_worker_rows, args=(str(tmp_path), worker, 40, barrier))
+                   for worker in ("gw0", "gw1")]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=60)
+        
+        store = ProductStore(str(tmp_path))
+        assert store.runs() == ["sesion"]
+        assert len(store.load("sesion")["asin"]) == 80
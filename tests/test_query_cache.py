@@ -0,0 +1,74 @@
+import multiprocessing
+import time
+from src.utils.query_cache import QueryCache, cached_job_search, canonical_key, merge_stats, save_stats
+
+
+def _write_entries(path, worker, count):
+    cache = QueryCache(path)
+    for index in range(count):
+        cache.put(canonical_key(f"query {worker}-{index}"), {"product_count": index})
+    cache.close()
+
+
+class TestQueryCache:
+    """Suite de tests para el caché compartido de resultados de búsqueda"""
+
+    def test_canonical_key_ignores_case_and_spacing(self):
+        """Mayúsculas, espacios extra y sort None (relevancia) dan la misma clave"""
+        assert canonical_key("  Zapatos  rojos", "Skechers", "100-200") == \
+            canonical_key("zapatos rojos", "skechers", "100-200", sort="relevance", page=1)
+        assert canonical_key("zapatos", sort="newest") != canonical_key("zapatos", sort="newest", page=2)
+
+    def test_ttl_and_lru_eviction(self, tmp_path):
+        """Las entradas vencidas no se devuelven y se expulsan las menos usadas"""
+        cache = QueryCache(str(tmp_path / "cache.sqlite"), ttl=60, max_entries=2)
+        cache.put("a", {"n": 1})
+        cache.put("b", {"n": 2})
+        time.sleep(0.01)
+        assert cache.get("a") == {"n": 1}  # "a" pasa a ser la más usada
+        cache.put("c", {"n": 3})
+        assert cache.get("b") is None and cache.get("a") == {"n": 1}
+        assert cache.stats["evicted"] == 1
+
+        cache.ttl = 0
+        assert cache.get("c") is None and cache.stats["expired"] == 1
+        cache.close()
+
+    def test_job_is_served_from_cache_unless_bypassed(self, tmp_path):
+        """Un trabajo repetido no vuelve a buscar; con bypass (tests live) busca y refresca"""
+        cache = QueryCache(str(tmp_path / "cache.sqlite"))
+        calls = []
+
+        def search(job):
+            calls.append(job["keywords"])
+            return {"brand_applied": True, "product_count": 42,
+                    "sorts": {sort: [{"name": f"{sort} 1", "price": "10.00"}] for sort in job["sorts"]}}
+
+        job = {"keywords": "zapatos", "brand": "Skechers", "price_range": "100-200", "sorts": ["newest", "avg_review"]}
+        first = cached_job_search(cache, job, search)
+        second = cached_job_search(cache, dict(job, keywords="ZAPATOS"), search)
+        live = cached_job_search(cache, job, search, bypass=True)
+
+        assert calls == ["zapatos", "zapatos"]
+        assert not first["cached"] and second["cached"] and not live["cached"]
+        assert second["sorts"] == first["sorts"] and second["product_count"] == 42
+        assert cache.hit_rate() == 0.5 and cache.stats["bypassed"] == 1
+        cache.close()
+
+    def test_concurrent_writers_and_merged_stats(self, tmp_path):
+        """Varios procesos escriben el mismo archivo sin errores; las estadísticas se suman"""
+        path = str(tmp_path / "cache.sqlite")
+        QueryCache(path).close()
+        context = multiprocessing.get_context("spawn")
+        processes = [context.Process(target=_write_entries, args=(path, worker, 20)) for worker in range(3)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(30)
+        assert [process.exitcode for process in processes] == [0, 0, 0]
+        assert QueryCache(path).entries() == 60
+
+        save_stats(str(tmp_path / "stats_gw0.json"), {"hits": 3, "misses": 1, "hit_rate": 0.75})
+        save_stats(str(tmp_path / "stats_gw1.json"), {"hits": 1, "misses": 3, "hit_rate": 0.25})
+        merged = merge_stats([str(tmp_path / "stats_gw0.json"), str(tmp_path / "stats_gw1.json")])
+        assert merged == {"hits": 4, "misses": 4, "hit_rate": 0.5}
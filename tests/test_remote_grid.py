@@ -0,0 +1,119 @@
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from src.utils.remote_grid import GridSelector
+
+
+def _node(browser, busy, free, platform="LINUX"):
+    slots = [{"stereotype": {"browserName": browser, "platformName": platform}, "session": {"sessionId": "x"}}
+             for _ in range(busy)]
+    slots += [{"stereotype": {"browserName": browser, "platformName": platform}, "session": None}
+              for _ in range(free)]
+    return {"availability": "UP", "slots": slots}
+
+
+@pytest.fixture
+def fake_grid():
+    """Levanta servidores locales que responden /status como un Selenium Grid"""
+    servers = []
+    
+    def _start(status):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                payload = json.dumps({"value": status}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(payload)
+            
+            def log_message(self, *args):
+                pass
+        
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+    
+    yield _start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def clear_down_endpoints(monkeypatch):
+    """Cada test empieza sin endpoints marcados como caídos"""
+    monkeypatch.setattr(GridSelector, "down_until", {})
+
+
+class TestGridSelector:
+    """Suite de tests para la selección de endpoints remotos"""
+    
+    def test_selects_least_loaded_endpoint(self, fake_grid):
+        """El endpoint con menor proporción de slots ocupados va primero"""
+        busy = fake_grid({"ready": True, "nodes": [_node("chrome", busy=3, free=1)]})
+        idle = fake_grid({"ready": True, "nodes": [_node("chrome", busy=1, free=3)]})
+        
+        ranked = GridSelector([busy, idle]).rank("chrome")
+        
+        assert [e.url for e in ranked] == [idle, busy]
+    
+    def test_skips_unhealthy_and_unreachable_endpoints(self, fake_grid):
+        """Endpoints no listos o caídos se descartan (failover)"""
+        not_ready = fake_grid({"ready": False, "nodes": [_node("chrome", busy=0, free=4)]})
+        healthy = fake_grid({"ready": True, "nodes": [_node("chrome", busy=2, free=2)]})
+        
+        ranked = GridSelector([not_ready, "http://127.0.0.1:1", healthy], timeout=0.5).rank("chrome")
+        
+        assert [e.url for e in ranked] == [healthy]
+    
+    def test_capability_negotiation_filters_browser_and_platform(self, fake_grid):
+        """Solo quedan los endpoints con nodos del navegador y plataforma pedidos"""
+        firefox = fake_grid({"ready": True, "nodes": [_node("firefox", busy=0, free=4)]})
+        windows = fake_grid({"ready": True, "nodes": [_node("chrome", busy=0, free=4, platform="WINDOWS")]})
+        linux = fake_grid({"ready": True, "nodes": [_node("chrome", busy=0, free=1)]})
+        
+        ranked = GridSelector([firefox, windows, linux]).rank("chrome", platform="linux")
+        
+        assert [e.url for e in ranked] == [linux]
+    
+    def test_failover_marks_failed_endpoint_down(self, fake_grid, monkeypatch):
+        """Si la sesión falla en el primer endpoint se usa el segundo y el primero queda caído"""
+        first = fake_grid({"ready": True, "nodes": [_node("chrome", busy=0, free=4)]})
+        second = fake_grid({"ready": True, "nodes": [_node("chrome", busy=2, free=2)]})
+        attempts = []
+        
+        class FakeRemote:
+            def __init__(self, command_executor, options):
+                attempts.append(command_executor)
+                if command_executor == first:
+                    raise RuntimeError("session not created")
+        
+        monkeypatch.setattr("src.utils.remote_grid.webdriver.Remote", FakeRemote)
+        selector = GridSelector([first, second])
+        
+        driver = selector.create_driver("chrome", options=object())
+        
+        assert driver.grid_endpoint == second
+        assert attempts == [first, second]
+        assert selector.is_down(first) and not selector.is_down(second)
+        
+        # Mientras dure el cooldown el endpoint caído ni se consulta
+        GridSelector([first, second]).create_driver("chrome", options=object())
+        assert attempts == [first, second, second]
+    
+    @pytest.mark.skipif(not os.getenv("GRID_TEST_URL"),
+                        reason="Requiere un Selenium standalone local (GRID_TEST_URL=http://localhost:4444)")
+    def test_creates_session_on_standalone_server(self):
+        """Crea una sesión real contra un servidor standalone iniciado localmente"""
+        from src.base import DriverFactory
+        
+        selector = GridSelector([os.environ["GRID_TEST_URL"]])
+        driver = selector.create_driver("chrome", DriverFactory.build_options("chrome"))
+        try:
+            driver.get("about:blank")
+            assert driver.grid_endpoint == os.environ["GRID_TEST_URL"].rstrip("/")
+        finally:
+            driver.quit()
@@ -0,0 +1,72 @@
+import subprocess
+import sys
+import time
+import psutil
+import pytest
+from src.utils.resource_monitor import BrowserResourceMonitor, MemoryTrend
+
+# Proceso "driver" que lanza un hijo "navegador" y espera
+DRIVER_SCRIPT = (
+    "import subprocess, sys, time\n"
+    "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+    "time.sleep(60)\n"
+)
+
+
+class FakeService:
+    def __init__(self, process):
+        self.process = process
+
+
+class FakeDriver:
+    def __init__(self, process):
+        self.service = FakeService(process)
+
+
+@pytest.fixture
+def driver_tree():
+    unrelated = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+    time.sleep(0.05)
+    driver = subprocess.Popen([sys.executable, "-c", DRIVER_SCRIPT])
+    deadline = time.time() + 10
+    while not psutil.Process(driver.pid).children() and time.time() < deadline:
+        time.sleep(0.05)
+    yield driver, unrelated
+    for process in (driver, unrelated):
+        process.kill()
+        process.wait()
+
+
+class TestResourceMonitor:
+    """Suite de tests para el monitoreo de recursos y la limpieza de procesos huérfanos"""
+
+    def test_sample_covers_process_tree(self, driver_tree):
+        """La muestra suma el proceso del driver y sus hijos"""
+        monitor = BrowserResourceMonitor(FakeDriver(driver_tree[0]))
+        sample = monitor.sample()
+        assert sample["processes"] == 2 and sample["rss"] > 0
+
+    def test_reap_only_kills_orphans_of_the_driver(self, driver_tree):
+        """Tras quit() se finaliza el hijo que quedó vivo, no un proceso ajeno anterior al driver"""
+        driver, unrelated = driver_tree
+        monitor = BrowserResourceMonitor(FakeDriver(driver))
+        monitor.sample()
+        child = psutil.Process(driver.pid).children()[0]
+        # Un proceso ajeno que quedó registrado (ej: pid reutilizado) no debe tocarse
+        monitor._processes[unrelated.pid] = psutil.Process(unrelated.pid)
+        monitor._parents[unrelated.pid] = psutil.Process(unrelated.pid).ppid()
+
+        driver.kill()  # quit() sin cerrar el navegador
+        driver.wait()
+        killed = monitor.reap_orphans(grace=0.1)
+
+        assert [proc["pid"] for proc in killed] == [child.pid]
+        assert unrelated.poll() is None
+
+    def test_memory_trend_warns_on_sustained_growth(self):
+        """Solo advierte si el pico crece en todos los tests de la ventana"""
+        trend = MemoryTrend(window=2, threshold_mb=50)
+        assert not trend.add("a", {"peak_rss_mb": 100})
+        assert not trend.add("b", {"peak_rss_mb": 130})
+        assert trend.add("c", {"peak_rss_mb": 160})
+        assert not trend.add("d", {"peak_rss_mb": 150})
@@ -0,0 +1,78 @@
+import struct
+import zlib
+import pytest
+from config.config import Config
+from src.utils.screenshots import ScreenshotService, dhash, hamming
+
+
+def make_png(pixel, width=36, height=32):
+    """PNG real en escala de grises (sin Pillow): pixel(x, y) -> 0-255"""
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+    rows = b"".join(b"\x00" + bytes(pixel(x, y) for x in range(width)) for y in range(height))
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(rows)) + chunk(b"IEND", b""))
+
+
+# Gradiente horizontal, el mismo un poco más claro y el gradiente invertido
+GRADIENT = make_png(lambda x, y: x * 7)
+BRIGHTER = make_png(lambda x, y: x * 7 + 10)
+INVERTED = make_png(lambda x, y: 255 - x * 7)
+
+
+class FakeDriver:
+    """Driver mínimo que devuelve los screenshots de una lista"""
+
+    def __init__(self, images):
+        self.images = list(images)
+
+    def get_screenshot_as_png(self):
+        return self.images.pop(0)
+
+
+class TestScreenshots:
+    """Suite de tests para el servicio de screenshots en segundo plano"""
+
+    def test_dhash_tolerates_small_changes(self):
+        """Un cambio de brillo uniforme no altera el hash; un gradiente invertido sí"""
+        gradient = [[x * 10 + y for x in range(9)] for y in range(8)]
+        brighter = [[value + 40 for value in row] for row in gradient]
+        inverted = [list(reversed(row)) for row in gradient]
+        assert hamming(dhash(gradient), dhash(brighter)) == 0
+        assert hamming(dhash(gradient), dhash(inverted)) == 64
+
+    def test_consecutive_duplicates_are_skipped(self, tmp_path, monkeypatch):
+        """Capturas repetidas se descartan salvo las forzadas (fallo del test)"""
+        monkeypatch.setattr(Config, "ARTIFACT_STORE_DIR", str(tmp_path / "store"))
+        service = ScreenshotService(FakeDriver([GRADIENT, GRADIENT, INVERTED, INVERTED]), image_format="png",
+                                    directory=str(tmp_path / "shots"))
+
+        service.capture("home")
+        service.capture("home again")
+        service.capture("results")
+        service.capture("Fallo", force=True)
+        paths = service.flush()
+        service.close()
+
+        assert len(paths) == 3 and service.stats["skipped"] == 1
+        assert all(path.endswith(".png") for path in paths)
+        assert sorted(p.name.split("_")[0] for p in (tmp_path / "shots").iterdir()) == ["Fallo", "home", "results"]
+
+    def test_similar_screenshots_are_skipped_and_encoded_as_webp(self, tmp_path, monkeypatch):
+        """Con Pillow, una captura casi igual (dHash) se descarta y las guardadas se recodifican a WebP"""
+        image_module = pytest.importorskip("PIL.Image")
+        monkeypatch.setattr(Config, "ARTIFACT_STORE_DIR", str(tmp_path / "store"))
+        service = ScreenshotService(FakeDriver([GRADIENT, BRIGHTER, INVERTED]), image_format="webp", quality=80,
+                                    directory=str(tmp_path / "shots"))
+
+        for name in ("home", "home mas clara", "resultados"):
+            service.capture(name)
+        paths = service.flush()
+        service.close()
+
+        assert service.stats["skipped"] == 1 and len(paths) == 2
+        for path in paths:
+            assert path.endswith(".webp")
+            with image_module.open(path) as image:
+                assert image.format == "WEBP"
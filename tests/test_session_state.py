@@ -0,0 +1,94 @@
+import os
+import threading
+import time
+import pytest
+from src.utils.session_state import SessionStateStore, cookie_value
+
+
+class FakeDriver:
+    """Driver sin CDP: guarda cookies y localStorage en memoria"""
+
+    def __init__(self):
+        self.current_url = "https://www.amazon.com/"
+        self.cookies = []
+        self.storage = {}
+        self.visited = []
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def get_cookies(self):
+        return list(self.cookies)
+
+    def add_cookie(self, cookie):
+        self.cookies.append(cookie)
+
+    def execute_script(self, script, *args):
+        if args:
+            self.storage[args[0]] = args[1]
+            return None
+        return dict(self.storage)
+
+
+def set_usd(driver):
+    driver.cookies.append({"name": "i18n-prefs", "value": "USD", "path": "/"})
+    driver.storage["tema"] = "oscuro"
+
+
+def is_usd(snapshot):
+    return cookie_value(snapshot, "i18n-prefs") == "USD"
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SessionStateStore(directory=str(tmp_path), ttl_hours=1)
+
+
+class TestSessionState:
+    """Suite de tests para los snapshots de estado de sesión"""
+
+    def test_setup_runs_once_and_later_drivers_restore(self, store):
+        """El primer driver ejecuta el flujo; el siguiente restaura cookies y localStorage"""
+        calls = []
+        assert not store.ensure(FakeDriver(), "currency_usd", lambda d: (calls.append(d), set_usd(d)), is_usd)
+
+        driver = FakeDriver()
+        assert store.ensure(driver, "currency_usd", lambda d: calls.append(d), is_usd)
+        assert len(calls) == 1
+        assert driver.visited == ["https://www.amazon.com/robots.txt"]
+        assert cookie_value({"cookies": driver.cookies}, "i18n-prefs") == "USD"
+        assert driver.storage == {"tema": "oscuro"}
+
+    def test_expired_or_invalid_snapshots_are_regenerated(self, store):
+        """Un snapshot vencido o que no pasa el validador vuelve a ejecutar el flujo"""
+        store.ensure(FakeDriver(), "currency_usd", set_usd, is_usd)
+        snapshot = store.load("currency_usd")
+        snapshot["created_at"] = time.time() - 2 * 3600
+        store.save(snapshot)
+        assert store.load("currency_usd") is None
+
+        calls = []
+        assert not store.ensure(FakeDriver(), "currency_usd", lambda d: (calls.append(d), set_usd(d)), is_usd)
+        assert not store.ensure(FakeDriver(), "currency_usd", calls.append, lambda snapshot: False)
+        assert len(calls) == 2
+
+    def test_parallel_workers_run_setup_once(self, store):
+        """Con varios workers a la vez solo uno ejecuta el flujo; el resto espera y restaura"""
+        calls = []
+
+        def slow_setup(driver):
+            calls.append(driver)
+            time.sleep(0.3)
+            set_usd(driver)
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(
+            store.ensure(FakeDriver(), "currency_usd", slow_setup, is_usd))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert sorted(results) == [False, True, True, True]
+        assert not [name for name in os.listdir(store.directory) if name.endswith(".lock")]
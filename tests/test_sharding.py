@@ -0,0 +1,63 @@
+import json
+import pytest
+from src.utils.sharding import assign_shards, merge_shard_reports, parse_shard, write_outcomes
+
+
+class TestSharding:
+    """Suite de tests para el reparto de tests entre shards"""
+
+    def test_parse_shard(self):
+        """El formato i/N se valida"""
+        assert parse_shard("2/3") == (2, 3)
+        for value in ("0/3", "4/3", "3", "a/b"):
+            with pytest.raises(ValueError):
+                parse_shard(value)
+
+    def test_without_history_splits_evenly(self):
+        """Sin duraciones históricas los tests se reparten en partes iguales"""
+        nodeids = [f"t{i}" for i in range(7)]
+        shards = assign_shards(nodeids, {}, 3)
+        assert sorted(len(s) for s in shards) == [2, 2, 3]
+        assert sorted(n for s in shards for n in s) == sorted(nodeids)
+
+    def test_lpt_balances_by_duration(self):
+        """Los tests largos quedan en shards distintos y la carga queda balanceada"""
+        durations = {"lento": 100, "medio_a": 50, "medio_b": 50, "rapido_a": 10, "rapido_b": 10}
+        shards = assign_shards(list(durations), durations, 2)
+        loads = [sum(durations[n] for n in shard) for shard in shards]
+        assert max(loads) - min(loads) <= 10
+        assert any(shard == ["lento", "rapido_a"] or shard == ["lento", "rapido_b"] for shard in shards)
+
+    def test_merge_combines_outcomes_and_allure_results(self, tmp_path):
+        """El merge copia allure-results y suma los resultados de todos los shards"""
+        inputs = []
+        for i, outcome in enumerate(("passed", "failed"), start=1):
+            directory = tmp_path / f"shard-{i}"
+            (directory / "allure-results").mkdir(parents=True)
+            (directory / "allure-results" / f"{i}-result.json").write_text("{}")
+            write_outcomes(str(directory / "outcomes.json"), {f"t{i}": {"outcome": outcome, "duration_s": 2.0}},
+                           shard=f"{i}/2")
+            inputs.append(str(directory))
+
+        durations_path = tmp_path / "durations.json"
+        merged = merge_shard_reports(inputs, str(tmp_path / "merged"), str(durations_path))
+
+        assert merged["totals"] == {"passed": 1, "failed": 1}
+        assert len(merged["shards"]) == 2
+        assert sorted(p.name for p in (tmp_path / "merged" / "allure-results").iterdir()) == \
+            ["1-result.json", "2-result.json"]
+        assert json.loads(durations_path.read_text()) == {"t1": 2.0, "t2": 2.0}
+
+    def test_merge_ignores_skipped_durations(self, tmp_path):
+        """Los tests saltados no actualizan el historial de duraciones"""
+        directory = tmp_path / "shard-1"
+        write_outcomes(str(directory / "outcomes.json"), {
+            "t1": {"outcome": "passed", "duration_s": 3.0},
+            "t2": {"outcome": "skipped", "duration_s": 0.0},
+        }, shard="1/1")
+        durations_path = tmp_path / "durations.json"
+        durations_path.write_text(json.dumps({"t2": 8.0}))
+
+        merge_shard_reports([str(directory)], str(tmp_path / "merged"), str(durations_path))
+
+        assert json.loads(durations_path.read_text()) == {"t1": 3.0, "t2": 8.0}
@@ -0,0 +1,65 @@
+import json
+import pytest
+from src.utils.tracer import merge_traces, instrument_driver, traced, tracer
+
+
+class FakeDriver:
+    """Driver mínimo: execute solo registra los comandos recibidos"""
+
+    def __init__(self):
+        self.commands = []
+
+    def execute(self, driver_command, params=None):
+        self.commands.append(driver_command)
+        return {"value": None}
+
+
+class FakePage:
+    def __init__(self, driver):
+        self.driver = driver
+
+    @traced()
+    def load(self):
+        self.driver.execute("get", {"url": "http://localhost/"})
+        self.driver.execute("findElement", {"using": "css selector", "value": "#q"})
+
+
+@pytest.fixture
+def enabled_tracer(tmp_path):
+    tracer.enable(str(tmp_path / "trace_gw0.json"), process_name="gw0")
+    yield tracer
+    tracer.enabled = False
+    tracer.events = []
+
+
+class TestTracer:
+    """Suite de tests para la exportación de líneas de tiempo"""
+
+    def test_spans_are_nested(self, enabled_tracer):
+        """Test > página > comandos WebDriver quedan anidados en el tiempo"""
+        page = FakePage(instrument_driver(FakeDriver()))
+        with tracer.span("test_flujo", "test"):
+            page.load()
+
+        spans = {event["name"]: event for event in tracer.events if event["ph"] == "X"}
+        assert set(spans) == {"test_flujo", "FakePage.load", "get", "findElement"}
+        assert spans["get"]["cat"] == "navigation" and spans["get"]["args"] == {"url": "http://localhost/"}
+        assert spans["findElement"]["cat"] == "webdriver"
+        for child, parent in (("FakePage.load", "test_flujo"), ("get", "FakePage.load"),
+                              ("findElement", "FakePage.load")):
+            assert spans[parent]["ts"] <= spans[child]["ts"]
+            assert spans[child]["ts"] + spans[child]["dur"] <= spans[parent]["ts"] + spans[parent]["dur"]
+
+    def test_save_and_merge_workers(self, enabled_tracer, tmp_path):
+        """Cada worker guarda su traza y el controlador las combina en una sola"""
+        with tracer.span("test_a", "test"):
+            pass
+        first = tracer.save()
+        other = tmp_path / "trace_gw1.json"
+        other.write_text(json.dumps({"traceEvents": [{"name": "test_b", "ph": "X", "ts": 1, "dur": 1}]}))
+
+        merged = merge_traces([first, str(other)], str(tmp_path / "timeline.json"))
+
+        with open(merged, encoding="utf-8") as f:
+            names = [event["name"] for event in json.load(f)["traceEvents"]]
+        assert names == ["process_name", "test_a", "test_b"]